@@ -22,7 +22,7 @@ def populate_db():
 
     specialties_v1 = specialties.versions.get(version=1)
     specialties_v2 = specialties.versions.get(version=2)
-    specialties_v1.guide_item.add(surgeon, therapist, otolaryngologist)
-    specialties_v2.guide_item.add(
+    specialties_v1.guide_items.add(surgeon, therapist, otolaryngologist)
+    specialties_v2.guide_items.add(
         surgeon, therapist, dentist, otolaryngologist,
     )
@@ -43,11 +43,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'services.terminology.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'services.terminology.middleware.ProfilingMiddleware',
+    'services.terminology.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,8 +88,24 @@ DATABASES = {
         'HOST': '127.0.0.1',
         'PORT': '5432',
     },
+    # Read replica of the default database used when it is listed in
+    # READ_REPLICAS of TERMINOLOGY. Locally it is the default database
+    # itself, point HOST to the replica server in production.
+    'replica': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': 'services',
+        'USER': 'admin',
+        'PASSWORD': 'admin',
+        'HOST': '127.0.0.1',
+        'PORT': '5432',
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['services.terminology.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -136,3 +155,38 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
+
+TERMINOLOGY = {
+    # Total number of guide items kept by the per-worker cache of guide
+    # version items. 0 disables the cache.
+    'VERSION_CACHE_MAX_ITEMS': 1000000,
+    # Resolve guide versions by date with the per-worker in-memory index.
+    'VERSION_INDEX_ENABLED': True,
+    # Seconds after which the index is reloaded to pick up changes made by
+    # other processes. None disables reloading.
+    'VERSION_INDEX_MAX_AGE': 60,
+    # Serve read and validate endpoints with async views, enable it when the
+    # project is run by an ASGI server.
+    'ASYNC_VIEWS': False,
+    # Number of threads per worker running database queries of async views.
+    'ASYNC_DB_THREADS': 10,
+    # Cache of CACHES keeping rendered responses of the list of guides. Use
+    # a shared backend (e.g. file based) to share entries between workers.
+    'RESPONSE_CACHE_ALIAS': 'default',
+    # Seconds rendered responses of the list of guides are kept. 0 disables
+    # the cache.
+    'RESPONSE_CACHE_TIMEOUT': 300,
+    # Directory profiles of requests are written to by ProfilingMiddleware.
+    # None disables profiling.
+    'PROFILE_DIR': None,
+    # Probability of profiling a request without the X-Profile header.
+    'PROFILE_SAMPLE_RATE': 0,
+    # Directory of snapshots of superseded guide versions built by the
+    # build_version_snapshots command. None disables snapshots.
+    'SNAPSHOT_DIR': None,
+    # Aliases of DATABASES reads of the terminology API are sent to, e.g.
+    # ['replica']. Empty list sends all queries to the default database.
+    'READ_REPLICAS': [],
+    # Seconds reads of a client go to the default database after it wrote.
+    'REPLICA_PIN_SECONDS': 5,
+}
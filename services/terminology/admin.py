@@ -1,6 +1,25 @@
-from django.contrib import admin
+import io
+from functools import partial
 
+from django import forms
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.template.response import TemplateResponse
+
+from services.terminology.cache import version_items_cache
+from services.terminology.fingerprints import (
+    get_guide_items,
+    update_fingerprints,
+)
+from services.terminology.importing import (
+    FILE_FORMATS,
+    GuideItemsFileError,
+    GuideItemsReader,
+    GuideVersionImporter,
+)
 from services.terminology.models import Guide, GuideItem, GuideVersion
+from services.terminology.pagination import EstimatedCountPaginator
 
 
 @admin.register(Guide)
@@ -11,15 +30,195 @@ class GuideAdmin(admin.ModelAdmin):
     search_fields = ['name', 'short_name']
 
 
+class GuideVersionItemsFormSet(forms.BaseInlineFormSet):
+    """Formset of one page of guide items of a guide version.
+
+    The page is selected by the page_param query parameter, so only
+    per_page guide items are loaded and rendered.
+    """
+
+    per_page = 50
+    page_param = 'items_page'
+
+    def __init__(self, *args, **kwargs):
+        """Initialize formset of the requested page."""
+        super().__init__(*args, **kwargs)
+        paginator = Paginator(
+            self.queryset.select_related('guideitem').order_by('pk'),
+            self.per_page,
+        )
+        self.page = paginator.get_page(self.request.GET.get(self.page_param))
+
+    def get_queryset(self):  # noqa: WPS615
+        """Return memberships of the requested page."""
+        return self.page.object_list
+
+    def get_page_query(self, number):
+        """Return query string of the page with the number."""
+        query = self.request.GET.copy()
+        query[self.page_param] = number
+        return query.urlencode()
+
+    def get_previous_page_query(self):
+        """Return query string of the previous page."""
+        return self.get_page_query(self.page.previous_page_number())
+
+    def get_next_page_query(self):
+        """Return query string of the next page."""
+        return self.get_page_query(self.page.next_page_number())
+
+    def get_item_changes(self):
+        """Return ids of added and removed guide items of the saved formset.
+
+        A membership whose guide item is replaced removes the initial guide
+        item and adds the new one.
+        """
+        added_ids = [
+            membership.guideitem_id for membership in self.new_objects
+        ]
+        removed_ids = []
+        for form in self.initial_forms:
+            if form in self.deleted_forms:
+                removed_ids.append(form.initial['guideitem'])
+            elif form.has_changed():
+                removed_ids.append(form.initial['guideitem'])
+                added_ids.append(form.instance.guideitem_id)
+        return added_ids, removed_ids
+
+
+class GuideVersionItemsInline(admin.TabularInline):
+    """Paginated inline of guide items of a guide version."""
+
+    model = GuideVersion.guide_items.through
+    formset = GuideVersionItemsFormSet
+    raw_id_fields = ['guideitem']
+    extra = 1
+    verbose_name = 'Элемент справочника'
+    verbose_name_plural = 'Элементы справочника'
+    template = 'admin/terminology/edit_inline/paginated_tabular.html'
+
+    def get_formset(  # noqa: WPS615
+        self, request, obj=None, **kwargs,  # noqa: WPS110
+    ):
+        """Return formset class with the request."""
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.request = request
+        return formset
+
+
+class GuideItemsFileForm(forms.Form):
+    """Form of a file with guide items."""
+
+    guide_items_file = forms.FileField(label='Файл (CSV или NDJSON)')
+    file_format = forms.ChoiceField(
+        label='Формат',
+        choices=[('', 'По расширению файла')] + [
+            (file_format, file_format) for file_format in FILE_FORMATS
+        ],
+        required=False,
+    )
+
+
 @admin.register(GuideVersion)
 class GuideVersionAdmin(admin.ModelAdmin):
-    """The class represents the GuideVersion model in the admin interface."""
+    """The class represents the GuideVersion model in the admin interface.
+
+    Guide items are edited page by page in the inline, they are not loaded
+    into the form at once. Memberships edited in the inline bypass m2m
+    signals, so the fingerprint is updated by the added and removed guide
+    items after saving.
+    """
 
     list_display = ('guide', 'version', 'start_date')
+    list_select_related = ['guide']
+    search_fields = ['guide__name', 'version']
+    autocomplete_fields = ['guide']
+    exclude = ['guide_items']
+    inlines = [GuideVersionItemsInline]
+    actions = ['add_guide_items_from_file']
+
+    def save_formset(self, request, form, formset, change):
+        """Save guide items and update the fingerprint by the changes."""
+        super().save_formset(request, form, formset, change)
+        added_ids, removed_ids = formset.get_item_changes()
+        if not added_ids and not removed_ids:
+            return
+        update_fingerprints(
+            [form.instance.pk],
+            added=get_guide_items(added_ids),
+            removed=get_guide_items(removed_ids),
+        )
+        transaction.on_commit(
+            partial(version_items_cache.invalidate, [form.instance.pk]),
+        )
+
+    @admin.action(description='Добавить элементы из файла')
+    def add_guide_items_from_file(self, request, queryset):
+        """Add guide items from a CSV or NDJSON file to the guide version."""
+        if queryset.count() != 1:
+            self.message_user(
+                request, 'Выберите одну версию справочника.', messages.ERROR,
+            )
+            return None
+        guide_version = queryset.get()
+        form = GuideItemsFileForm()
+        if 'apply' in request.POST:
+            form = GuideItemsFileForm(request.POST, request.FILES)
+            if form.is_valid():
+                self.import_file(request, guide_version, form)
+                return None
+        return TemplateResponse(
+            request,
+            'admin/terminology/guideversion/add_guide_items.html',
+            {
+                **self.admin_site.each_context(request),
+                'opts': self.model._meta,  # noqa: WPS437
+                'title': 'Добавить элементы из файла',
+                'guide_version': guide_version,
+                'form': form,
+                'action_checkbox_name': admin.helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
+
+    def import_file(self, request, guide_version, form):
+        """Import guide items of the uploaded file into the guide version."""
+        uploaded_file = form.cleaned_data['guide_items_file']
+        file_format = form.cleaned_data['file_format']
+        if not file_format:
+            file_format = GuideItemsReader.detect_file_format(
+                uploaded_file.name,
+            )
+        file_obj = io.TextIOWrapper(
+            uploaded_file.file, encoding='utf-8', newline='',
+        )
+        try:
+            with transaction.atomic():
+                importer = GuideVersionImporter(guide_version)
+                for rows in GuideItemsReader(file_obj, file_format):
+                    importer.add(rows)
+                importer.finish()
+        except (GuideItemsFileError, UnicodeDecodeError) as error:
+            self.message_user(request, str(error), messages.ERROR)
+            return
+        transaction.on_commit(
+            partial(version_items_cache.invalidate, [guide_version.pk]),
+        )
+        self.message_user(
+            request,
+            f'{importer.rows_count} строк загружено в версию {guide_version}.',
+            messages.SUCCESS,
+        )
 
 
 @admin.register(GuideItem)
 class GuideItemAdmin(admin.ModelAdmin):
-    """The class represents the GuideItem model in the admin interface."""
+    """The class represents the GuideItem model in the admin interface.
+
+    The number of guide items is estimated, the code is searched by the
+    prefix, so both are served by indexes.
+    """
 
     list_display = ('code', 'value')
+    search_fields = ['code__startswith', 'value__icontains']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
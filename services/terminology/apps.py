@@ -6,3 +6,11 @@ class TerminologyConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services.terminology'
+
+    def ready(self):
+        """Connect signal handlers."""
+        from services.terminology import (  # noqa: F401, WPS433
+            metrics,
+            profiling,
+            signals,
+        )
@@ -0,0 +1,89 @@
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from services.terminology import batch_views, list_views, views
+from services.terminology.conf import get_setting
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def get_executor():
+    """Return the pool of threads running database queries.
+
+    The pool has ASYNC_DB_THREADS threads, so it also limits the number of
+    database connections of the worker.
+    """
+    global _executor  # noqa: WPS420
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(  # noqa: WPS122, WPS442
+                max_workers=get_setting('ASYNC_DB_THREADS'),
+                thread_name_prefix='terminology-db',
+            )
+        return _executor
+
+
+def database_sync_to_async(func):
+    """Return coroutine function calling func in the database thread pool.
+
+    Each thread has its own database connection. Obsolete connections are
+    closed before and after the call like at the start and the end of a
+    request.
+    """
+    @functools.wraps(func)
+    def call_with_connection(*args, **kwargs):  # noqa: WPS430
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        call = sync_to_async(
+            call_with_connection,
+            thread_sensitive=False,
+            executor=get_executor(),
+        )
+        return await call(*args, **kwargs)
+    return wrapper
+
+
+def as_async_view(view):
+    """Return async version of the sync view.
+
+    The view is called and its response is rendered in the database thread
+    pool, so the event loop only awaits the response and serves other
+    clients meanwhile. A thread is taken only while the response is built,
+    not while it is sent to a slow client.
+    """
+    @database_sync_to_async
+    def get_response(request, *args, **kwargs):  # noqa: WPS430
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response.render()
+        return response
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):  # noqa: WPS430
+        return await get_response(request, *args, **kwargs)
+
+    # csrf_exempt() of Django 4.0 does not support coroutine functions.
+    async_view.csrf_exempt = getattr(view, 'csrf_exempt', False)
+    return async_view
+
+
+api_root = as_async_view(views.api_root)
+guide_list = as_async_view(list_views.GuideList.as_view())
+guide_item_list = as_async_view(list_views.GuideItemList.as_view())
+guide_item_search = as_async_view(list_views.GuideItemSearch.as_view())
+guide_item_validate = as_async_view(views.GuideItemValidate.as_view())
+guide_item_lookup = as_async_view(views.GuideItemLookupByCode.as_view())
+guide_item_batch_validate = as_async_view(
+    batch_views.GuideItemBatchValidate.as_view(),
+)
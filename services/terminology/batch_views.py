@@ -0,0 +1,89 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from services.terminology.models import Guide
+from services.terminology.serializers import (
+    GuideItemBatchSerializer,
+    GuideItemSerializer,
+)
+from services.terminology.validation import GuideItemBatchLookup
+from services.terminology.version_index import version_index
+from services.terminology.views import GUIDE_DOES_NOT_EXIST
+
+
+class GuideItemBatchValidate(APIView):
+    """Validate guide items of several guides at once.
+
+    Guide items are grouped by guide_id, the version of every guide is
+    resolved once and guide items of all guides are looked up together,
+    so the number of queries depends neither on the number of guide items
+    nor on the number of guides.
+    """
+
+    def post(self, request, format=None):  # noqa: WPS125
+        """Validate data."""
+        batch = GuideItemBatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        grouped = batch.validated_data['guide_items']
+        batch_lookup = GuideItemBatchLookup(self.get_guide_versions(
+            grouped, batch.validated_data['versions'],
+        ))
+        guide_serializers = {
+            guide_id: GuideItemSerializer(
+                many=True,
+                data=grouped[guide_id],
+                context={'guide_item_lookup': batch_lookup.lookups[guide_id]},
+            )
+            for guide_id in batch_lookup.lookups
+        }
+        batch_lookup.load({
+            guide_id: serializer.get_ids(grouped[guide_id])
+            for guide_id, serializer in guide_serializers.items()
+        })
+        guide_errors = {
+            guide_id: self.get_errors(guide_serializers.get(guide_id))
+            for guide_id in grouped
+        }
+
+        if any(guide_errors.values()):
+            return Response(
+                {
+                    invalid_guide_id: errors or {'all': True}
+                    for invalid_guide_id, errors in guide_errors.items()
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            dict.fromkeys(guide_errors, {'all': True}),
+            status=status.HTTP_200_OK,
+        )
+
+    def get_guide_versions(self, guide_ids, versions):
+        """Return guide versions of existing guides by guide ids.
+
+        Fingerprints of guide versions found by the version index are read
+        from their rows, cached guide items are checked against them.
+        """
+        guide_versions = Guide.get_versions({
+            guide_id: versions.get(guide_id)
+            for guide_id in Guide.objects.filter(
+                pk__in=guide_ids,
+            ).values_list('pk', flat=True)
+        })
+        if version_index.enabled:
+            version_index.load_stored_fingerprints(guide_versions.values())
+        return guide_versions
+
+    def get_errors(self, serializer):
+        """Return errors of guide items of one guide."""
+        if serializer is None:
+            return GUIDE_DOES_NOT_EXIST
+        if not serializer.is_valid():
+            return serializer.errors
+        return [
+            {invalid_guide_item_id: False}
+            for invalid_guide_item_id in (
+                serializer.guide_item_lookup.get_not_in_version()
+            )
+        ]
@@ -0,0 +1,172 @@
+import json
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from services.terminology.models import Guide
+
+PERCENTILES = (50, 95, 99)
+LATENCY_METRICS = tuple(f'p{percentile}' for percentile in PERCENTILES)
+
+
+class Endpoint(object):
+    """Request to the benchmarked endpoint."""
+
+    def __init__(self, name, path, method='get', payload=None):
+        """Initialize endpoint."""
+        self.name = name
+        self.path = path
+        self.method = method
+        self.payload = payload
+
+    def request(self, client):
+        """Send the request and return the response."""
+        if self.method == 'post':
+            return client.post(
+                self.path,
+                json.dumps(self.payload),
+                content_type='application/json',
+            )
+        return client.get(self.path)
+
+
+def get_endpoints(validate_size=1000):
+    """Return benchmarked endpoints for the largest current guide version.
+
+    validate_size is the number of guide items sent to the validation.
+    """
+    today = timezone.now().date()
+    guide_version = max(
+        filter(None, (guide.current_version for guide in Guide.objects.all())),
+        key=lambda version: version.guide_items.count(),
+        default=None,
+    )
+    guides_url = reverse('guide-list')
+    endpoints = [
+        Endpoint('guide-list', guides_url),
+        Endpoint(
+            'guide-list-on-date',
+            f'{guides_url}?start_date_lte={today.isoformat()}',
+        ),
+    ]
+    if guide_version is None:
+        return endpoints
+
+    guide_id = guide_version.guide_id
+    guide_items_url = reverse('guide-item-list', kwargs={'pk': guide_id})
+    guide_items = list(
+        guide_version.guide_items.order_by('id').values(
+            'id', 'code', 'value',
+        )[:validate_size],
+    )
+    search_query = urlencode({
+        'value': guide_items[0]['value'] if guide_items else 'value',
+    })
+    return endpoints + [
+        Endpoint('guide-item-list', guide_items_url),
+        Endpoint(
+            'guide-item-list-cursor',
+            f'{guide_items_url}?cursor=&page_size=1000',
+        ),
+        Endpoint(
+            'guide-item-search',
+            '{0}?{1}'.format(
+                reverse('guide-item-search', kwargs={'pk': guide_id}),
+                search_query,
+            ),
+        ),
+        Endpoint(
+            'guide-item-validate',
+            reverse('guide-item-validate', kwargs={'pk': guide_id}),
+            method='post',
+            payload=[
+                dict(guide_item, guide_id=guide_id)
+                for guide_item in guide_items
+            ],
+        ),
+    ]
+
+
+class BenchmarkRunner(object):
+    """Runner of endpoint benchmarks.
+
+    Every endpoint is requested iterations times after a warm-up request.
+    Latency percentiles are measured in milliseconds, then the number of
+    queries and the peak of memory allocated by Python (in KiB) are
+    measured on separate requests, so they do not distort the latency.
+    """
+
+    def __init__(self, iterations=20, host='localhost'):
+        """Initialize runner."""
+        self.iterations = iterations
+        self.client = Client(HTTP_HOST=host)
+
+    def run(self, endpoints):
+        """Return results of all endpoints."""
+        return {
+            endpoint.name: self.run_endpoint(endpoint)
+            for endpoint in endpoints
+        }
+
+    def run_endpoint(self, endpoint):
+        """Return latency percentiles, query count and peak memory."""
+        endpoint.request(self.client)
+        latencies = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            endpoint.request(self.client)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        captured_queries = CaptureQueriesContext(connection)
+        with captured_queries:
+            endpoint.request(self.client)
+        queries_count = len(captured_queries)
+
+        tracemalloc.start()
+        endpoint.request(self.client)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        metrics = get_percentiles(latencies)
+        metrics['queries'] = queries_count
+        metrics['peak_memory_kib'] = round(peak_memory / 1024, 1)
+        return metrics
+
+
+def get_percentiles(latencies):
+    """Return latency percentiles rounded to microseconds."""
+    if len(latencies) < 2:
+        latencies = latencies * 2
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        metric: round(quantiles[percentile - 1], 3)
+        for metric, percentile in zip(LATENCY_METRICS, PERCENTILES)
+    }
+
+
+def compare(measurements, baseline, threshold=0.2):
+    """Return list of regressions of measurements against the baseline.
+
+    Latency and memory regress when they exceed the baseline by more than
+    threshold (a fraction), query count regresses on any increase.
+    """
+    regressions = []
+    for name, baseline_metrics in baseline.items():
+        metrics = measurements.get(name, {})
+        for metric, baseline_value in baseline_metrics.items():
+            allowed = baseline_value
+            if metric != 'queries':
+                allowed = baseline_value * (1 + threshold)
+            measured_value = metrics.get(metric, 0)
+            if measured_value > allowed:
+                regressions.append(
+                    f'{name} {metric}: {measured_value} > {baseline_value}',
+                )
+    return regressions
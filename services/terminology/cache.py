@@ -0,0 +1,214 @@
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from services.terminology.conf import get_setting
+from services.terminology.snapshots import version_snapshots
+
+
+class VersionItems(Sequence):
+    """Guide items of a guide version ordered by id.
+
+    Items are kept as a map id -> (code, value) and a sorted array of ids.
+    Elements of the sequence are dictionaries with the same keys as
+    GuideItemSerializer fields.
+    """
+
+    def __init__(self, guide_version, guide_items):
+        """Build guide items of the guide version.
+
+        guide_items is an iterable of (id, code, value) tuples.
+        """
+        self.guide_version_id = guide_version.pk
+        self.guide_id = guide_version.guide_id
+        self.fingerprint = guide_version.fingerprint
+        self.guide_items = {
+            guide_item_id: (code, item_value)
+            for guide_item_id, code, item_value in guide_items
+        }
+        self.ids = array('q', sorted(self.guide_items))
+
+    def __len__(self):
+        """Return number of guide items."""
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        """Return guide item or list of guide items for a slice."""
+        if isinstance(index, slice):
+            return [self._get_row(pk) for pk in self.ids[index]]
+        return self._get_row(self.ids[index])
+
+    def __contains__(self, pk):
+        """Return True if the guide item with pk is in the guide version."""
+        return pk in self.guide_items
+
+    def get(self, pk):
+        """Return (code, value) of the guide item or None if not found."""
+        return self.guide_items.get(pk)
+
+    def index_after(self, pk):
+        """Return index of the first guide item with id greater than pk."""
+        return bisect_right(self.ids, pk)
+
+    def _get_row(self, pk):
+        code, item_value = self.guide_items[pk]
+        return {
+            'id': pk,
+            'guide_id': self.guide_id,
+            'code': code,
+            'value': item_value,
+        }
+
+
+class VersionItemsCache(object):  # noqa: WPS214
+    """Per-worker LRU cache of guide items of guide versions.
+
+    The cache is capped by the total number of guide items of all entries,
+    least recently used entries are evicted first. The cache is invalidated
+    by model signals. Changes made by other processes are detected by the
+    fingerprint of the guide version: an entry built for another
+    fingerprint is loaded again. Guide versions with a snapshot are served
+    from the memory-mapped snapshot instead. Guide versions too large to
+    be cached are remembered with their fingerprints, so their guide items
+    are not counted again until they change.
+    """
+
+    def __init__(self):
+        """Initialize empty cache."""
+        self._entries = OrderedDict()
+        self._oversized = {}
+        self._size = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_items(self):
+        """Return maximum total number of cached guide items."""
+        return get_setting('VERSION_CACHE_MAX_ITEMS')
+
+    def get(self, guide_version):
+        """Return VersionItems of the guide version.
+
+        Return None if the guide version is too large to be cached.
+        """
+        snapshot = version_snapshots.get(guide_version)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            version_items = self._get_entry(guide_version)
+            if version_items is not None:
+                return version_items
+            self.misses += 1
+            generation = self._generation
+            max_items = self.max_items
+            oversized_key = (guide_version.fingerprint, max_items)
+            if self._oversized.get(guide_version.pk) == oversized_key:
+                return None
+
+        version_items = self._load(guide_version, max_items, oversized_key)
+        if version_items is None:
+            return None
+
+        with self._lock:
+            if generation == self._generation:
+                self._put(version_items, max_items)
+        return version_items
+
+    def peek(self, guide_version):
+        """Return VersionItems of the guide version if they are cached.
+
+        Unlike get() a missing entry is not loaded.
+        """
+        snapshot = version_snapshots.get(guide_version)
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            return self._get_entry(guide_version)
+
+    def invalidate(self, guide_version_ids):
+        """Drop entries of the guide versions."""
+        with self._lock:
+            self._generation += 1
+            for guide_version_id in guide_version_ids:
+                self._pop(guide_version_id)
+                self._oversized.pop(guide_version_id, None)
+
+    def invalidate_guide_items(self, guide_item_ids):
+        """Drop entries containing any of the guide items."""
+        guide_item_ids = set(guide_item_ids)
+        with self._lock:
+            self._generation += 1
+            stale_ids = [
+                guide_version_id
+                for guide_version_id, version_items in self._entries.items()
+                if not guide_item_ids.isdisjoint(version_items.guide_items)
+            ]
+            for guide_version_id in stale_ids:
+                self._pop(guide_version_id)
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._oversized.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        """Return cache counters."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'items': self._size,
+            }
+
+    def _load(self, guide_version, max_items, oversized_key):
+        if not max_items:
+            return None
+        guide_items = guide_version.guide_items.all()
+        if guide_items.count() > max_items:
+            with self._lock:
+                self._oversized[guide_version.pk] = oversized_key
+            return None
+        return VersionItems(
+            guide_version, guide_items.values_list('id', 'code', 'value'),
+        )
+
+    def _get_entry(self, guide_version):
+        version_items = self._entries.get(guide_version.pk)
+        if version_items is None:
+            return None
+        if version_items.fingerprint != guide_version.fingerprint:
+            self._pop(guide_version.pk)
+            return None
+        self._entries.move_to_end(guide_version.pk)
+        self.hits += 1
+        return version_items
+
+    def _put(self, version_items, max_items):
+        self._pop(version_items.guide_version_id)
+        self._entries[version_items.guide_version_id] = version_items
+        self._size += len(version_items)
+        while self._size > max_items:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def _pop(self, guide_version_id):
+        version_items = self._entries.pop(guide_version_id, None)
+        if version_items is not None:
+            self._size -= len(version_items)
+
+
+version_items_cache = VersionItemsCache()
@@ -0,0 +1,99 @@
+from operator import itemgetter
+
+from services.terminology.cache import version_items_cache
+from services.terminology.fingerprints import combine
+
+GUIDE_ITEMS_CHUNK_SIZE = 10000
+
+
+class VersionChecksum(object):
+    """Checksums of guide items of a guide version.
+
+    The checksum of the whole version is its fingerprint, so comparing it
+    takes no queries. Checksums of ranges of ids are computed in one pass
+    over guide items ordered by id, they are taken from the cache or the
+    snapshot of the version if possible and streamed from the database
+    otherwise. A range is a dictionary with start (inclusive) and end
+    (exclusive, None for unbounded) ids.
+    """
+
+    def __init__(self, guide_version):
+        """Initialize checksums of the guide version."""
+        self.guide_version = guide_version
+
+    def is_current(self, fingerprint):
+        """Return True if the fingerprint is the one of the version."""
+        return fingerprint == self.guide_version.fingerprint
+
+    def get_chunks(self, chunk_size):
+        """Return checksums of consecutive ranges of chunk_size guide items.
+
+        Ranges cover all ids, so guide items of a copy belong to one of
+        them whatever ids they have. Every range has start, end, count and
+        fingerprint keys.
+        """
+        chunks = []
+        rows = []
+        for guide_item in self.iterate_guide_items():
+            if len(rows) == chunk_size:
+                chunks.append(self._make_chunk(chunks, rows, guide_item[0]))
+                rows = []
+            rows.append(guide_item)
+        chunks.append(self._make_chunk(chunks, rows, None))
+        return chunks
+
+    def get_mismatched_chunks(self, chunks):
+        """Return ranges whose fingerprints differ from the version ones.
+
+        chunks are non-overlapping ranges with fingerprints of a copy. Every
+        mismatched range is returned with the fingerprint and guide items of
+        the version.
+        """
+        mismatched = []
+        guide_items = self.iterate_guide_items()
+        pending = next(guide_items, None)
+        for chunk in sorted(chunks, key=itemgetter('start')):
+            start, end = chunk['start'], chunk['end']
+            rows = []
+            while pending is not None and (end is None or pending[0] < end):
+                if pending[0] >= start:
+                    rows.append(pending)
+                pending = next(guide_items, None)
+            fingerprint = combine(added=rows)
+            if fingerprint != chunk['fingerprint']:
+                mismatched.append({
+                    'start': start,
+                    'end': end,
+                    'fingerprint': fingerprint,
+                    'guide_items': [self._get_row(row) for row in rows],
+                })
+        return mismatched
+
+    def iterate_guide_items(self):
+        """Return iterator of (id, code, value) ordered by id."""
+        version_items = version_items_cache.get(self.guide_version)
+        if version_items is not None:
+            return (
+                (guide_item_id, *version_items.get(guide_item_id))
+                for guide_item_id in version_items.ids
+            )
+        return self.guide_version.guide_items.order_by('id').values_list(
+            'id', 'code', 'value',
+        ).iterator(chunk_size=GUIDE_ITEMS_CHUNK_SIZE)
+
+    def _make_chunk(self, chunks, rows, end):
+        return {
+            'start': chunks[-1]['end'] if chunks else 0,
+            'end': end,
+            'count': len(rows),
+            'fingerprint': combine(added=rows),
+        }
+
+    def _get_row(self, guide_item):
+        guide_item_id, code, item_value = guide_item
+        return {
+            'id': guide_item_id,
+            'guide_id': self.guide_version.guide_id,
+            'code': code,
+            'value': item_value,
+        }
@@ -0,0 +1,25 @@
+from django.conf import settings
+
+DEFAULTS = {  # noqa: WPS407
+    'VERSION_CACHE_MAX_ITEMS': 1000000,
+    'VERSION_INDEX_ENABLED': True,
+    'VERSION_INDEX_MAX_AGE': 60,
+    'ASYNC_VIEWS': False,
+    'ASYNC_DB_THREADS': 10,
+    'RESPONSE_CACHE_ALIAS': 'default',
+    'RESPONSE_CACHE_TIMEOUT': 300,
+    'PROFILE_DIR': None,
+    'PROFILE_SAMPLE_RATE': 0,
+    'SNAPSHOT_DIR': None,
+    'READ_REPLICAS': [],
+    'REPLICA_PIN_SECONDS': 5,
+}
+
+
+def get_setting(name):
+    """Return the terminology setting.
+
+    Settings are read from the TERMINOLOGY dictionary of the project
+    settings, missing ones are taken from DEFAULTS.
+    """
+    return getattr(settings, 'TERMINOLOGY', {}).get(name, DEFAULTS[name])
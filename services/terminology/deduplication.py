@@ -0,0 +1,130 @@
+from collections import defaultdict
+from functools import partial
+
+from django.db import connection, transaction
+
+from services.terminology.cache import version_items_cache
+from services.terminology.fingerprints import update_fingerprints
+from services.terminology.models import GuideItem, GuideVersion
+
+GUIDE_ITEM_TABLE = GuideItem._meta.db_table  # noqa: WPS437
+THROUGH_TABLE = (
+    GuideVersion.guide_items.through._meta.db_table  # noqa: WPS437
+)
+DUPLICATES_TABLE = 'terminology_duplicate_guide_item'
+CREATE_DUPLICATES_SQL = (
+    f'CREATE TEMPORARY TABLE {DUPLICATES_TABLE} AS '  # noqa: S608
+    f'SELECT id, original_id FROM ('
+    f'SELECT id, MIN(id) OVER (PARTITION BY code, value) AS original_id '
+    f'FROM {GUIDE_ITEM_TABLE}'
+    f') items WHERE id <> original_id'
+)
+MERGE_SQL = (
+    f'WITH batch AS ('  # noqa: S608, WPS221, WPS323
+    f'SELECT duplicate.id, duplicate.original_id, item.code, item.value '
+    f'FROM {DUPLICATES_TABLE} duplicate '
+    f'JOIN {GUIDE_ITEM_TABLE} item USING (id) '
+    f'WHERE duplicate.id = ANY(%(ids)s)'
+    f'), detached AS ('
+    f'DELETE FROM {THROUGH_TABLE} membership USING batch '
+    f'WHERE membership.guideitem_id = batch.id '
+    f'RETURNING membership.guideversion_id, membership.guideitem_id'
+    f'), attached AS ('
+    f'INSERT INTO {THROUGH_TABLE} (guideversion_id, guideitem_id) '
+    f'SELECT detached.guideversion_id, batch.original_id '
+    f'FROM detached JOIN batch ON batch.id = detached.guideitem_id '
+    f'ON CONFLICT DO NOTHING '
+    f'RETURNING guideversion_id, guideitem_id'
+    f'), deleted AS ('
+    f'DELETE FROM {GUIDE_ITEM_TABLE} item USING batch '
+    f'WHERE item.id = batch.id'
+    f') SELECT detached.guideversion_id, '
+    f'attached.guideitem_id IS NOT NULL, batch.original_id, '
+    f'batch.id, batch.code, batch.value '
+    f'FROM detached JOIN batch ON batch.id = detached.guideitem_id '
+    f'LEFT JOIN attached '
+    f'ON attached.guideversion_id = detached.guideversion_id '
+    f'AND attached.guideitem_id = batch.original_id'
+)
+DELETE_ORPHANS_SQL = (
+    f'DELETE FROM {GUIDE_ITEM_TABLE} WHERE id IN ('  # noqa: S608, WPS323
+    f'SELECT item.id FROM {GUIDE_ITEM_TABLE} item '
+    f'WHERE item.id > %(last_id)s AND NOT EXISTS ('
+    f'SELECT 1 FROM {THROUGH_TABLE} membership '
+    f'WHERE membership.guideitem_id = item.id'
+    f') ORDER BY item.id LIMIT %(batch_size)s '
+    f'FOR UPDATE SKIP LOCKED'
+    f') RETURNING id'
+)
+
+
+def merge_duplicate_guide_items(batch_size=10000):
+    """Merge identical guide items.
+
+    Every duplicate is replaced in guide versions by the identical guide
+    item with the smallest id and deleted. Duplicates are merged by batches
+    of batch_size guide items, each batch in its own transaction with one
+    query, and fingerprints of changed guide versions are updated
+    incrementally. Cached guide items of changed guide versions are
+    invalidated after commit. Return the number of merged guide items.
+    """
+    merged_count = 0
+    last_id = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {DUPLICATES_TABLE}')
+        cursor.execute(CREATE_DUPLICATES_SQL)
+        while True:
+            cursor.execute(
+                f'SELECT id FROM {DUPLICATES_TABLE} '  # noqa: S608, WPS323
+                f'WHERE id > %s ORDER BY id LIMIT %s',
+                [last_id, batch_size],
+            )
+            duplicate_ids = [row[0] for row in cursor.fetchall()]
+            if not duplicate_ids:
+                break
+            with transaction.atomic():
+                cursor.execute(MERGE_SQL, {'ids': duplicate_ids})
+                _update_fingerprints(cursor.fetchall())
+            merged_count += len(duplicate_ids)
+            last_id = duplicate_ids[-1]
+        cursor.execute(f'DROP TABLE {DUPLICATES_TABLE}')
+    return merged_count
+
+
+def delete_orphaned_guide_items(batch_size=10000):
+    """Delete guide items not included in any guide version.
+
+    Guide items are deleted by batches of batch_size in separate
+    transactions. Return the number of deleted guide items.
+    """
+    deleted_count = 0
+    last_id = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(
+                DELETE_ORPHANS_SQL,
+                {'last_id': last_id, 'batch_size': batch_size},
+            )
+            deleted_ids = [row[0] for row in cursor.fetchall()]
+            if not deleted_ids:
+                return deleted_count
+            deleted_count += len(deleted_ids)
+            last_id = max(deleted_ids)
+
+
+def _update_fingerprints(rows):
+    removed = defaultdict(set)
+    added = defaultdict(set)
+    for guide_version_id, is_attached, original_id, *guide_item in rows:
+        removed[guide_version_id].add(tuple(guide_item))
+        if is_attached:
+            added[guide_version_id].add((original_id, *guide_item[1:]))
+    for changed_version_id, removed_guide_items in removed.items():
+        update_fingerprints(
+            [changed_version_id],
+            added=added[changed_version_id],
+            removed=removed_guide_items,
+        )
+    transaction.on_commit(
+        partial(version_items_cache.invalidate, list(removed)),
+    )
@@ -0,0 +1,81 @@
+from django.db import connection
+
+from services.terminology.models import GuideItem, GuideVersion
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+DIFF_FIELDS = (
+    'change',
+    'id',
+    'guide_id',
+    'code',
+    'value',
+    'previous_id',
+    'previous_value',
+)
+GUIDE_ITEM_TABLE = GuideItem._meta.db_table  # noqa: WPS437
+THROUGH_TABLE = (
+    GuideVersion.guide_items.through._meta.db_table  # noqa: WPS437
+)
+# The code of a guide item if no other changed guide item on the same side
+# has it, only such guide items are paired.
+PAIRED_CODE = (
+    'CASE WHEN COUNT(*) OVER (PARTITION BY item.code) = 1 '
+    'THEN item.code END AS paired_code'
+)
+DIFF_SQL = (
+    f'WITH old_ids AS ('  # noqa: S608, WPS221, WPS323
+    f'SELECT guideitem_id AS id FROM {THROUGH_TABLE} '
+    f'WHERE guideversion_id = %(old_version_id)s '
+    f'EXCEPT SELECT guideitem_id FROM {THROUGH_TABLE} '
+    f'WHERE guideversion_id = %(new_version_id)s'
+    f'), new_ids AS ('
+    f'SELECT guideitem_id AS id FROM {THROUGH_TABLE} '
+    f'WHERE guideversion_id = %(new_version_id)s '
+    f'EXCEPT SELECT guideitem_id FROM {THROUGH_TABLE} '
+    f'WHERE guideversion_id = %(old_version_id)s'
+    f'), removed AS ('
+    f'SELECT item.id, item.code, item.value, {PAIRED_CODE} '
+    f'FROM old_ids JOIN {GUIDE_ITEM_TABLE} item USING (id)'
+    f'), added AS ('
+    f'SELECT item.id, item.code, item.value, {PAIRED_CODE} '
+    f'FROM new_ids JOIN {GUIDE_ITEM_TABLE} item USING (id)'
+    f') SELECT '
+    f"CASE WHEN removed.id IS NULL THEN '{ADDED}' "
+    f"WHEN added.id IS NULL THEN '{REMOVED}' ELSE '{CHANGED}' END, "
+    f'COALESCE(added.id, removed.id), '
+    f'%(guide_id)s, '
+    f'COALESCE(added.code, removed.code), '
+    f'COALESCE(added.value, removed.value), '
+    f'CASE WHEN added.id IS NOT NULL THEN removed.id END, '
+    f'CASE WHEN added.id IS NOT NULL THEN removed.value END '
+    f'FROM removed FULL JOIN added ON removed.paired_code = added.paired_code '
+    f'ORDER BY 4, 2'
+)
+
+
+def iterate_version_diff(old_version, new_version, chunk_size=2000):
+    """Yield changes of guide items between two guide versions.
+
+    Guide items only present in the new version are added, guide items only
+    present in the old version are removed. An added and a removed guide
+    item with the same code are reported as one changed guide item with the
+    previous id and value. If several guide items with the same code are
+    added or removed, they are reported as separate added and removed
+    guide items. Changes are computed by the database with set
+    operations over ids and read with a server-side cursor, so only changed
+    guide items are transferred. Rows are dictionaries with DIFF_FIELDS
+    keys ordered by code.
+    """
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(DIFF_SQL, {
+            'old_version_id': old_version.pk,
+            'new_version_id': new_version.pk,
+            'guide_id': new_version.guide_id,
+        })
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from (dict(zip(DIFF_FIELDS, row)) for row in rows)
@@ -0,0 +1,28 @@
+from django.db import models
+from django.utils import timezone
+
+from services.terminology.models import Guide, GuideVersion
+
+
+def refresh_effective_versions(guide_ids=None, date=None):
+    """Store guide versions effective on the date in guides.
+
+    Guides are updated with a single query, model signals are not sent.
+    If guide_ids is None then all guides are updated. The date defaults to
+    today. Of versions starting on the same date the last created one is
+    effective, like in the version index. Return the number of updated
+    guides.
+    """
+    if date is None:
+        date = timezone.now().date()
+    guides = Guide.objects.all()
+    if guide_ids is not None:
+        guides = guides.filter(pk__in=guide_ids)
+    return guides.update(
+        effective_version=models.Subquery(
+            GuideVersion.objects.filter(
+                guide=models.OuterRef('pk'), start_date__lte=date,
+            ).order_by('-start_date', '-id').values('pk')[:1],
+        ),
+        effective_date=date,
+    )
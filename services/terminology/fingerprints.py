@@ -0,0 +1,135 @@
+import hashlib
+
+from django.db import transaction
+
+from services.terminology.models import GuideItem, GuideVersion
+
+FINGERPRINT_FIELD = GuideVersion._meta.get_field(  # noqa: WPS437
+    'fingerprint',
+)
+FINGERPRINT_LENGTH = FINGERPRINT_FIELD.max_length
+FINGERPRINT_BITS = FINGERPRINT_LENGTH * 4
+FINGERPRINT_MODULUS = 2 ** FINGERPRINT_BITS
+EMPTY_FINGERPRINT = FINGERPRINT_FIELD.default
+GUIDE_ITEM_FIELDS = ('id', 'code', 'value')
+
+
+def combine(fingerprint=EMPTY_FINGERPRINT, added=(), removed=()):
+    """Return the fingerprint with added and removed guide items.
+
+    The fingerprint is the sum of hashes of guide items modulo 2 ** 64, so
+    it does not depend on the order of guide items and can be updated
+    incrementally. added and removed are iterables of (id, code, value).
+    """
+    number = int(fingerprint, 16)  # noqa: WPS432
+    for sign, guide_items in ((1, added), (-1, removed)):
+        for guide_item in guide_items:
+            digest = hashlib.blake2b(
+                '\t'.join(map(str, guide_item)).encode(),
+                digest_size=FINGERPRINT_LENGTH // 2,
+            ).digest()
+            number += sign * int.from_bytes(digest, 'big')
+    return format(number % FINGERPRINT_MODULUS, f'0{FINGERPRINT_LENGTH}x')
+
+
+def update_fingerprints(guide_version_ids, added=(), removed=()):
+    """Add and remove guide items to fingerprints of the guide versions.
+
+    Modified timestamps of the guide versions are updated too. Return the
+    updated guide versions.
+    """
+    added = list(added)
+    removed = list(removed)
+    return _save_fingerprints(
+        guide_version_ids,
+        lambda guide_version: combine(
+            guide_version.fingerprint, added, removed,
+        ),
+    )
+
+
+def refresh_fingerprints(guide_version_ids):
+    """Compute fingerprints of the guide versions from scratch.
+
+    Use it after guide items are attached to guide versions bypassing model
+    signals, for example with bulk_create or raw SQL.
+    """
+    return _save_fingerprints(
+        guide_version_ids,
+        lambda guide_version: combine(
+            added=guide_version.guide_items.values_list(
+                *GUIDE_ITEM_FIELDS,
+            ).iterator(),
+        ),
+    )
+
+
+def update_version_fingerprints(guide_version, action, pk_set):
+    """Update the fingerprint of the guide version on m2m_changed.
+
+    action and pk_set are arguments of the m2m_changed signal sent by
+    guide_version.guide_items. Removed guide items are subtracted before
+    they are removed, so only actual guide items of the guide version are
+    taken into account.
+    """
+    if action == 'post_add':
+        guide_versions = update_fingerprints(
+            [guide_version.pk], added=get_guide_items(pk_set),
+        )
+    elif action == 'pre_remove':
+        guide_versions = update_fingerprints(
+            [guide_version.pk],
+            removed=guide_version.guide_items.filter(
+                pk__in=pk_set,
+            ).values_list(*GUIDE_ITEM_FIELDS),
+        )
+    elif action == 'post_clear':
+        guide_versions = refresh_fingerprints([guide_version.pk])
+    else:
+        return
+    for updated_version in guide_versions:
+        guide_version.fingerprint = updated_version.fingerprint
+        guide_version.modified = updated_version.modified
+
+
+def update_guide_item_fingerprints(guide_item, action, pk_set):
+    """Update fingerprints of guide versions of the guide item.
+
+    action and pk_set are arguments of the m2m_changed signal sent by
+    guide_item.guideversion_set.
+    """
+    guide_version_ids = guide_item.guideversion_set.values_list(
+        'id', flat=True,
+    )
+    if action == 'post_add':
+        update_fingerprints(pk_set, added=get_guide_items([guide_item.pk]))
+    elif action == 'pre_remove':
+        update_fingerprints(
+            guide_version_ids.filter(pk__in=pk_set),
+            removed=get_guide_items([guide_item.pk]),
+        )
+    elif action == 'pre_clear':
+        update_fingerprints(
+            guide_version_ids, removed=get_guide_items([guide_item.pk]),
+        )
+
+
+def get_guide_items(guide_item_ids):
+    """Return (id, code, value) of guide items with the ids."""
+    return GuideItem.objects.filter(
+        pk__in=guide_item_ids,
+    ).values_list(*GUIDE_ITEM_FIELDS)
+
+
+def _save_fingerprints(guide_version_ids, get_fingerprint):
+    # Guide versions are locked, so concurrent updates are not lost.
+    with transaction.atomic():
+        guide_versions = list(
+            GuideVersion.objects.select_for_update().filter(
+                pk__in=guide_version_ids,
+            ).order_by('pk'),
+        )
+        for guide_version in guide_versions:
+            guide_version.fingerprint = get_fingerprint(guide_version)
+            guide_version.save(update_fields=['fingerprint', 'modified'])
+    return guide_versions
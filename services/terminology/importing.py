@@ -0,0 +1,245 @@
+import csv
+import io
+import json
+from itertools import islice
+from multiprocessing import Pool
+
+from django.db import connection
+from django.db.transaction import TransactionManagementError
+
+from services.terminology.fingerprints import refresh_fingerprints
+from services.terminology.models import GuideItem, GuideVersion
+
+CSV_FORMAT = 'csv'
+NDJSON_FORMAT = 'ndjson'
+FILE_FORMATS = (CSV_FORMAT, NDJSON_FORMAT)
+CODE_MAX_LENGTH = GuideItem._meta.get_field('code').max_length  # noqa: WPS437
+VALUE_MAX_LENGTH = GuideItem._meta.get_field(  # noqa: WPS437
+    'value',
+).max_length
+
+
+class GuideItemsFileError(ValueError):
+    """Raised when a guide items file can not be imported."""
+
+
+class GuideItemsReader(object):
+    """Reader of blocks of (code, value) rows of a guide items file.
+
+    CSV files must have a header with code and value columns, NDJSON files
+    contain one object with code and value keys per line. With several
+    workers the lines are parsed by a pool of processes, this requires one
+    record per line (no line breaks inside CSV values).
+    """
+
+    def __init__(self, file_obj, file_format, block_size=10000, workers=1):
+        """Initialize reader of the file."""
+        self.file_obj = file_obj
+        self.file_format = file_format
+        self.block_size = block_size
+        self.workers = workers
+
+    @classmethod
+    def detect_file_format(cls, path):
+        """Return file format by the file extension."""
+        if str(path).endswith(f'.{CSV_FORMAT}'):
+            return CSV_FORMAT
+        return NDJSON_FORMAT
+
+    def __iter__(self):
+        """Yield blocks of rows."""
+        header = None
+        first_line_number = 1
+        if self.file_format == CSV_FORMAT:
+            header = next(csv.reader([self.file_obj.readline()]), [])
+            first_line_number = 2
+
+        if self.workers > 1:
+            with Pool(self.workers) as pool:
+                yield from pool.imap(
+                    parse_block, self._read_blocks(header, first_line_number),
+                )
+            return
+
+        rows = _parse(
+            self.file_obj, self.file_format, header, first_line_number,
+        )
+        while True:
+            block = list(islice(rows, self.block_size))
+            if not block:
+                return
+            yield block
+
+    def _read_blocks(self, header, first_line_number):
+        line_number = first_line_number
+        while True:
+            lines = list(islice(self.file_obj, self.block_size))
+            if not lines:
+                return
+            yield (self.file_format, line_number, lines, header)
+            line_number += len(lines)
+
+
+def parse_block(block):
+    """Return (code, value) rows of the block of lines.
+
+    block is a tuple (file_format, number of the first line, lines, header),
+    header is the list of CSV columns.
+    """
+    file_format, first_line_number, lines, header = block
+    return list(_parse(lines, file_format, header, first_line_number))
+
+
+class GuideVersionImporter(object):
+    """Import of guide items into a guide version.
+
+    Rows are loaded in batches into a temporary table with COPY, then guide
+    items that do not exist yet are created and all items are attached to
+    the guide version with two set-based queries. Identical existing guide
+    items are reused and guide items already in the guide version are
+    skipped. Databases other than PostgreSQL are loaded with bulk_create.
+    Call it inside a transaction.
+    """
+
+    temporary_table = 'terminology_import_guide_item'
+
+    def __init__(self, guide_version):
+        """Initialize importer of the guide version."""
+        self.guide_version = guide_version
+        if connection.get_autocommit():
+            raise TransactionManagementError(
+                'GuideVersionImporter must be used inside a transaction.',
+            )
+        self.use_copy = connection.vendor == 'postgresql'
+        self.rows_count = 0
+        if self.use_copy:
+            self._create_temporary_table()
+
+    def add(self, rows):
+        """Load the batch of (code, value) rows."""
+        self.rows_count += len(rows)
+        if self.use_copy:
+            self._copy(rows)
+        else:
+            self._bulk_create(rows)
+
+    def finish(self):
+        """Attach loaded guide items to the guide version."""
+        if self.use_copy:
+            self._attach_copied()
+        refresh_fingerprints([self.guide_version.pk])
+
+    def _attach_copied(self):
+        guide_item_table = GuideItem._meta.db_table  # noqa: WPS437
+        through_table = (
+            GuideVersion.guide_items.through._meta.db_table  # noqa: WPS437
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {guide_item_table} (code, value) '  # noqa: S608
+                f'SELECT DISTINCT code, value '
+                f'FROM {self.temporary_table} '
+                f'ON CONFLICT (code, value) DO NOTHING',
+            )
+            cursor.execute(
+                f'INSERT INTO {through_table} '  # noqa: S608, WPS323
+                f'(guideversion_id, guideitem_id) '
+                f'SELECT DISTINCT %s, item.id '
+                f'FROM {self.temporary_table} imported '
+                f'JOIN {guide_item_table} item '
+                f'ON item.code = imported.code '
+                f'AND item.value = imported.value '
+                f'ON CONFLICT DO NOTHING',
+                [self.guide_version.pk],
+            )
+            cursor.execute(f'DROP TABLE {self.temporary_table}')
+
+    def _create_temporary_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {self.temporary_table} '
+                f'(code text NOT NULL, value text NOT NULL) '
+                f'ON COMMIT DROP',
+            )
+
+    def _copy(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {self.temporary_table} (code, value) '
+                f'FROM STDIN WITH (FORMAT csv)',
+                buffer,
+            )
+
+    def _bulk_create(self, rows):
+        rows = set(rows)
+        existing = {
+            (guide_item.code, guide_item.value): guide_item
+            for guide_item in GuideItem.objects.filter(
+                code__in={code for code, _ in rows},
+            )
+        }
+        new_guide_items = GuideItem.objects.bulk_create([
+            GuideItem(code=code, value=item_value)
+            for code, item_value in rows
+            if (code, item_value) not in existing
+        ])
+        guide_items = [
+            existing[row] for row in rows if row in existing
+        ] + new_guide_items
+        through = GuideVersion.guide_items.through
+        through.objects.bulk_create(
+            [
+                through(
+                    guideversion_id=self.guide_version.pk,
+                    guideitem_id=guide_item.pk,
+                )
+                for guide_item in guide_items
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def _parse(lines, file_format, header, first_line_number):
+    if file_format == CSV_FORMAT:
+        records = csv.DictReader(lines, fieldnames=header)
+        return (
+            _get_row(record, first_line_number + records.line_num - 1)
+            for record in records
+        )
+    return _parse_json_lines(lines, first_line_number)
+
+
+def _parse_json_lines(lines, first_line_number):
+    for line_number, line in enumerate(lines, start=first_line_number):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise GuideItemsFileError(f'Line {line_number}: invalid JSON')
+        yield _get_row(record, line_number)
+
+
+def _get_row(record, line_number):
+    try:
+        code, item_value = record['code'], record['value']
+    except (KeyError, TypeError):
+        code, item_value = None, None
+    if code is None or item_value is None:
+        raise GuideItemsFileError(
+            f'Line {line_number}: code and value are required',
+        )
+    code = str(code)
+    item_value = str(item_value)
+    if not code or not item_value:
+        raise GuideItemsFileError(
+            f'Line {line_number}: code and value can not be empty',
+        )
+    if len(code) > CODE_MAX_LENGTH or len(item_value) > VALUE_MAX_LENGTH:
+        raise GuideItemsFileError(
+            f'Line {line_number}: code or value is too long',
+        )
+    return (code, item_value)
@@ -0,0 +1,197 @@
+import datetime
+
+from django.db import models
+from django.utils import timezone
+from rest_framework import generics, serializers
+
+from services.terminology.cache import version_items_cache
+from services.terminology.models import GuideItem, GuideVersion
+from services.terminology.pagination import (
+    KeysetPagination,
+    TerminologyPagination,
+)
+from services.terminology.response_cache import guide_list_cache
+from services.terminology.serializers import (
+    GuideItemSerializer,
+    GuideSerializer,
+)
+from services.terminology.version_index import version_index
+from services.terminology.view_mixins import (
+    ConditionalListMixin,
+    ResponseCacheMixin,
+    ValuesListMixin,
+)
+from services.terminology.views import VERSION_PARAM, get_guide_version
+
+
+def get_versions_tag(count, modified):
+    """Return tag of the number and the last change of guide versions."""
+    return '{0}-{1}'.format(count, modified.timestamp() if modified else 0)
+
+
+class GuideList(  # noqa: WPS215
+    ConditionalListMixin,
+    ResponseCacheMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
+    """List of guide."""
+
+    serializer_class = GuideSerializer
+    response_cache = guide_list_cache
+    pagination_class = TerminologyPagination
+
+    def get_version_tag(self):
+        """Return tag by the generation of cached lists and guide versions.
+
+        The generation of response_cache is incremented after changes of
+        guides and guide versions are committed. The version index is
+        reloaded when it changes, and the number and the last change of
+        guide versions are taken from the index, so no queries are made.
+        Changes of other processes are seen at once with a shared cache,
+        otherwise after VERSION_INDEX_MAX_AGE. Without the index the number
+        and the last change of guide versions are queried.
+        """
+        if not version_index.enabled:
+            versions_state = GuideVersion.objects.aggregate(
+                count=models.Count('pk'), modified=models.Max('modified'),
+            )
+            self.versions_modified = versions_state['modified']
+            return get_versions_tag(
+                versions_state['count'], self.versions_modified,
+            )
+        generation = self.response_cache.get_generation()
+        version_index.reload_on_change(generation)
+        count, modified = version_index.get_state()
+        self.versions_modified = modified
+        return '{0}-{1}'.format(generation, get_versions_tag(count, modified))
+
+    def get_last_modified(self):
+        """Return time of the last change of guide versions."""
+        return self.versions_modified
+
+    def get_queryset(self):  # noqa: WPS615
+        """Get queryset.
+
+        If start_date_lte is specified in the get method, only those guides
+        whose start_date is less than or equal to start_date_lte will be
+        selected.
+        """
+        queryset = GuideVersion.objects.all()
+        start_date_lte = self.request.query_params.get('start_date_lte')
+        if start_date_lte:
+            try:
+                date = datetime.date.fromisoformat(start_date_lte)
+            except ValueError:
+                raise serializers.ValidationError(
+                    {'start_date_lte': 'Please enter a valid start_date_lte'},
+                )
+            if version_index.enabled:
+                guide_version_ids = version_index.get_version_ids_on_date(date)
+            else:
+                guide_version_ids = queryset.filter(
+                    start_date__lte=date,
+                ).order_by(
+                    'guide_id', '-start_date', '-id',
+                ).distinct('guide_id').values('id')
+            return queryset.filter(
+                id__in=guide_version_ids,
+            ).order_by('guide_id')
+        return queryset.order_by('id')
+
+
+class GuideItemList(
+    ConditionalListMixin, ValuesListMixin, generics.ListAPIView,
+):
+    """List of guide item."""
+
+    serializer_class = GuideItemSerializer
+    pagination_class = TerminologyPagination
+
+    def initial(self, request, *args, **kwargs):
+        """Find the requested guide version, it is None if not found."""
+        super().initial(request, *args, **kwargs)
+        self.guide_version = get_guide_version(
+            self.kwargs.get('pk'),
+            self.request.query_params.get(VERSION_PARAM),
+        )
+
+    def get_version_tag(self):
+        """Return tag by the guide version and its fingerprint."""
+        guide_version = self.guide_version
+        if guide_version is None:
+            return None
+        return f'{guide_version.pk}-{guide_version.fingerprint}'
+
+    def get_last_modified(self):
+        """Return time of the last change of the guide version.
+
+        A version becomes current on its start date, so the start of that
+        date is taken into account too.
+        """
+        guide_version = self.guide_version
+        started = timezone.make_aware(datetime.datetime.combine(
+            guide_version.start_date, datetime.time.min,
+        ))
+        return max(guide_version.modified, started)
+
+    def get_queryset(self):  # noqa: WPS615
+        """Get queryset."""
+        guide_version = self.guide_version
+        if guide_version is None:
+            return GuideItem.objects.none()
+
+        version_items = version_items_cache.get(guide_version)
+        if version_items is not None:
+            return version_items
+        return self.get_version_guide_items()
+
+    def get_version_guide_items(self):
+        """Return queryset of guide items of the guide version."""
+        guide_version = self.guide_version
+        guide_id_field = models.Value(
+            guide_version.guide_id, output_field=models.IntegerField(),
+        )
+        return guide_version.guide_items.annotate(
+            guide_id=guide_id_field,
+        ).order_by('id')
+
+
+class GuideItemSearch(GuideItemList):
+    """Search of guide items of a guide version.
+
+    Guide items are matched by the prefix of the code and by a
+    case-insensitive substring of the value, at least one of them is
+    required. Both are served by indexes of guide items, the substring
+    must be at least min_value_length characters long to use the trigram
+    index. Results are paginated with a keyset.
+    """
+
+    pagination_class = KeysetPagination
+    min_value_length = 3
+
+    def initial(self, request, *args, **kwargs):
+        """Validate search parameters."""
+        super().initial(request, *args, **kwargs)
+        self.code_prefix = self.request.query_params.get('code', '')
+        self.value_part = self.request.query_params.get('value', '')
+        if not self.code_prefix and not self.value_part:
+            raise serializers.ValidationError(
+                {'search': 'code or value is required'},
+            )
+        if self.value_part and len(self.value_part) < self.min_value_length:
+            raise serializers.ValidationError({'value': (
+                f'value must be at least {self.min_value_length} '
+                'characters long'
+            )})
+
+    def get_queryset(self):  # noqa: WPS615
+        """Return guide items of the guide version matching the search."""
+        if self.guide_version is None:
+            return GuideItem.objects.none()
+        guide_items = self.get_version_guide_items()
+        if self.code_prefix:
+            guide_items = guide_items.filter(code__startswith=self.code_prefix)
+        if self.value_part:
+            guide_items = guide_items.filter(value__icontains=self.value_part)
+        return guide_items
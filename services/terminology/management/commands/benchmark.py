@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.terminology.benchmarks import (
+    BenchmarkRunner,
+    compare,
+    get_endpoints,
+)
+
+
+class Command(BaseCommand):
+    """Benchmark terminology endpoints."""
+
+    help = (  # noqa: WPS125
+        'Measure latency percentiles, query count and peak memory of the '
+        'terminology endpoints on the current database and compare them '
+        'with a baseline.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--iterations', type=int, default=20,  # noqa: WPS432
+        )
+        parser.add_argument(
+            '--validate-size',
+            type=int,
+            default=1000,  # noqa: WPS432
+            help='Number of guide items sent to the validation endpoint.',
+        )
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--output', help='Path of the results JSON.')
+        parser.add_argument('--baseline', help='Path of the baseline JSON.')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,  # noqa: WPS432
+            help='Allowed relative increase of latency and memory.',
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Run benchmarks."""
+        runner = BenchmarkRunner(
+            iterations=options['iterations'], host=options['host'],
+        )
+        measurements = runner.run(get_endpoints(options['validate_size']))
+        for name, metrics in measurements.items():
+            self.stdout.write('{0}: {1}'.format(name, json.dumps(metrics)))
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(measurements, output_file, indent=2, sort_keys=True)
+
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                regressions = compare(
+                    measurements,
+                    json.load(baseline_file),
+                    options['threshold'],
+                )
+            if regressions:
+                raise CommandError(
+                    'Regressions found:\n{0}'.format('\n'.join(regressions)),
+                )
+            self.stdout.write(self.style.SUCCESS('No regressions found'))
@@ -0,0 +1,52 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from services.terminology.conf import get_setting
+from services.terminology.snapshots import build_version_snapshots
+
+
+class Command(BaseCommand):
+    """Build snapshots of superseded guide versions."""
+
+    help = (  # noqa: WPS125
+        'Write memory-mapped snapshots of guide versions superseded by a '
+        'version effective on the date (today by default) and delete stale '
+        'snapshots. Run it after refresh_effective_versions.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--dir',
+            dest='directory',
+            help='Directory of snapshots, SNAPSHOT_DIR by default.',
+        )
+        parser.add_argument('--date', help='Date in ISO format.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,  # noqa: WPS432
+            help='Number of guide items fetched from the database at once.',
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Build snapshots."""
+        directory = options['directory'] or get_setting('SNAPSHOT_DIR')
+        if directory is None:
+            raise CommandError('Set --dir or SNAPSHOT_DIR.')
+        date = options['date']
+        if date is None:
+            date = timezone.now().date()
+        else:
+            try:
+                date = datetime.date.fromisoformat(date)
+            except ValueError:
+                raise CommandError('--date must be in ISO format')
+        written_count, deleted_count = build_version_snapshots(
+            directory, date, options['batch_size'],
+        )
+        self.stdout.write(f'{written_count} snapshots are written')
+        self.stdout.write(f'{deleted_count} stale snapshots are deleted')
+        self.stdout.write(self.style.SUCCESS('Snapshots are built'))
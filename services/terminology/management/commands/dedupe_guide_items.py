@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from services.terminology.deduplication import (
+    delete_orphaned_guide_items,
+    merge_duplicate_guide_items,
+)
+
+
+class Command(BaseCommand):
+    """Merge identical guide items and delete orphaned guide items."""
+
+    help = (  # noqa: WPS125
+        'Replace identical guide items in guide versions by one guide item '
+        'and delete guide items not included in any guide version. Guide '
+        'items are processed in batches, each batch in its own transaction.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,  # noqa: WPS432
+            help='Number of guide items processed in one transaction.',
+        )
+        parser.add_argument(
+            '--keep-orphans',
+            action='store_true',
+            help='Do not delete guide items not included in any version.',
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Deduplicate guide items."""
+        batch_size = options['batch_size']
+        merged_count = merge_duplicate_guide_items(batch_size)
+        self.stdout.write(f'{merged_count} duplicate guide items are merged')
+        if not options['keep_orphans']:
+            deleted_count = delete_orphaned_guide_items(batch_size)
+            self.stdout.write(
+                f'{deleted_count} orphaned guide items are deleted',
+            )
+        self.stdout.write(self.style.SUCCESS('Guide items are deduplicated'))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from services.terminology.synthetic import GuideGenerator
+
+
+class Command(BaseCommand):
+    """Generate synthetic guides."""
+
+    help = (  # noqa: WPS125
+        'Create synthetic guides with the specified number of versions and '
+        'guide items per version.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--guides', type=int, default=10)
+        parser.add_argument('--versions', type=int, default=3)
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=1000,  # noqa: WPS432
+            help='Number of guide items per version.',
+        )
+        parser.add_argument(
+            '--shared-ratio',
+            type=float,
+            default=0.9,  # noqa: WPS432
+            help='Ratio of guide items shared with the previous version.',
+        )
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Generate guides."""
+        shared_ratio = options['shared_ratio']
+        if shared_ratio < 0 or shared_ratio > 1:
+            raise CommandError('--shared-ratio must be between 0 and 1')
+        generator = GuideGenerator(
+            guides_count=options['guides'],
+            versions_count=options['versions'],
+            items_count=options['items'],
+            shared_ratio=shared_ratio,
+            seed=options['seed'],
+        )
+        with transaction.atomic():
+            guides_count = len(generator.generate())
+        self.stdout.write(self.style.SUCCESS(
+            f'{guides_count} guides are generated',
+        ))
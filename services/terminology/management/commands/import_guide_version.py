@@ -0,0 +1,107 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from services.terminology.cache import version_items_cache
+from services.terminology.importing import (
+    FILE_FORMATS,
+    GuideItemsFileError,
+    GuideItemsReader,
+    GuideVersionImporter,
+)
+from services.terminology.models import Guide
+
+
+class Command(BaseCommand):
+    """Import guide items from a file into a new guide version."""
+
+    help = (  # noqa: WPS125
+        'Create a new version of the guide and fill it with guide items '
+        'from a CSV or NDJSON file. Identical existing guide items are '
+        'reused. The whole file is imported in one transaction.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('guide_id', type=int)
+        parser.add_argument('version')
+        parser.add_argument('start_date', type=datetime.date.fromisoformat)
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format',
+            choices=FILE_FORMATS,
+            help='File format, detected by the file extension by default.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,  # noqa: WPS432
+            help='Number of rows loaded into the database at once.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Number of processes parsing the file. Requires one record '
+                'per line.'
+            ),
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Import guide items."""
+        try:
+            guide = Guide.objects.get(pk=options['guide_id'])
+        except Guide.DoesNotExist:
+            raise CommandError(f'Guide {options["guide_id"]} does not exist')
+        if guide.versions.filter(version=options['version']).exists():
+            raise CommandError(f'Version {options["version"]} already exists')
+
+        path = options['path']
+        file_format = (
+            options['format'] or GuideItemsReader.detect_file_format(path)
+        )
+        try:
+            with open(path, encoding='utf-8', newline='') as file_obj:
+                guide_version = self.import_file(
+                    guide, file_obj, file_format, options,
+                )
+        except (OSError, GuideItemsFileError) as error:
+            raise CommandError(str(error))
+
+        version_items_cache.invalidate([guide_version.pk])
+        self.stdout.write(self.style.SUCCESS(
+            f'Version {guide_version.version} of guide {guide.id} is imported',
+        ))
+
+    @transaction.atomic
+    def import_file(self, guide, file_obj, file_format, options):
+        """Import the file into a new guide version.
+
+        The version can be created concurrently after it is checked.
+        """
+        try:
+            guide_version = guide.versions.create(
+                version=options['version'], start_date=options['start_date'],
+            )
+        except IntegrityError:
+            raise CommandError(f'Version {options["version"]} already exists')
+        importer = GuideVersionImporter(guide_version)
+        blocks = GuideItemsReader(
+            file_obj,
+            file_format,
+            block_size=options['batch_size'],
+            workers=options['workers'],
+        )
+        for rows in blocks:
+            importer.add(rows)
+            if options['verbosity']:
+                self.stdout.write(f'{importer.rows_count} rows loaded')
+        importer.finish()
+        guide_items_count = guide_version.guide_items.count()
+        self.stdout.write(
+            f'{importer.rows_count} rows loaded, '
+            f'{guide_items_count} guide items in the version',
+        )
+        return guide_version
@@ -0,0 +1,95 @@
+import io
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.terminology.conf import get_setting
+from services.terminology.profiling import ProfileReport
+
+MILLISECONDS = 1000
+
+
+class Command(BaseCommand):
+    """Summarize profiles of requests."""
+
+    help = (  # noqa: WPS125
+        'Merge profile bundles written by ProfilingMiddleware and print the '
+        'slowest functions, the slowest SQL statements and N+1 patterns.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--dir',
+            dest='directory',
+            help='Directory of bundles, PROFILE_DIR by default.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,  # noqa: WPS432
+            help='Number of functions and statements printed.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=10,  # noqa: WPS432
+            help=(
+                'Number of executions of a statement from the same place '
+                'in one request reported as N+1.'
+            ),
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Print the report."""
+        directory = options['directory'] or get_setting('PROFILE_DIR')
+        if directory is None:
+            raise CommandError('Set --dir or PROFILE_DIR.')
+        report = ProfileReport(ProfileReport.find_bundles(directory))
+        if not report.requests:
+            raise CommandError(f'No profiles found in {directory}.')
+        requests_count = len(report.requests)
+        self.stdout.write(f'{requests_count} profiled requests')
+        self.write_functions(report, options['limit'])
+        self.write_statements(report, options['limit'])
+        self.write_repeated_statements(report, options['threshold'])
+
+    def write_functions(self, report, limit):
+        """Print functions with the largest cumulative time."""
+        self.stdout.write(self.style.MIGRATE_HEADING('Top functions'))
+        stream = io.StringIO()
+        stats = report.get_stats(stream=stream)
+        if stats is None:
+            self.stdout.write('No function profiles.')
+            return
+        stats.sort_stats('cumulative').print_stats(limit)
+        self.stdout.write(stream.getvalue())
+
+    def write_statements(self, report, limit):
+        """Print SQL statements with the largest total time."""
+        self.stdout.write(self.style.MIGRATE_HEADING('Top SQL statements'))
+        for row in report.get_top_statements(limit):
+            total = row['duration'] * MILLISECONDS
+            average = total / row['count']
+            self.stdout.write(
+                f'{row["count"]} calls, {total:.3f} ms total, '
+                f'{average:.3f} ms per call: {row["sql"]}',
+            )
+            self.write_origin(row['origin'])
+
+    def write_repeated_statements(self, report, threshold):
+        """Print N+1 patterns."""
+        self.stdout.write(self.style.MIGRATE_HEADING('N+1 patterns'))
+        rows = report.get_repeated_statements(threshold)
+        if not rows:
+            self.stdout.write('No N+1 patterns found.')
+        for row in rows:
+            self.stdout.write(
+                f'up to {row["max_count"]} calls per request in '
+                f'{row["requests"]} requests: {row["sql"]}',
+            )
+            self.write_origin(row['origin'])
+
+    def write_origin(self, origin):
+        """Print the innermost frames of the origin of a statement."""
+        for frame in origin[-3:]:
+            self.stdout.write(f'    {frame}')
@@ -0,0 +1,150 @@
+import csv
+import datetime
+import json
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.terminology.importing import (
+    CSV_FORMAT,
+    FILE_FORMATS,
+    GuideItemsReader,
+)
+from services.terminology.models import Guide
+from services.terminology.publishing import (
+    VersionExistsError,
+    publish_version,
+)
+from services.terminology.version_serializers import (
+    GuideVersionChangeSerializer,
+)
+
+
+class Command(BaseCommand):
+    """Publish a new guide version from a base version and changes."""
+
+    help = (  # noqa: WPS125
+        'Create a new version of the guide from guide items of the base '
+        'version (the current version by default) and changes from a CSV '
+        'or NDJSON file in the format of the diff of versions. Only the '
+        'changes are processed, guide items of the base version are copied '
+        'by the database.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('guide_id', type=int)
+        parser.add_argument('version')
+        parser.add_argument('start_date', type=datetime.date.fromisoformat)
+        parser.add_argument(
+            '--base-version', help='Version the new version is created from.',
+        )
+        parser.add_argument(
+            '--changes',
+            help='File with change, code and value of changed guide items.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=FILE_FORMATS,
+            help='File format, detected by the file extension by default.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,  # noqa: WPS432
+            help='Number of changes applied at once.',
+        )
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Publish the guide version."""
+        base_version = self.get_base_version(options)
+        path = options['changes']
+        if path is None:
+            guide_version = self.publish(base_version, (), options)
+        else:
+            file_format = (
+                options['format'] or GuideItemsReader.detect_file_format(path)
+            )
+            try:
+                with open(path, encoding='utf-8', newline='') as file_obj:
+                    guide_version = self.publish(
+                        base_version,
+                        self.read_changes(
+                            file_obj, file_format, options['batch_size'],
+                        ),
+                        options,
+                    )
+            except OSError as error:
+                raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Version {guide_version.version} of guide '
+            f'{guide_version.guide_id} is published from version '
+            f'{base_version.version}',
+        ))
+
+    def get_base_version(self, options):
+        """Return the base version of the guide."""
+        try:
+            guide = Guide.objects.get(pk=options['guide_id'])
+        except Guide.DoesNotExist:
+            raise CommandError(f'Guide {options["guide_id"]} does not exist')
+        new_version = options['version']
+        if guide.versions.filter(version=new_version).exists():
+            raise CommandError(f'Version {new_version} already exists')
+        base_version = guide.get_version(options['base_version'])
+        if base_version is None:
+            raise CommandError('Base version does not exist')
+        return base_version
+
+    def publish(self, base_version, changes, options):
+        """Publish the guide version with the changes."""
+        try:
+            return publish_version(
+                base_version,
+                options['version'],
+                options['start_date'],
+                changes,
+                batch_size=options['batch_size'],
+            )
+        except VersionExistsError as error:
+            raise CommandError(str(error))
+
+    def read_changes(self, file_obj, file_format, batch_size):
+        """Yield validated changes of the file."""
+        if file_format == CSV_FORMAT:
+            records = csv.DictReader(file_obj)
+        else:
+            records = self.read_json_lines(file_obj)
+        records_count = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return
+            yield from self.validate_changes(batch, records_count)
+            records_count += len(batch)
+
+    def validate_changes(self, batch, records_count):
+        """Return validated changes of the batch.
+
+        records_count is the number of changes before the batch.
+        """
+        serializer = GuideVersionChangeSerializer(many=True, data=batch)
+        if serializer.is_valid():
+            return serializer.validated_data
+        number, errors = next(
+            (records_count + number, errors)
+            for number, errors in enumerate(serializer.errors, 1)
+            if errors
+        )
+        raise CommandError(f'Change {number}: {errors}')
+
+    def read_json_lines(self, file_obj):
+        """Yield objects of the NDJSON file."""
+        for line_number, line in enumerate(file_obj, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise CommandError(f'Line {line_number}: invalid JSON')
@@ -0,0 +1,31 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.terminology.effective_versions import refresh_effective_versions
+
+
+class Command(BaseCommand):
+    """Refresh effective versions of guides."""
+
+    help = (  # noqa: WPS125
+        'Store guide versions effective on the date (today by default) in '
+        'guides. Run it right after midnight.'
+    )
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--date', help='Date in ISO format.')
+
+    def handle(self, *args, **options):  # noqa: WPS110
+        """Refresh effective versions."""
+        date = options['date']
+        if date is not None:
+            try:
+                date = datetime.date.fromisoformat(date)
+            except ValueError:
+                raise CommandError('--date must be in ISO format')
+        guides_count = refresh_effective_versions(date=date)
+        self.stdout.write(self.style.SUCCESS(
+            f'Effective versions of {guides_count} guides are refreshed',
+        ))
@@ -0,0 +1,251 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DURATION_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216,
+)
+ROUTE_LABELS = ('route',)
+REQUEST_LABELS = ('route', 'method', 'status')
+
+_request_queries = ContextVar('terminology_request_queries', default=None)
+
+
+class Counter(object):
+    """Counter with labels in the Prometheus text format."""
+
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, label_names):
+        """Initialize counter without series."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        """Increase the series with the label values."""
+        with self._lock:
+            self._series[label_values] = (
+                self._series.get(label_values, 0) + amount
+            )
+
+    def reset(self):
+        """Drop all series."""
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        """Return lines of the metric."""
+        lines = self.get_header()
+        with self._lock:
+            series = sorted(self._series.items())
+        for label_values, metric_value in series:
+            labels = self.format_labels(self.label_names, label_values)
+            lines.append(f'{self.name}{labels} {metric_value}')
+        return lines
+
+    def get_header(self):
+        """Return HELP and TYPE lines of the metric."""
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+        ]
+
+    @classmethod
+    def format_labels(cls, label_names, label_values):
+        """Return labels of a sample with escaped values."""
+        labels = ','.join(
+            '{0}="{1}"'.format(
+                label_name,
+                str(label_value).replace('\\', r'\\').replace(
+                    '"', r'\"',
+                ).replace('\n', r'\n'),
+            )
+            for label_name, label_value in zip(label_names, label_values)
+        )
+        return f'{{{labels}}}'
+
+    @classmethod
+    def format_number(cls, number):
+        """Return the number in the text format."""
+        return repr(float(number))
+
+
+class Histogram(Counter):
+    """Histogram with labels in the Prometheus text format.
+
+    Every series keeps non-cumulative counts of buckets followed by the
+    sum of observations, so an observation is a bisection and two
+    increments under the lock.
+    """
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, label_names, buckets):
+        """Initialize histogram with upper bounds of buckets."""
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, label_values, observed):
+        """Add the observed value to the series with the label values."""
+        index = bisect_left(self.buckets, observed)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [0 for _ in range(len(self.buckets) + 2)]
+                self._series[label_values] = series
+            series[index] += 1
+            series[-1] += observed
+
+    def collect(self):
+        """Return lines of the metric."""
+        lines = self.get_header()
+        with self._lock:
+            series = sorted(
+                (label_values, list(counts))
+                for label_values, counts in self._series.items()
+            )
+        bounds = [*map(self.format_number, self.buckets), '+Inf']
+        for label_values, counts in series:
+            lines.extend(self.collect_series(label_values, bounds, counts))
+        return lines
+
+    def collect_series(self, label_values, bounds, counts):
+        """Return lines of the series."""
+        lines = []
+        bucket_names = (*self.label_names, 'le')
+        cumulative_count = 0
+        for bound, bucket_count in zip(bounds, counts):
+            cumulative_count += bucket_count
+            labels = self.format_labels(bucket_names, (*label_values, bound))
+            lines.append(f'{self.name}_bucket{labels} {cumulative_count}')
+        labels = self.format_labels(self.label_names, label_values)
+        total = self.format_number(counts[-1])
+        lines.append(f'{self.name}_sum{labels} {total}')
+        lines.append(f'{self.name}_count{labels} {cumulative_count}')
+        return lines
+
+
+class QueryStats(object):
+    """Number and total duration of database queries of a request.
+
+    Queries of the current context are counted inside the with block.
+    """
+
+    __slots__ = ('count', 'duration', '_token')
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.count = 0
+        self.duration = 0
+        self._token = None
+
+    def __enter__(self):
+        """Start counting queries of the current context."""
+        self._token = _request_queries.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop counting queries of the current context."""
+        _request_queries.reset(self._token)
+
+
+class RequestMetrics(object):
+    """Metrics of requests kept in the memory of the worker."""
+
+    def __init__(self):
+        """Initialize metrics."""
+        self._metrics = []
+        self.requests = self.register(Counter(
+            'terminology_requests_total',
+            'Number of requests.',
+            REQUEST_LABELS,
+        ))
+        self.duration = self.register(Histogram(
+            'terminology_request_duration_seconds',
+            'Request latency.',
+            ROUTE_LABELS,
+            DURATION_BUCKETS,
+        ))
+        self.db_queries = self.register(Histogram(
+            'terminology_request_db_queries',
+            'Number of database queries per request.',
+            ROUTE_LABELS,
+            QUERIES_BUCKETS,
+        ))
+        self.db_duration = self.register(Histogram(
+            'terminology_request_db_duration_seconds',
+            'Total duration of database queries per request.',
+            ROUTE_LABELS,
+            DURATION_BUCKETS,
+        ))
+        self.response_size = self.register(Histogram(
+            'terminology_response_size_bytes',
+            'Size of response bodies, streaming responses are not counted.',
+            ROUTE_LABELS,
+            SIZE_BUCKETS,
+        ))
+        self.validation_payload_size = self.register(Histogram(
+            'terminology_validation_payload_size_bytes',
+            'Size of request bodies of validation requests.',
+            ROUTE_LABELS,
+            SIZE_BUCKETS,
+        ))
+
+    def register(self, metric):
+        """Add the metric to rendered and reset metrics and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return metrics in the Prometheus text format."""
+        return ''.join(
+            f'{line}\n'
+            for metric in self._metrics
+            for line in metric.collect()
+        )
+
+    def reset(self):
+        """Drop all series."""
+        for metric in self._metrics:
+            metric.reset()
+
+
+def record_query(execute, sql, params, many, context):  # noqa: WPS110
+    """Execute wrapper counting queries of the recording context.
+
+    It is installed into every database connection and only calls the
+    query outside of QueryStats blocks. The context variable is copied by
+    sync_to_async(), so queries of async views run in the thread pool are
+    counted too.
+    """
+    query_stats = _request_queries.get()
+    if query_stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:  # noqa: WPS501
+        return execute(sql, params, many, context)
+    finally:
+        query_stats.count += 1
+        query_stats.duration += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    """Add record_query() to execute wrappers of the new connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,218 @@
+import asyncio
+import random
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from services.terminology.conf import get_setting
+from services.terminology.metrics import QueryStats, request_metrics
+from services.terminology.profiling import RequestProfile
+from services.terminology.routers import ReplicaRouting
+
+UNMATCHED_ROUTE = 'unmatched'
+VALIDATION_ROUTES = frozenset((
+    'guide-item-validate',
+    'guide-item-batch-validate',
+))
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+# Routes answering POST requests without writing.
+READ_ONLY_ROUTES = frozenset((
+    'guide-item-validate',
+    'guide-item-batch-validate',
+    'guide-item-lookup',
+    'guide-item-checksum',
+))
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+PRIMARY_COOKIE = 'terminology_primary'
+ADMIN_NAMESPACE = 'admin'
+
+
+def get_route(request):
+    """Return the name of the URL pattern of the request."""
+    resolver_match = request.resolver_match
+    if resolver_match is not None and resolver_match.url_name:
+        return resolver_match.url_name
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Record latency, database queries and sizes of requests.
+
+    Metrics are labelled by the name of the URL pattern, so every endpoint
+    has its own series. They are kept in the memory of the worker and are
+    served by the metrics view. Put the middleware first to measure the
+    whole request.
+    """
+
+    def __call__(self, request):
+        """Handle the request."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        start = time.perf_counter()
+        with QueryStats() as query_stats:
+            response = self.get_response(request)
+            self.record(request, response, query_stats, start)
+        return response
+
+    async def acall(self, request):
+        """Handle the request asynchronously."""
+        start = time.perf_counter()
+        with QueryStats() as query_stats:
+            response = await self.get_response(request)
+            self.record(request, response, query_stats, start)
+        return response
+
+    def record(self, request, response, query_stats, start):
+        """Record metrics of the request."""
+        duration = time.perf_counter() - start
+        route = get_route(request)
+        label_values = (route,)
+        request_metrics.requests.inc(
+            (route, request.method, str(response.status_code)),
+        )
+        request_metrics.duration.observe(label_values, duration)
+        request_metrics.db_queries.observe(label_values, query_stats.count)
+        request_metrics.db_duration.observe(
+            label_values, query_stats.duration,
+        )
+        if not response.streaming:
+            request_metrics.response_size.observe(
+                label_values, len(response.content),
+            )
+        content_length = request.META.get('CONTENT_LENGTH', '')
+        if route in VALIDATION_ROUTES and content_length.isdigit():
+            request_metrics.validation_payload_size.observe(
+                label_values, int(content_length),
+            )
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    """Profile sampled requests and requests of staff users on demand.
+
+    A request is profiled when it is sampled with the PROFILE_SAMPLE_RATE
+    probability or has the X-Profile header and is made by a staff user
+    logged in with a session. Users are checked before the request is
+    handled, so other clients cannot make their requests profiled. Bundles
+    are written to PROFILE_DIR. The middleware is disabled when PROFILE_DIR
+    is not set. Async requests are profiled without cProfile stats, since
+    the profiler only follows the current thread.
+    """
+
+    def __init__(self, get_response):
+        """Initialize middleware if profiling is enabled."""
+        self.directory = get_setting('PROFILE_DIR')
+        if self.directory is None:
+            raise MiddlewareNotUsed
+        self.sample_rate = get_setting('PROFILE_SAMPLE_RATE')
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        """Handle the request."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        if not self.is_sampled() and not (
+            PROFILE_HEADER in request.META and self.is_staff(request)
+        ):
+            return self.get_response(request)
+        start = time.perf_counter()
+        request_profile = RequestProfile()
+        with request_profile:
+            response = self.get_response(request)
+        self.save(request, response, request_profile, start)
+        return response
+
+    async def acall(self, request):
+        """Handle the request asynchronously."""
+        if not self.is_sampled() and not (
+            PROFILE_HEADER in request.META
+            and await sync_to_async(self.is_staff)(request)
+        ):
+            return await self.get_response(request)
+        start = time.perf_counter()
+        request_profile = RequestProfile(profile_functions=False)
+        with request_profile:
+            response = await self.get_response(request)
+        self.save(request, response, request_profile, start)
+        return response
+
+    def is_sampled(self):
+        """Return True if the request is sampled."""
+        if self.sample_rate <= 0:
+            return False
+        return random.random() < self.sample_rate  # noqa: S311
+
+    def is_staff(self, request):
+        """Return True if the request is made by a staff user."""
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_staff
+
+    def save(self, request, response, request_profile, start):
+        """Write the bundle of the profile."""
+        duration = time.perf_counter() - start
+        request_profile.save(self.directory, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'route': get_route(request),
+            'status': response.status_code,
+            'duration': duration,
+        })
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Send reads of terminology requests to read replicas.
+
+    Safe requests and read-only POST requests of the terminology API read
+    from a replica, the admin and other requests use the primary. After a
+    request writing terminology models the client gets a cookie, and its
+    reads go to the primary for REPLICA_PIN_SECONDS, so it reads its own
+    writes despite replication lag. The middleware is disabled when there
+    are no READ_REPLICAS.
+    """
+
+    def __init__(self, get_response):
+        """Initialize middleware if there are replicas."""
+        if not get_setting('READ_REPLICAS'):
+            raise MiddlewareNotUsed
+        self.pin_seconds = get_setting('REPLICA_PIN_SECONDS')
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        """Handle the request."""
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        routing = ReplicaRouting()
+        with routing:
+            response = self.get_response(request)
+        return self.pin(response, routing)
+
+    async def acall(self, request):
+        """Handle the request asynchronously."""
+        routing = ReplicaRouting()
+        with routing:
+            response = await self.get_response(request)
+        return self.pin(response, routing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Allow replica reads for the resolved view."""
+        routing = ReplicaRouting.get_current()
+        if routing is None or PRIMARY_COOKIE in request.COOKIES:
+            return
+        resolver_match = request.resolver_match
+        if ADMIN_NAMESPACE in resolver_match.namespaces:
+            return
+        is_read_only = resolver_match.url_name in READ_ONLY_ROUTES
+        routing.replica_reads = is_read_only or request.method in SAFE_METHODS
+
+    def pin(self, response, routing):
+        """Pin the client to the primary after a write."""
+        if routing.wrote:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                '1',
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,24 @@
+# Generated by Django 4.0 on 2026-10-18 12:38
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('terminology', '0009_guideitem_non_empty_value'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='guideversion',
+            index=models.Index(fields=['guide', '-start_date'], name='guideversion_guide_start_idx'),
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS guideversion_items_item_idx ON terminology_guideversion_guide_items (guideitem_id, guideversion_id)',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS guideversion_items_item_idx',
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.0 on 2026-10-18 14:05
+
+import hashlib
+
+from django.db import migrations, models
+import django.utils.timezone
+
+FINGERPRINT_LENGTH = 16
+FINGERPRINT_MODULUS = 2 ** (FINGERPRINT_LENGTH * 4)
+
+
+def combine(added):
+    # The fingerprint of guide items as computed by the application when
+    # the migration was written.
+    number = 0
+    for guide_item in added:
+        digest = hashlib.blake2b(
+            '\t'.join(map(str, guide_item)).encode(),
+            digest_size=FINGERPRINT_LENGTH // 2,
+        ).digest()
+        number += int.from_bytes(digest, 'big')
+    return format(number % FINGERPRINT_MODULUS, f'0{FINGERPRINT_LENGTH}x')
+
+
+def compute_fingerprints(apps, schema_editor):
+    GuideVersion = apps.get_model('terminology', 'GuideVersion')
+    for guide_version in GuideVersion.objects.all().iterator():
+        guide_version.fingerprint = combine(
+            added=guide_version.guide_items.values_list(
+                'id', 'code', 'value',
+            ).iterator(),
+        )
+        guide_version.save(update_fields=['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminology', '0010_guideversion_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guideversion',
+            name='fingerprint',
+            field=models.CharField(default='0000000000000000', editable=False, max_length=16, verbose_name='Отпечаток элементов справочника'),
+        ),
+        migrations.AddField(
+            model_name='guideversion',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(compute_fingerprints, migrations.RunPython.noop),
+    ]
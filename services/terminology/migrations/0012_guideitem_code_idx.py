@@ -0,0 +1,20 @@
+# Generated by Django 4.0 on 2026-10-18 16:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('terminology', '0011_guideversion_fingerprint_modified'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='guideitem',
+            index=models.Index(fields=['code'], name='guideitem_code_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.0 on 2026-10-18 17:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def refresh_effective_versions(apps, schema_editor):
+    Guide = apps.get_model('terminology', 'Guide')
+    GuideVersion = apps.get_model('terminology', 'GuideVersion')
+    today = django.utils.timezone.now().date()
+    Guide.objects.update(
+        effective_version=models.Subquery(
+            GuideVersion.objects.filter(
+                guide=models.OuterRef('pk'), start_date__lte=today,
+            ).order_by('-start_date', '-id').values('pk')[:1],
+        ),
+        effective_date=today,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminology', '0012_guideitem_code_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guide',
+            name='effective_version',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='terminology.guideversion', verbose_name='Действующая версия'),
+        ),
+        migrations.AddField(
+            model_name='guide',
+            name='effective_date',
+            field=models.DateField(editable=False, null=True, verbose_name='Дата расчета действующей версии'),
+        ),
+        migrations.RunPython(refresh_effective_versions, migrations.RunPython.noop),
+    ]
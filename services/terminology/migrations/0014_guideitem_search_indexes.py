@@ -0,0 +1,44 @@
+# Generated by Django 4.0 on 2026-10-18 18:25
+
+from django.db import migrations
+
+
+def create_value_trigram_index(apps, schema_editor):
+    # The trigram index serves case-insensitive substring search (icontains).
+    # pg_trgm is a contrib extension, the index is skipped if it is not
+    # available, then the search falls back to filtering guide items of the
+    # version.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'",
+        )
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS guideitem_value_trgm_idx '
+        'ON terminology_guideitem USING gin ((UPPER(value::text)) gin_trgm_ops)',
+    )
+
+
+def drop_value_trigram_index(apps, schema_editor):
+    schema_editor.execute(
+        'DROP INDEX CONCURRENTLY IF EXISTS guideitem_value_trgm_idx',
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('terminology', '0013_guide_effective_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_value_trigram_index,
+            drop_value_trigram_index,
+            atomic=False,
+        ),
+    ]
@@ -0,0 +1,155 @@
+# Generated by Django 4.0 on 2026-10-18 19:10
+
+import hashlib
+from collections import defaultdict
+
+from django.db import migrations, models, transaction
+
+FINGERPRINT_LENGTH = 16
+FINGERPRINT_MODULUS = 2 ** (FINGERPRINT_LENGTH * 4)
+BATCH_SIZE = 10000
+DUPLICATES_TABLE = 'terminology_duplicate_guide_item'
+CREATE_DUPLICATES_SQL = (
+    'CREATE TEMPORARY TABLE {duplicates} AS '
+    'SELECT id, original_id FROM ('
+    'SELECT id, MIN(id) OVER (PARTITION BY code, value) AS original_id '
+    'FROM {guide_items}'
+    ') items WHERE id <> original_id'
+)
+MERGE_SQL = (
+    'WITH batch AS ('
+    'SELECT duplicate.id, duplicate.original_id, item.code, item.value '
+    'FROM {duplicates} duplicate '
+    'JOIN {guide_items} item USING (id) '
+    'WHERE duplicate.id = ANY(%(ids)s)'
+    '), detached AS ('
+    'DELETE FROM {memberships} membership USING batch '
+    'WHERE membership.guideitem_id = batch.id '
+    'RETURNING membership.guideversion_id, membership.guideitem_id'
+    '), attached AS ('
+    'INSERT INTO {memberships} (guideversion_id, guideitem_id) '
+    'SELECT detached.guideversion_id, batch.original_id '
+    'FROM detached JOIN batch ON batch.id = detached.guideitem_id '
+    'ON CONFLICT DO NOTHING '
+    'RETURNING guideversion_id, guideitem_id'
+    '), deleted AS ('
+    'DELETE FROM {guide_items} item USING batch '
+    'WHERE item.id = batch.id'
+    ') SELECT detached.guideversion_id, '
+    'attached.guideitem_id IS NOT NULL, batch.original_id, '
+    'batch.id, batch.code, batch.value '
+    'FROM detached JOIN batch ON batch.id = detached.guideitem_id '
+    'LEFT JOIN attached '
+    'ON attached.guideversion_id = detached.guideversion_id '
+    'AND attached.guideitem_id = batch.original_id'
+)
+
+
+def combine(fingerprint, added, removed):
+    # The fingerprint of guide items as computed by the application when
+    # the migration was written.
+    number = int(fingerprint, 16)
+    for sign, guide_items in ((1, added), (-1, removed)):
+        for guide_item in guide_items:
+            digest = hashlib.blake2b(
+                '\t'.join(map(str, guide_item)).encode(),
+                digest_size=FINGERPRINT_LENGTH // 2,
+            ).digest()
+            number += sign * int.from_bytes(digest, 'big')
+    return format(number % FINGERPRINT_MODULUS, f'0{FINGERPRINT_LENGTH}x')
+
+
+def merge_duplicate_guide_items(apps, schema_editor):
+    # Existing duplicates must be merged before the unique index is built.
+    # Every duplicate is replaced in guide versions by the identical guide
+    # item with the smallest id, by batches in separate transactions.
+    GuideItem = apps.get_model('terminology', 'GuideItem')
+    GuideVersion = apps.get_model('terminology', 'GuideVersion')
+    tables = {
+        'duplicates': DUPLICATES_TABLE,
+        'guide_items': GuideItem._meta.db_table,
+        'memberships': GuideVersion.guide_items.through._meta.db_table,
+    }
+    connection = schema_editor.connection
+    last_id = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {DUPLICATES_TABLE}')
+        cursor.execute(CREATE_DUPLICATES_SQL.format(**tables))
+        while True:
+            cursor.execute(
+                f'SELECT id FROM {DUPLICATES_TABLE} '
+                f'WHERE id > %s ORDER BY id LIMIT %s',
+                [last_id, BATCH_SIZE],
+            )
+            duplicate_ids = [row[0] for row in cursor.fetchall()]
+            if not duplicate_ids:
+                break
+            with transaction.atomic(using=connection.alias):
+                cursor.execute(
+                    MERGE_SQL.format(**tables), {'ids': duplicate_ids},
+                )
+                removed = defaultdict(set)
+                added = defaultdict(set)
+                for version_id, is_attached, original_id, *guide_item in (
+                    cursor.fetchall()
+                ):
+                    removed[version_id].add(tuple(guide_item))
+                    if is_attached:
+                        added[version_id].add((original_id, *guide_item[1:]))
+                guide_versions = GuideVersion.objects.using(
+                    connection.alias,
+                ).select_for_update().filter(
+                    pk__in=list(removed),
+                ).order_by('pk')
+                for guide_version in guide_versions:
+                    guide_version.fingerprint = combine(
+                        guide_version.fingerprint,
+                        added[guide_version.pk],
+                        removed[guide_version.pk],
+                    )
+                    guide_version.save(
+                        update_fields=['fingerprint', 'modified'],
+                    )
+            last_id = duplicate_ids[-1]
+        cursor.execute(f'DROP TABLE {DUPLICATES_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('terminology', '0014_guideitem_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_guide_items,
+            migrations.RunPython.noop,
+            atomic=False,
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS '
+                    'unique_guide_item_content '
+                    'ON terminology_guideitem (code, value)',
+                    'DROP INDEX CONCURRENTLY IF EXISTS '
+                    'unique_guide_item_content',
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE terminology_guideitem '
+                    'ADD CONSTRAINT unique_guide_item_content '
+                    'UNIQUE USING INDEX unique_guide_item_content',
+                    'ALTER TABLE terminology_guideitem '
+                    'DROP CONSTRAINT unique_guide_item_content',
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='guideitem',
+                    constraint=models.UniqueConstraint(fields=('code', 'value'), name='unique_guide_item_content'),
+                ),
+            ],
+        ),
+    ]
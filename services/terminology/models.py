@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 
+from services.terminology.version_index import version_index
+
 
 class Guide(models.Model):
     """Entity Guide."""
@@ -14,36 +16,121 @@ class Guide(models.Model):
         verbose_name='Короткое наименование',
     )
     description = models.TextField(blank=True, verbose_name='Описание')
+    effective_version = models.ForeignKey(
+        'GuideVersion',
+        models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        verbose_name='Действующая версия',
+    )
+    effective_date = models.DateField(
+        null=True,
+        editable=False,
+        verbose_name='Дата расчета действующей версии',
+    )
 
     class Meta(object):
         verbose_name_plural = 'Справочники'
 
     @property
     def current_version(self):
-        """Return current version."""
-        return self.get_version_on_date(timezone.now().date())
+        """Return current version.
+
+        The materialized effective version is taken if it is refreshed today
+        and it is loaded with the guide by select_related(). Otherwise the
+        version is looked up by date, the guide can be loaded before its
+        versions are changed.
+        """
+        today = timezone.now().date()
+        if self.effective_date == today and (
+            Guide.effective_version.is_cached(self)
+        ):
+            return self.effective_version
+        return self.get_version_on_date(today)
 
     def get_version_on_date(self, date):
-        """Return guide version on the date."""
+        """Return guide version on the date.
+
+        Of versions starting on the same date the last created one is taken.
+        """
+        if version_index.enabled:
+            return version_index.get_version_on_date(self.pk, date)
         return self.versions.filter(
             start_date__lte=date,
-        ).order_by('-start_date').first()
+        ).order_by('-start_date', '-id').first()
+
+    def get_version(self, version=None):
+        """Return guide version with the specified name.
+
+        If version is None then return the current version. If there is no
+        such version then return None.
+        """
+        if version is None:
+            return self.current_version
+        if version_index.enabled:
+            return version_index.get_version(self.pk, version)
+        return self.versions.filter(version=version).first()
+
+    @classmethod
+    def get_versions(cls, versions):
+        """Return guide versions of several guides.
+
+        versions maps guide ids to version names, None stands for the
+        current version. Guide versions are found with the version index or
+        with at most two queries. Guides without such version are mapped to
+        None.
+        """
+        today = timezone.now().date()
+        named_versions = {
+            guide_id: version
+            for guide_id, version in versions.items()
+            if version is not None
+        }
+        current_guide_ids = set(versions) - set(named_versions)
+        if version_index.enabled:
+            guide_versions = {
+                guide_id: version_index.get_version_on_date(guide_id, today)
+                for guide_id in current_guide_ids
+            }
+            guide_versions.update(
+                (guide_id, version_index.get_version(guide_id, version))
+                for guide_id, version in named_versions.items()
+            )
+            return guide_versions
+
+        guide_versions = dict.fromkeys(versions)
+        if named_versions:
+            lookups = models.Q()
+            for named_guide_id, named_version in named_versions.items():
+                lookups |= models.Q(
+                    guide_id=named_guide_id, version=named_version,
+                )
+            guide_versions.update(
+                (guide_version.guide_id, guide_version)
+                for guide_version in GuideVersion.objects.filter(lookups)
+            )
+        if current_guide_ids:
+            guide_versions.update(
+                (guide_version.guide_id, guide_version)
+                for guide_version in GuideVersion.objects.filter(
+                    guide_id__in=current_guide_ids, start_date__lte=today,
+                ).order_by(
+                    'guide_id', '-start_date', '-id',
+                ).distinct('guide_id')
+            )
+        return guide_versions
 
     def get_guide_items(self, version=None):
         """Return guide items of the specified version.
 
         If version is None then return guide items of the current version.
         """
-        if version is None:
-            guid_version = self.current_version
-            if guid_version is None:
-                return []
-        else:
-            try:
-                guid_version = self.versions.get(version=version)
-            except GuideVersion.DoesNotExist:
-                return []
-        return guid_version.guide_items.all()
+        guid_version = self.get_version(version)
+        if guid_version is None:
+            return GuideItem.objects.none()
+        return guid_version.guide_items.order_by('id')
 
     def __str__(self):
         """Return  instanse representation."""
@@ -64,6 +151,14 @@ class GuideItem(models.Model):
 
     class Meta(object):
         verbose_name_plural = 'Элементы справочников'
+        indexes = [
+            # Serves lookups by code and by the prefix of the code.
+            models.Index(
+                fields=['code'],
+                opclasses=['varchar_pattern_ops'],
+                name='guideitem_code_idx',
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=~models.Q(code=''), name='non_empty_code',
@@ -71,6 +166,10 @@ class GuideItem(models.Model):
             models.CheckConstraint(
                 check=~models.Q(value=''), name='non_empty_value',
             ),
+            # Identical guide items are stored once and shared by versions.
+            models.UniqueConstraint(
+                fields=['code', 'value'], name='unique_guide_item_content',
+            ),
         ]
 
     def __str__(self):
@@ -97,10 +196,25 @@ class GuideVersion(models.Model):
     guide_items = models.ManyToManyField(
         GuideItem, verbose_name='Элементы справочника',
     )
+    fingerprint = models.CharField(
+        max_length=16,  # noqa: WPS432
+        default='0' * 16,  # noqa: WPS432
+        editable=False,
+        verbose_name='Отпечаток элементов справочника',
+    )
+    modified = models.DateTimeField(
+        auto_now=True, verbose_name='Дата изменения',
+    )
 
     class Meta(object):
         verbose_name_plural = 'Версии справочников'
         unique_together = ['guide', 'version']
+        indexes = [
+            models.Index(
+                fields=['guide', '-start_date'],
+                name='guideversion_guide_start_idx',
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=~models.Q(version=''), name='non_empty_version',
@@ -0,0 +1,171 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (cursor) pagination ordered by primary key.
+
+    The cursor is an opaque encoding of the primary key of the last object
+    of the previous page, so a page is selected with an index range scan
+    instead of OFFSET. The total count is only calculated on request.
+
+    Besides querysets, sequences of rows ordered by id that provide
+    index_after(pk) (e.g. cached VersionItems) are supported.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 10000
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a single page of objects."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        after = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in {'1', 'true'}:
+            self.count = self.get_count(queryset)
+
+        if isinstance(queryset, QuerySet):
+            if after is not None:
+                queryset = queryset.filter(pk__gt=after)
+            page = list(queryset.order_by('pk')[:page_size + 1])
+            last_ids = [instance.pk for instance in page]
+        else:
+            start = 0 if after is None else queryset.index_after(after)
+            page = queryset[start:start + page_size + 1]
+            last_ids = [row['id'] for row in page]
+
+        self.has_next = len(page) > page_size
+        self.next_position = last_ids[page_size - 1] if self.has_next else None
+        return page[:page_size]
+
+    def get_paginated_response(self, data):  # noqa: WPS110
+        """Return response with the link to the next page."""
+        response_data = OrderedDict()
+        if self.count is not None:
+            response_data['count'] = self.count
+        response_data['next'] = self.get_next_link()
+        response_data['results'] = data
+        return Response(response_data)
+
+    def get_page_size(self, request):  # noqa: WPS615
+        """Return page size requested by the client."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_count(self, queryset):  # noqa: WPS615
+        """Return total number of objects."""
+        if isinstance(queryset, QuerySet):
+            return queryset.count()
+        return len(queryset)
+
+    def get_next_link(self):
+        """Return url of the next page or None."""
+        if not self.has_next:
+            return None
+        cursor = self.encode_cursor(self.next_position)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, position):
+        """Return cursor pointing after the object with the primary key."""
+        return b64encode(str(position).encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """Return primary key stored in the cursor or None."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return int(b64decode(encoded.encode('ascii'), validate=True))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class TerminologyPagination(PageNumberPagination):
+    """Page number pagination with opt-in keyset mode.
+
+    Keyset mode is used when the cursor query parameter is present, an
+    empty cursor selects the first page.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a single page of objects."""
+        self.keyset_pagination = None
+        cursor_query_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.display_page_controls = False
+        self.keyset_pagination = self.keyset_pagination_class()
+        return self.keyset_pagination.paginate_queryset(
+            queryset, request, view=view,
+        )
+
+    def get_paginated_response(self, data):  # noqa: WPS110
+        """Return paginated response."""
+        if self.keyset_pagination is not None:
+            return self.keyset_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator estimating the number of rows of big unfiltered tables.
+
+    Counting all rows of a big table takes a sequential scan, so the count
+    of an unfiltered queryset is taken from PostgreSQL statistics if it
+    exceeds exact_count_limit. Filtered querysets, small tables and other
+    databases are counted exactly.
+    """
+
+    exact_count_limit = 100000
+
+    @cached_property
+    def count(self):
+        """Return the estimated or exact number of objects."""
+        estimated_count = self.get_estimated_count()
+        if estimated_count is not None:
+            if estimated_count > self.exact_count_limit:
+                return estimated_count
+        return super().count
+
+    def get_estimated_count(self):
+        """Return estimated number of rows of the table or None."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return None
+        query = queryset.query
+        connection = connections[queryset.db]
+        if query.where or query.distinct or connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(
+                    queryset.model._meta.db_table,  # noqa: WPS437
+                )],
+            )
+            row = cursor.fetchone()
+        return None if row is None else int(row[0])
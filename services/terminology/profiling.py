@@ -0,0 +1,213 @@
+import cProfile
+import json
+import pstats
+import tempfile
+import time
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from services.terminology import metrics
+
+PROFILE_FILE = 'profile.pstats'
+REQUEST_FILE = 'request.json'
+BUNDLE_TIME_FORMAT = '%Y%m%dT%H%M%S-'  # noqa: WPS323
+STATEMENT_FIELDS = ('sql', 'duration', 'origin')
+# Execute wrappers are not origins of statements.
+WRAPPER_FILES = frozenset((__file__, metrics.__file__))  # noqa: WPS609
+
+_request_profile = ContextVar('terminology_request_profile', default=None)
+
+
+class RequestProfile(object):
+    """Profile of a request: cProfile stats and SQL statements.
+
+    Inside the with block functions of the current thread are profiled if
+    profile_functions is true, and SQL statements of the current context
+    are recorded with their durations and origins in the project code.
+    """
+
+    def __init__(self, profile_functions=True):
+        """Initialize empty profile."""
+        self.profiler = cProfile.Profile() if profile_functions else None
+        self.statements = []
+        self._token = None
+
+    def __enter__(self):
+        """Start profiling."""
+        self._token = _request_profile.set(self)
+        if self.profiler is not None:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Stop profiling."""
+        if self.profiler is not None:
+            self.profiler.disable()
+        _request_profile.reset(self._token)
+
+    def add_statement(self, sql, duration, origin):
+        """Record the SQL statement."""
+        self.statements.append(
+            dict(zip(STATEMENT_FIELDS, (sql, duration, origin))),
+        )
+
+    def save(self, directory, request_info):
+        """Write the bundle of the profile and return its path.
+
+        The bundle is a directory with cProfile stats and a JSON file with
+        request_info and SQL statements.
+        """
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        bundle = Path(tempfile.mkdtemp(
+            prefix=time.strftime(BUNDLE_TIME_FORMAT), dir=directory,
+        ))
+        if self.profiler is not None:
+            self.profiler.dump_stats(bundle / PROFILE_FILE)
+        with open(bundle / REQUEST_FILE, 'w', encoding='utf-8') as file_obj:
+            json.dump(
+                {**request_info, 'statements': self.statements}, file_obj,
+            )
+        return bundle
+
+
+class ProfileReport(object):
+    """Summary of profile bundles."""
+
+    def __init__(self, bundles):
+        """Load bundles."""
+        self.bundles = list(bundles)
+        self.requests = []
+        for bundle in self.bundles:
+            with open(bundle / REQUEST_FILE, encoding='utf-8') as file_obj:
+                self.requests.append(json.load(file_obj))
+
+    @classmethod
+    def find_bundles(cls, directory):
+        """Return bundles of the directory."""
+        return sorted(
+            path.parent for path in Path(directory).glob(f'*/{REQUEST_FILE}')
+        )
+
+    def get_stats(self, stream=None):
+        """Return merged cProfile stats or None if there are none."""
+        profile_paths = [
+            str(bundle / PROFILE_FILE)
+            for bundle in self.bundles
+            if (bundle / PROFILE_FILE).exists()
+        ]
+        if not profile_paths:
+            return None
+        return pstats.Stats(*profile_paths, stream=stream)
+
+    def get_top_statements(self, limit):
+        """Return SQL statements with the largest total duration.
+
+        Rows are dictionaries with sql, count, duration and origin keys,
+        statements are grouped by SQL without parameters.
+        """
+        grouped = {}
+        for request_statements in self.get_statements():
+            for sql, duration, origin in request_statements:
+                row = grouped.setdefault(sql, {
+                    'sql': sql,
+                    'count': 0,
+                    'duration': 0,
+                    'origin': origin,
+                })
+                row['count'] += 1
+                row['duration'] += duration
+        return sorted(
+            grouped.values(), key=lambda row: row['duration'], reverse=True,
+        )[:limit]
+
+    def get_repeated_statements(self, threshold):
+        """Return N+1 patterns.
+
+        A pattern is the same SQL statement executed from the same origin
+        at least threshold times in one request. Rows are dictionaries with
+        sql, origin, requests (number of requests with the pattern) and
+        max_count (the largest number of executions in one request) keys.
+        """
+        patterns = {}
+        for request_statements in self.get_statements():
+            counts = {}
+            for statement_sql, _, statement_origin in request_statements:
+                statement_key = (statement_sql, tuple(statement_origin))
+                counts[statement_key] = counts.get(statement_key, 0) + 1
+            for (sql, origin), statements_count in counts.items():
+                if statements_count < threshold:
+                    continue
+                row = patterns.setdefault((sql, origin), {
+                    'sql': sql,
+                    'origin': list(origin),
+                    'requests': 0,
+                    'max_count': 0,
+                })
+                row['requests'] += 1
+                row['max_count'] = max(row['max_count'], statements_count)
+        return sorted(
+            patterns.values(),
+            key=lambda row: (row['max_count'], row['requests']),
+            reverse=True,
+        )
+
+    def get_statements(self):
+        """Return lists of (sql, duration, origin) of every request."""
+        return [
+            [
+                tuple(statement[field] for field in STATEMENT_FIELDS)
+                for statement in request_info['statements']
+            ]
+            for request_info in self.requests
+        ]
+
+
+def get_origin():
+    """Return frames of the project code calling the current function.
+
+    Frames are 'path:line in function' strings relative to BASE_DIR, the
+    innermost frame is the last one. Frames of execute wrappers are
+    skipped.
+    """
+    base_dir = str(settings.BASE_DIR)
+    return [
+        '{0}:{1} in {2}'.format(
+            Path(frame.filename).relative_to(base_dir),
+            frame.lineno,
+            frame.name,
+        )
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir) and (
+            frame.filename not in WRAPPER_FILES
+        )
+    ]
+
+
+def record_statement(execute, sql, params, many, context):  # noqa: WPS110
+    """Execute wrapper recording statements of the profiled context.
+
+    It is installed into every database connection and only calls the
+    query outside of RequestProfile blocks.
+    """
+    request_profile = _request_profile.get()
+    if request_profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:  # noqa: WPS501
+        return execute(sql, params, many, context)
+    finally:
+        request_profile.add_statement(
+            sql, time.perf_counter() - start, get_origin(),
+        )
+
+
+@receiver(connection_created)
+def install_statement_recorder(sender, connection, **kwargs):
+    """Add record_statement() to execute wrappers of the new connection."""
+    if record_statement not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_statement)
@@ -0,0 +1,133 @@
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+
+from services.terminology.diff import ADDED, CHANGED, REMOVED
+from services.terminology.fingerprints import (
+    get_guide_items,
+    update_fingerprints,
+)
+from services.terminology.models import GuideItem, GuideVersion
+
+GUIDE_ITEM_TABLE = GuideItem._meta.db_table  # noqa: WPS437
+THROUGH_TABLE = (
+    GuideVersion.guide_items.through._meta.db_table  # noqa: WPS437
+)
+COPY_SQL = (
+    f'INSERT INTO {THROUGH_TABLE} '  # noqa: S608, WPS323
+    f'(guideversion_id, guideitem_id) '
+    f'SELECT %(guide_version_id)s, guideitem_id FROM {THROUGH_TABLE} '
+    f'WHERE guideversion_id = %(base_version_id)s'
+)
+REMOVE_SQL = (
+    f'DELETE FROM {THROUGH_TABLE} membership '  # noqa: S608, WPS323
+    f'USING {GUIDE_ITEM_TABLE} item '
+    f'WHERE membership.guideversion_id = %(guide_version_id)s '
+    f'AND item.id = membership.guideitem_id '
+    f'AND item.code = ANY(%(codes)s) '
+    f'RETURNING item.id, item.code, item.value'
+)
+CREATE_SQL = (
+    f'INSERT INTO {GUIDE_ITEM_TABLE} (code, value) '  # noqa: S608, WPS323
+    f'SELECT * FROM unnest(%(codes)s::text[], %(values)s::text[]) '
+    f'ON CONFLICT (code, value) DO NOTHING'
+)
+ATTACH_SQL = (
+    f'INSERT INTO {THROUGH_TABLE} '  # noqa: S608, WPS323
+    f'(guideversion_id, guideitem_id) '
+    f'SELECT %(guide_version_id)s, item.id '
+    f'FROM unnest(%(codes)s::text[], %(values)s::text[]) '
+    f'AS added (code, value) '
+    f'JOIN {GUIDE_ITEM_TABLE} item '
+    f'ON item.code = added.code AND item.value = added.value '
+    f'ON CONFLICT DO NOTHING '
+    f'RETURNING guideitem_id'
+)
+
+
+class VersionExistsError(ValueError):
+    """Raised when the guide already has a version with the name."""
+
+
+def publish_version(  # noqa: WPS211
+    base_version, version, start_date, changes=(), batch_size=10000,
+):
+    """Create a new version of the guide from the base version and changes.
+
+    Guide items of the base version are copied to the new version with one
+    query. changes are dictionaries with change, code and value keys like
+    rows of the diff of versions: guide items with the code of a removed
+    or changed row are removed, guide items of added and changed rows are
+    added, identical existing guide items are reused. Changes are applied
+    in batches of batch_size rows with a few set-based queries each, and
+    the fingerprint is updated incrementally. Everything is done in one
+    transaction. Return the new guide version. Raise VersionExistsError if
+    the version exists, e.g. it is published concurrently.
+    """
+    with transaction.atomic():
+        # The base version is locked, so its guide items and fingerprint
+        # do not change until the new version is created.
+        base_version = GuideVersion.objects.select_for_update().get(
+            pk=base_version.pk,
+        )
+        try:
+            guide_version = GuideVersion.objects.create(
+                guide_id=base_version.guide_id,
+                version=version,
+                start_date=start_date,
+            )
+        except IntegrityError:
+            raise VersionExistsError(f'Version {version} already exists')
+        with connection.cursor() as cursor:
+            cursor.execute(COPY_SQL, {
+                'guide_version_id': guide_version.pk,
+                'base_version_id': base_version.pk,
+            })
+        guide_version.fingerprint = base_version.fingerprint
+        guide_version.save(update_fields=['fingerprint', 'modified'])
+
+        changes = iter(changes)
+        while True:
+            batch = list(islice(changes, batch_size))
+            if not batch:
+                break
+            _apply_changes(guide_version, batch)
+        guide_version.refresh_from_db(fields=['fingerprint', 'modified'])
+    return guide_version
+
+
+def _apply_changes(guide_version, batch):
+    removed_codes = [
+        change['code']
+        for change in batch
+        if change['change'] in {REMOVED, CHANGED}
+    ]
+    added_rows = [
+        (change['code'], change['value'])
+        for change in batch
+        if change['change'] in {ADDED, CHANGED}
+    ]
+    removed = []
+    added_ids = []
+    with connection.cursor() as cursor:
+        if removed_codes:
+            cursor.execute(REMOVE_SQL, {
+                'guide_version_id': guide_version.pk,
+                'codes': removed_codes,
+            })
+            removed = cursor.fetchall()
+        if added_rows:
+            codes, item_values = map(list, zip(*added_rows))
+            added_params = {
+                'guide_version_id': guide_version.pk,
+                'codes': codes,
+                'values': item_values,
+            }
+            cursor.execute(CREATE_SQL, added_params)
+            cursor.execute(ATTACH_SQL, added_params)
+            added_ids = [row[0] for row in cursor.fetchall()]
+    update_fingerprints(
+        [guide_version.pk],
+        added=get_guide_items(added_ids),
+        removed=removed,
+    )
@@ -0,0 +1,128 @@
+import abc
+import csv
+import io
+import json
+from itertools import islice
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson  # noqa: WPS433
+except ImportError:  # pragma: no cover
+    orjson = None  # noqa: WPS440
+
+LINE_SEPARATORS = (
+    ('\u2028'.encode(), r'\u2028'.encode()),
+    ('\u2029'.encode(), r'\u2029'.encode()),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer using orjson if it is installed.
+
+    The output is the same as the one of JSONRenderer with default
+    settings: compact and not escaped to ASCII except line and paragraph
+    separators. Indented output and data that orjson cannot encode (e.g.
+    too big integers) are rendered by JSONRenderer. Floats are formatted
+    differently by orjson, so use it only for data without floats.
+    """
+
+    def render(
+        self,
+        data,  # noqa: WPS110
+        accepted_media_type=None,
+        renderer_context=None,
+    ):
+        """Render data into JSON."""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or data is None or indent or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            rendered = rendered.replace(separator, escaped)
+        return rendered
+
+
+class StreamingRenderer(BaseRenderer, abc.ABC):
+    """Base renderer of rows that can be streamed chunk by chunk."""
+
+    charset = 'utf-8'
+    chunk_size = 2000
+
+    def render(
+        self,
+        data,  # noqa: WPS110
+        accepted_media_type=None,
+        renderer_context=None,
+    ):
+        """Render data at once.
+
+        A list is rendered as rows, any other data as a single row.
+        """
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.render_rows(rows))
+
+    def render_rows(self, rows):
+        """Yield rendered chunks of rows.
+
+        rows is an iterable of dictionaries with the same keys.
+        """
+        rows = iter(rows)
+        chunk = list(islice(rows, self.chunk_size))
+        if not chunk:
+            return
+        yield self.render_header(chunk[0]).encode(self.charset)
+        while chunk:
+            yield self.render_chunk(chunk).encode(self.charset)
+            chunk = list(islice(rows, self.chunk_size))
+
+    def render_header(self, row):
+        """Return text preceding the rows."""
+        return ''
+
+    @abc.abstractmethod
+    def render_chunk(self, rows):
+        """Return text of the rows."""
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Renderer of newline delimited JSON."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'  # noqa: WPS125
+
+    def render_chunk(self, rows):
+        """Return one JSON document per line."""
+        return ''.join(
+            '{0}\n'.format(
+                json.dumps(row, ensure_ascii=False, separators=(',', ':')),
+            )
+            for row in rows
+        )
+
+
+class CSVRenderer(StreamingRenderer):
+    """Renderer of CSV with a header line."""
+
+    media_type = 'text/csv'
+    format = 'csv'  # noqa: WPS125
+
+    def render_header(self, row):
+        """Return the header line with keys of the row."""
+        return self._write([list(row)])
+
+    def render_chunk(self, rows):
+        """Return one CSV line per row."""
+        return self._write([list(row.values()) for row in rows])
+
+    def _write(self, lines):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(lines)
+        return buffer.getvalue()
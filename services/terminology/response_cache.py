@@ -0,0 +1,116 @@
+import hashlib
+import threading
+
+from django.core.cache import caches
+
+from services.terminology.conf import get_setting
+
+KEY_DIGEST_SIZE = 16
+
+
+class ResponseCache(object):  # noqa: WPS214
+    """Cache of rendered responses built on the Django cache framework.
+
+    Entries are stored in the RESPONSE_CACHE_ALIAS cache for
+    RESPONSE_CACHE_TIMEOUT seconds, 0 disables the cache. Keys contain
+    the generation stored in the same cache, invalidate() increments it,
+    so all entries are dropped at once for all processes sharing the cache
+    backend. Hits and misses are counted per process.
+    """
+
+    def __init__(self, name):
+        """Initialize cache of responses with keys prefixed by name."""
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        """Return the Django cache keeping entries."""
+        return caches[get_setting('RESPONSE_CACHE_ALIAS')]
+
+    @property
+    def timeout(self):
+        """Return lifetime of entries in seconds."""
+        return get_setting('RESPONSE_CACHE_TIMEOUT')
+
+    @property
+    def enabled(self):
+        """Return True if responses are cached."""
+        return bool(self.timeout)
+
+    def get_key(self, request_key):
+        """Return key of the entry of the request in the current generation.
+
+        request_key identifies the response, e.g. it is the ETag.
+        """
+        digest = hashlib.blake2b(
+            request_key.encode(), digest_size=KEY_DIGEST_SIZE,
+        )
+        return f'{self._get_prefix()}:{digest.hexdigest()}'
+
+    def get(self, key):
+        """Return (body, content_type) of the entry or None."""
+        entry = self.cache.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def set(self, key, body, content_type):  # noqa: WPS125
+        """Store the body and the content type of the rendered response."""
+        self.cache.set(key, (body, content_type), self.timeout)
+        prefix, _, _ = key.rpartition(':')
+        self._increment(f'{prefix}:entries', self.timeout)
+
+    def get_generation(self):
+        """Return the generation, it is changed by every invalidation."""
+        return self.cache.get(self._get_generation_key(), 0)
+
+    def invalidate(self):
+        """Drop all entries."""
+        self._increment(self._get_generation_key(), None)
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        self.invalidate()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        """Return counters, the hit ratio and the number of entries.
+
+        The number of entries is counted since the last invalidation and
+        does not take entries evicted by the cache backend into account.
+        """
+        entries = self.cache.get(f'{self._get_prefix()}:entries', 0)
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / requests if requests else 0,
+                'entries': entries,
+            }
+
+    def _get_prefix(self):
+        return f'{self.name}:{self.get_generation()}'
+
+    def _get_generation_key(self):
+        return f'{self.name}:generation'
+
+    def _increment(self, key, timeout):
+        cache = self.cache
+        if cache.add(key, 1, timeout=timeout):
+            return
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=timeout)
+
+
+guide_list_cache = ResponseCache('terminology:guide-list')
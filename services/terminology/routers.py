@@ -0,0 +1,103 @@
+import random
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+from services.terminology.conf import get_setting
+
+APP_LABEL = 'terminology'
+
+_request_routing = ContextVar('terminology_request_routing', default=None)
+
+
+def is_terminology_model(model):
+    """Return True if the model belongs to the terminology app."""
+    return model._meta.app_label == APP_LABEL  # noqa: WPS437
+
+
+class ReplicaRouting(object):
+    """Routing of database queries of a request.
+
+    Inside the with block reads of terminology models of the current
+    context go to a read replica if replica_reads is set and nothing has
+    been written yet. One replica of READ_REPLICAS is picked per request.
+    """
+
+    __slots__ = ('replica_reads', 'wrote', '_replica', '_token')
+
+    def __init__(self):
+        """Initialize routing to the primary database."""
+        self.replica_reads = False
+        self.wrote = False
+        self._replica = None
+        self._token = None
+
+    def __enter__(self):
+        """Start routing queries of the current context."""
+        self._token = _request_routing.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop routing queries of the current context."""
+        _request_routing.reset(self._token)
+
+    @classmethod
+    def get_current(cls):
+        """Return routing of the current context or None."""
+        return _request_routing.get()
+
+    def get_read_database(self):
+        """Return alias of the database to read from."""
+        if not self.replica_reads or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self._replica is None:
+            self._replica = random.choice(  # noqa: S311
+                get_setting('READ_REPLICAS'),
+            )
+        return self._replica
+
+
+class ReplicaRouter(object):
+    """Database router sending reads of terminology models to replicas.
+
+    Reads are only sent to a replica inside ReplicaRouting blocks allowing
+    it, they are set up by ReplicaRoutingMiddleware, so management
+    commands, signals and other code outside requests use the primary.
+    Writes always go to the primary and switch the rest of the request to
+    the primary too. Other apps are not routed.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Return the database to read the model from."""
+        routing = _request_routing.get()
+        if routing is None or not is_terminology_model(model):
+            return None
+        return routing.get_read_database()
+
+    def db_for_write(self, model, **hints):
+        """Return the primary database for terminology models.
+
+        Objects read from a replica are written to the primary too.
+        """
+        if not is_terminology_model(model):
+            return None
+        routing = _request_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow relations of objects of the primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *get_setting('READ_REPLICAS')}
+        related_databases = {
+            instance._state.db for instance in (obj1, obj2)  # noqa: WPS437
+        }
+        if related_databases <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Do not migrate replicas, they are copies of the primary."""
+        if db in get_setting('READ_REPLICAS'):
+            return False
+        return None
@@ -1,6 +1,77 @@
+from contextlib import suppress
+
+from django.db import models
 from rest_framework import serializers
 
 from services.terminology.models import GuideItem, GuideVersion
+from services.terminology.validation import (
+    GuideItemCodeLookup,
+    GuideItemLookup,
+)
+
+NESTED_FIELDS = (serializers.BaseSerializer, serializers.RelatedField)
+CONTENT_FIELDS = ('code', 'value')
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """List serializer with a fast path for rows of .values_list().
+
+    get_values_queryset() selects sources of readable fields of the child
+    as named rows, so the list is built without model instances and
+    attribute lookups. Values are converted by to_representation() of
+    their fields, so the representation is the same as the one of the
+    child. Other data are serialized by the child as usual.
+    """
+
+    def get_values_queryset(self, queryset):
+        """Return queryset of named rows or queryset if it is impossible.
+
+        Rows contain the primary key and sources of readable fields.
+        """
+        lookups = self.get_lookups()
+        if lookups is None:
+            return queryset
+        return queryset.values_list('pk', *lookups, named=True)
+
+    def get_lookups(self):
+        """Return lookups of readable fields or None.
+
+        None is returned if some field is not a plain attribute of the
+        model or its relations.
+        """
+        lookups = []
+        for field in self.get_readable_fields():
+            if field.source == '*' or isinstance(field, NESTED_FIELDS):
+                return None
+            lookups.append('__'.join(field.source_attrs))
+        return list(dict.fromkeys(lookups))
+
+    def get_readable_fields(self):
+        """Return readable fields of the child."""
+        return list(self.child._readable_fields)  # noqa: WPS437
+
+    def to_representation(self, data):  # noqa: WPS110
+        """Return list of representations of rows or instances."""
+        rows = list(data.all() if isinstance(data, models.Manager) else data)
+        if not rows or not isinstance(rows[0], tuple):
+            return super().to_representation(rows)
+
+        lookups = self.get_lookups()
+        converters = [
+            (
+                field.field_name,
+                field.to_representation,
+                lookups.index('__'.join(field.source_attrs)) + 1,
+            )
+            for field in self.get_readable_fields()
+        ]
+        return [
+            {
+                name: None if row[position] is None else convert(row[position])
+                for name, convert, position in converters
+            }
+            for row in rows
+        ]
 
 
 class GuideSerializer(serializers.ModelSerializer):
@@ -24,6 +95,38 @@ class GuideSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'short_name', 'description', 'version', 'start_date',
         ]
+        list_serializer_class = ValuesListSerializer
+
+
+class GuideItemListSerializer(ValuesListSerializer):
+    """Serializer of list of GuideItem.
+
+    All guide items of the list are looked up with a single query. The guide
+    version to check membership against is taken from the context. A lookup
+    with already loaded guide items can be passed in the context as
+    guide_item_lookup instead.
+    """
+
+    def to_internal_value(self, data):  # noqa: WPS110
+        """Load guide items before validation of the list."""
+        self.guide_item_lookup = self.context.get('guide_item_lookup')
+        if self.guide_item_lookup is None:
+            self.guide_item_lookup = GuideItemLookup(
+                self.context.get('guide_version'),
+            )
+            if isinstance(data, list):
+                self.guide_item_lookup.load(self.get_ids(data))
+        return super().to_internal_value(data)
+
+    def get_ids(self, data):  # noqa: WPS110
+        """Return valid ids of guide items of the data."""
+        id_field = self.child.fields['id']
+        ids = []
+        for guide_item in data:
+            with suppress(TypeError, KeyError, serializers.ValidationError):
+                guide_item_id = guide_item[id_field.field_name]
+                ids.append(id_field.to_internal_value(guide_item_id))
+        return ids
 
 
 class GuideItemSerializer(serializers.ModelSerializer):
@@ -35,25 +138,147 @@ class GuideItemSerializer(serializers.ModelSerializer):
     class Meta(object):
         model = GuideItem
         fields = [
-            'id', 'guide_id', 'code', 'value',
+            'id', 'guide_id', *CONTENT_FIELDS,
         ]
+        list_serializer_class = GuideItemListSerializer
+        # Guide items are checked against existing ones, so the unique
+        # constraint of their content must not reject them.
+        validators = []
+
+    def get_guide_item(self, pk):
+        """Return (code, value) of GuideItem or None if it does not exist."""
+        guide_item_lookup = getattr(self.parent, 'guide_item_lookup', None)
+        if guide_item_lookup is None:
+            return GuideItem.objects.filter(
+                pk=pk,
+            ).values_list(*CONTENT_FIELDS).first()
+        return guide_item_lookup.get(pk)
 
     def validate_id(self, value):  # noqa: WPS110
         """Raise ValidationError if GuideItem does not exist."""
-        try:
-            GuideItem.objects.get(pk=value)
-        except GuideItem.DoesNotExist:
+        if self.get_guide_item(value) is None:
             raise serializers.ValidationError({value: 'does not exist'})
         return value
 
     def validate(self, data):  # noqa: WPS110
         """Validate code, value."""
-        guide_item = GuideItem.objects.get(pk=data['id'])
+        guide_item_id = data['id']
+        guide_item = dict(zip(
+            CONTENT_FIELDS, self.get_guide_item(guide_item_id),
+        ))
         errors = []
-        fields = ['code', 'value']
-        for field in fields:
-            if getattr(guide_item, field) != data[field]:
+        for field in CONTENT_FIELDS:
+            if guide_item[field] != data[field]:
                 errors.append(f'{field} is incorrect')
         if errors:
-            raise serializers.ValidationError({data['id']: errors})
+            raise serializers.ValidationError({guide_item_id: errors})
         return data
+
+
+class GuideItemCodeListSerializer(serializers.ListSerializer):
+    """Serializer of list of guide items identified by code.
+
+    All codes of the list are resolved with a single query against the
+    guide version taken from the context.
+    """
+
+    def to_internal_value(self, data):  # noqa: WPS110
+        """Load guide items before validation of the list."""
+        self.guide_item_lookup = GuideItemCodeLookup(
+            self.context.get('guide_version'),
+        )
+        if isinstance(data, list):
+            self.guide_item_lookup.load(self.get_codes(data))
+        return super().to_internal_value(data)
+
+    def get_codes(self, data):  # noqa: WPS110
+        """Return valid codes of guide items of the data."""
+        code_field = self.child.fields['code']
+        codes = []
+        for guide_item in data:
+            with suppress(TypeError, KeyError, serializers.ValidationError):
+                code = guide_item[code_field.field_name]
+                codes.append(code_field.run_validation(code))
+        return codes
+
+
+class GuideItemCodeSerializer(serializers.ModelSerializer):
+    """Serializer of GuideItem identified by code.
+
+    The value is optional and is validated if given. Validated data are the
+    guide item with id, guide_id and the canonical value.
+    """
+
+    class Meta(object):
+        model = GuideItem
+        fields = CONTENT_FIELDS
+        extra_kwargs = {'value': {'required': False}}
+        list_serializer_class = GuideItemCodeListSerializer
+        validators = []
+
+    def get_guide_item(self, code):
+        """Return (id, value) of GuideItem or None if it does not exist."""
+        guide_item_lookup = getattr(self.parent, 'guide_item_lookup', None)
+        if guide_item_lookup is None:
+            guide_item_lookup = GuideItemCodeLookup(
+                self.context.get('guide_version'),
+            )
+            guide_item_lookup.load([code])
+        return guide_item_lookup.get(code)
+
+    def validate_code(self, code):
+        """Raise ValidationError if GuideItem does not exist."""
+        if self.get_guide_item(code) is None:
+            raise serializers.ValidationError({code: 'does not exist'})
+        return code
+
+    def validate(self, data):  # noqa: WPS110
+        """Validate value and return the guide item."""
+        code = data['code']
+        guide_item_id, item_value = self.get_guide_item(code)
+        if data.get('value', item_value) != item_value:
+            raise serializers.ValidationError({code: ['value is incorrect']})
+        return dict(zip(GuideItemSerializer.Meta.fields, (
+            guide_item_id,
+            self.context['guide_version'].guide_id,
+            code,
+            item_value,
+        )))
+
+
+class GuideItemBatchSerializer(serializers.Serializer):
+    """Serializer of guide items of several guides to validate.
+
+    versions maps guide ids to versions, guides without a version are
+    validated against their current versions. Validated guide items are
+    grouped by guide_id.
+    """
+
+    versions = serializers.DictField(
+        child=serializers.CharField(), required=False, default=dict,
+    )
+    guide_items = serializers.ListField(child=serializers.DictField())
+
+    def validate_versions(self, versions):
+        """Return versions by integer guide ids."""
+        guide_id_field = serializers.IntegerField()
+        return {
+            guide_id_field.run_validation(guide_id): version
+            for guide_id, version in versions.items()
+        }
+
+    def validate_guide_items(self, guide_items):
+        """Return guide items grouped by guide_id."""
+        guide_id_field = serializers.IntegerField()
+        grouped = {}
+        for guide_item in guide_items:
+            try:
+                guide_id = guide_id_field.run_validation(
+                    guide_item.get('guide_id'),
+                )
+            except serializers.ValidationError:
+                raise serializers.ValidationError(
+                    'guide_id of every guide item must be an integer',
+                )
+            grouped.setdefault(guide_id, []).append(guide_item)
+        return grouped
@@ -0,0 +1,145 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from services.terminology.cache import version_items_cache
+from services.terminology.effective_versions import refresh_effective_versions
+from services.terminology.fingerprints import (
+    GUIDE_ITEM_FIELDS,
+    update_fingerprints,
+    update_guide_item_fingerprints,
+    update_version_fingerprints,
+)
+from services.terminology.models import Guide, GuideItem, GuideVersion
+from services.terminology.response_cache import guide_list_cache
+from services.terminology.version_index import version_index
+
+DERIVED_FIELDS = frozenset(('fingerprint', 'modified'))
+
+# In-memory state of the worker and cached responses are only updated
+# after the transaction is committed, so rolled back changes are not seen.
+
+
+@receiver(post_save, sender=Guide)
+def guide_saved(sender, instance, created, **kwargs):
+    """Update modified timestamps of versions of the changed guide.
+
+    Versions are updated with one query, the version index gets the new
+    timestamps after commit. The effective version is refreshed, the save
+    could overwrite it with a stale one.
+    """
+    refresh_effective_versions([instance.pk])
+    if created:
+        return
+    guide_versions = GuideVersion.objects.filter(guide=instance)
+    guide_versions.update(modified=timezone.now())
+    for guide_version in guide_versions:
+        version_index.on_commit(version_index.update, guide_version)
+    transaction.on_commit(guide_list_cache.invalidate)
+
+
+@receiver(pre_save, sender=GuideItem)
+def guide_item_saving(sender, instance, **kwargs):
+    """Remember stored (id, code, value) of the changed guide item."""
+    instance.stored_content = None
+    if instance.pk is not None:
+        instance.stored_content = GuideItem.objects.filter(
+            pk=instance.pk,
+        ).values_list(*GUIDE_ITEM_FIELDS).first()
+
+
+@receiver(post_save, sender=GuideItem)
+def guide_item_saved(sender, instance, created, **kwargs):
+    """Update guide versions containing the changed guide item.
+
+    The stored guide item is replaced with the saved one in fingerprints
+    of the guide versions, and their cached entries are invalidated.
+    """
+    stored_content = instance.stored_content
+    saved_content = (instance.pk, instance.code, instance.value)
+    if created or stored_content is None or stored_content == saved_content:
+        return
+    update_fingerprints(
+        instance.guideversion_set.values_list('id', flat=True),
+        added=[saved_content],
+        removed=[stored_content],
+    )
+    transaction.on_commit(partial(
+        version_items_cache.invalidate_guide_items, [instance.pk],
+    ))
+
+
+@receiver(pre_delete, sender=GuideItem)
+def guide_item_deleting(sender, instance, **kwargs):
+    """Remove the guide item from fingerprints of its guide versions.
+
+    Cached entries containing the guide item are invalidated after commit.
+    """
+    update_guide_item_fingerprints(instance, 'pre_clear', None)
+    transaction.on_commit(partial(
+        version_items_cache.invalidate_guide_items, [instance.pk],
+    ))
+
+
+@receiver(post_save, sender=GuideVersion)
+def guide_version_saved(sender, instance, update_fields, **kwargs):
+    """Update the guide version in the version index.
+
+    Cached lists of guides are invalidated and the effective version of
+    the guide is refreshed unless only the fingerprint and the modified
+    timestamp are updated.
+    """
+    version_index.on_commit(version_index.update, instance)
+    if update_fields is None or update_fields - DERIVED_FIELDS:
+        transaction.on_commit(guide_list_cache.invalidate)
+        refresh_effective_versions([instance.guide_id])
+
+
+@receiver(post_delete, sender=GuideVersion)
+def guide_version_deleted(sender, instance, **kwargs):
+    """Invalidate the deleted guide version and refresh the guide.
+
+    Versions of a deleted guide are deleted too, so lists of guides are
+    invalidated by deletions of guides as well.
+    """
+    transaction.on_commit(partial(
+        version_items_cache.invalidate, [instance.pk],
+    ))
+    transaction.on_commit(guide_list_cache.invalidate)
+    refresh_effective_versions([instance.guide_id])
+    version_index.on_commit(version_index.remove, instance.pk)
+
+
+@receiver(m2m_changed, sender=GuideVersion.guide_items.through)
+def guide_version_items_changed(  # noqa: WPS211
+    sender, instance, action, reverse, pk_set, **kwargs,
+):
+    """Update guide versions whose guide items have changed.
+
+    Their fingerprints are updated and cached entries are invalidated.
+    """
+    if reverse:
+        update_guide_item_fingerprints(instance, action, pk_set)
+    else:
+        update_version_fingerprints(instance, action, pk_set)
+
+    if not action.startswith('post_'):
+        return
+    if reverse and pk_set is None:
+        invalidate = partial(
+            version_items_cache.invalidate_guide_items, [instance.pk],
+        )
+    elif reverse:
+        invalidate = partial(version_items_cache.invalidate, list(pk_set))
+    else:
+        invalidate = partial(version_items_cache.invalidate, [instance.pk])
+    transaction.on_commit(invalidate)
@@ -0,0 +1,258 @@
+import mmap
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from pathlib import Path
+
+from django.db import models
+
+from services.terminology.conf import get_setting
+from services.terminology.fingerprints import combine
+from services.terminology.models import GuideVersion
+
+MAGIC = b'TSNAP001'
+# Magic, guide version id, guide id, fingerprint and number of guide items.
+HEADER = struct.Struct('=8sqq16sq')
+SNAPSHOT_SUFFIX = '.snapshot'
+
+
+class VersionSnapshot(Sequence):  # noqa: WPS214
+    """Memory-mapped snapshot of guide items of a guide version.
+
+    The file consists of the header, sorted ids of guide items, offsets of
+    codes and values in the string pool and the pool of UTF-8 strings.
+    Nothing is read until guide items are accessed, and pages of the file
+    are shared by all processes through the page cache. The interface is
+    the same as of VersionItems of the cache.
+    """
+
+    def __init__(self, path):
+        """Map the snapshot file."""
+        self.path = Path(path)
+        with open(self.path, 'rb') as snapshot_file:
+            self._mmap = mmap.mmap(
+                snapshot_file.fileno(), 0, access=mmap.ACCESS_READ,
+            )
+        header = HEADER.unpack_from(self._mmap)
+        magic, version_id, guide_id, fingerprint, size = header  # noqa: WPS236
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a snapshot of a guide version')
+        self.guide_version_id = version_id
+        self.guide_id = guide_id
+        self.fingerprint = fingerprint.decode()
+        ids_end = HEADER.size + size * array('q').itemsize
+        offsets_end = ids_end + (size * 2 + 1) * array('Q').itemsize
+        buffer = memoryview(self._mmap)
+        self.ids = buffer[HEADER.size:ids_end].cast('q')
+        self._offsets = buffer[ids_end:offsets_end].cast('Q')
+        self._pool_start = offsets_end
+
+    def __len__(self):
+        """Return number of guide items."""
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        """Return guide item or list of guide items for a slice."""
+        if isinstance(index, slice):
+            return [
+                self._get_row(position)
+                for position in range(*index.indices(len(self)))
+            ]
+        return self._get_row(range(len(self))[index])
+
+    def __contains__(self, pk):
+        """Return True if the guide item with pk is in the guide version."""
+        return self._find(pk) is not None
+
+    def get(self, pk):
+        """Return (code, value) of the guide item or None if not found."""
+        position = self._find(pk)
+        if position is None:
+            return None
+        return self._get_strings(position)
+
+    def index_after(self, pk):
+        """Return index of the first guide item with id greater than pk."""
+        return bisect_right(self.ids, pk)
+
+    def _find(self, pk):
+        position = bisect_left(self.ids, pk)
+        if position < len(self.ids) and self.ids[position] == pk:
+            return position
+        return None
+
+    def _get_strings(self, position):
+        start, middle, end = (
+            self._pool_start + offset
+            for offset in self._offsets[position * 2:position * 2 + 3]
+        )
+        return (
+            self._mmap[start:middle].decode(),
+            self._mmap[middle:end].decode(),
+        )
+
+    def _get_row(self, position):
+        code, item_value = self._get_strings(position)
+        return {
+            'id': self.ids[position],
+            'guide_id': self.guide_id,
+            'code': code,
+            'value': item_value,
+        }
+
+
+class VersionSnapshots(object):
+    """Per-worker registry of mapped snapshots of guide versions.
+
+    Snapshots are looked up in SNAPSHOT_DIR by the id and the fingerprint
+    of the guide version, so a changed guide version is never served from
+    an old snapshot. Mapped snapshots are kept open. Missing ones are
+    remembered with the modification time of the directory and looked up
+    again once a snapshot is written to or deleted from it.
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def get(self, guide_version):
+        """Return VersionSnapshot of the guide version or None."""
+        directory = get_setting('SNAPSHOT_DIR')
+        if directory is None:
+            return None
+        path = get_snapshot_path(
+            directory, guide_version.pk, guide_version.fingerprint,
+        )
+        with self._lock:
+            cached_path, snapshot, modified = self._snapshots.get(
+                guide_version.pk, (None, None, None),
+            )
+        if cached_path == path and snapshot is not None:
+            return snapshot
+        # The directory is checked before the file, so a snapshot written
+        # in between is found by the next lookup.
+        directory_modified = self._get_modified(directory)
+        if cached_path == path and modified == directory_modified:
+            return None
+        try:
+            snapshot = VersionSnapshot(path)
+        except FileNotFoundError:
+            snapshot = None
+        with self._lock:
+            self._snapshots[guide_version.pk] = (
+                path, snapshot, directory_modified,
+            )
+        return snapshot
+
+    def clear(self):
+        """Drop all snapshots."""
+        with self._lock:
+            self._snapshots.clear()
+
+    def _get_modified(self, directory):
+        try:
+            return Path(directory).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+def get_snapshot_path(directory, guide_version_id, fingerprint):
+    """Return path of the snapshot of the guide version."""
+    file_name = f'{guide_version_id}-{fingerprint}{SNAPSHOT_SUFFIX}'
+    return Path(directory) / file_name
+
+
+def write_snapshot(guide_version, directory, batch_size=10000):
+    """Write the snapshot of guide items of the guide version.
+
+    The fingerprint of the snapshot is computed from the written guide
+    items, so the snapshot is consistent even if the guide version is
+    changed meanwhile. The file is written to a temporary file and renamed,
+    so readers never see a partial snapshot. Return the path of the file.
+    """
+    ids = array('q')
+    offsets = array('Q', [0])
+    pool = bytearray()
+
+    def add(guide_items):  # noqa: WPS430
+        for guide_item in guide_items:
+            guide_item_id, code, item_value = guide_item
+            ids.append(guide_item_id)
+            pool.extend(code.encode())
+            offsets.append(len(pool))
+            pool.extend(item_value.encode())
+            offsets.append(len(pool))
+            yield guide_item
+
+    fingerprint = combine(added=add(
+        guide_version.guide_items.order_by('id').values_list(
+            'id', 'code', 'value',
+        ).iterator(chunk_size=batch_size),
+    ))
+
+    header = HEADER.pack(
+        MAGIC,
+        guide_version.pk,
+        guide_version.guide_id,
+        fingerprint.encode(),
+        len(ids),
+    )
+    path = get_snapshot_path(directory, guide_version.pk, fingerprint)
+    _write_file(path, (header, ids, offsets, pool))
+    return path
+
+
+def get_superseded_versions(date):
+    """Return guide versions superseded by a version effective on the date."""
+    later_versions = GuideVersion.objects.filter(
+        guide_id=models.OuterRef('guide_id'),
+        start_date__gt=models.OuterRef('start_date'),
+        start_date__lte=date,
+    )
+    return GuideVersion.objects.filter(models.Exists(later_versions))
+
+
+def build_version_snapshots(directory, date, batch_size=10000):
+    """Write snapshots of guide versions superseded on the date.
+
+    Snapshots matching the current fingerprint are kept, the others are
+    written. Snapshots of other guide versions and old snapshots of changed
+    guide versions are deleted. Return numbers of written and deleted
+    snapshots.
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    current_paths = set()
+    written_count = 0
+    for guide_version in get_superseded_versions(date).order_by('id'):
+        path = get_snapshot_path(
+            directory, guide_version.pk, guide_version.fingerprint,
+        )
+        if not path.exists():
+            path = write_snapshot(guide_version, directory, batch_size)
+            written_count += 1
+        current_paths.add(path)
+    stale_paths = [
+        path
+        for path in Path(directory).glob(f'*{SNAPSHOT_SUFFIX}')
+        if path not in current_paths
+    ]
+    for stale_path in stale_paths:
+        stale_path.unlink()
+    return written_count, len(stale_paths)
+
+
+def _write_file(path, parts):
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, delete=False,
+    ) as temporary_file:
+        temporary_path = Path(temporary_file.name)
+        for part in parts:
+            temporary_file.write(part)
+    temporary_path.replace(path)
+
+
+version_snapshots = VersionSnapshots()
@@ -0,0 +1,98 @@
+import datetime
+import random
+
+from django.utils import timezone
+
+from services.terminology.fingerprints import refresh_fingerprints
+from services.terminology.models import Guide, GuideItem, GuideVersion
+
+
+class GuideGenerator(object):
+    """Generator of synthetic guides.
+
+    Each guide gets versions_count versions with items_count guide items.
+    Every next version keeps shared_ratio of guide items of the previous
+    version and is filled up with new guide items. The last version starts
+    today, previous ones start version_interval days earlier each.
+    """
+
+    version_interval = 30
+    batch_size = 5000
+
+    def __init__(  # noqa: WPS211
+        self,
+        guides_count,
+        versions_count,
+        items_count,
+        shared_ratio=1,
+        seed=None,
+    ):
+        """Initialize generator."""
+        self.guides_count = guides_count
+        self.versions_count = versions_count
+        self.items_count = items_count
+        self.shared_ratio = shared_ratio
+        self.random = random.Random(seed)  # noqa: S311
+
+    def generate(self):
+        """Create guides and return them."""
+        return [
+            self.generate_guide(guide_number)
+            for guide_number in range(self.guides_count)
+        ]
+
+    def generate_guide(self, guide_number):
+        """Create guide with versions and guide items."""
+        guide = Guide.objects.create(
+            name=f'synthetic guide {guide_number}',
+            short_name=f'sg{guide_number}',
+        )
+        today = timezone.now().date()
+        guide_item_ids = []
+        for version_number in range(self.versions_count):
+            days_ago = self.version_interval * (
+                self.versions_count - version_number - 1
+            )
+            guide_version = guide.versions.create(
+                version=str(version_number + 1),
+                start_date=today - datetime.timedelta(days=days_ago),
+            )
+            guide_item_ids = self._get_shared_ids(guide_item_ids)
+            guide_item_ids += self._create_guide_items(
+                guide.id,
+                version_number,
+                self.items_count - len(guide_item_ids),
+            )
+            self._attach(guide_version, guide_item_ids)
+            refresh_fingerprints([guide_version.pk])
+        return guide
+
+    def _get_shared_ids(self, guide_item_ids):
+        shared_count = round(len(guide_item_ids) * self.shared_ratio)
+        return self.random.sample(guide_item_ids, shared_count)
+
+    def _create_guide_items(self, guide_id, version_number, count):
+        guide_items = GuideItem.objects.bulk_create(
+            [
+                GuideItem(
+                    code=f'{guide_id}-{version_number}-{number}',
+                    value=f'value {guide_id}-{version_number}-{number}',
+                )
+                for number in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        return [guide_item.pk for guide_item in guide_items]
+
+    def _attach(self, guide_version, guide_item_ids):
+        through = GuideVersion.guide_items.through
+        through.objects.bulk_create(
+            [
+                through(
+                    guideversion_id=guide_version.pk,
+                    guideitem_id=guide_item_id,
+                )
+                for guide_item_id in guide_item_ids
+            ],
+            batch_size=self.batch_size,
+        )
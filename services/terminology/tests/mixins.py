@@ -2,7 +2,25 @@ import datetime
 
 from django.utils import timezone
 
+from services.terminology.cache import version_items_cache
+from services.terminology.fingerprints import combine, get_guide_items
 from services.terminology.models import Guide, GuideItem
+from services.terminology.version_index import version_index
+
+
+class ProcessCacheMixin(object):
+    """Reset caches of the process before and after every test.
+
+    The version index and the cache of guide items of versions live as
+    long as the process, so they must not keep data of other tests.
+    """
+
+    def setUp(self):
+        """Clear the version index and the cache of guide items."""
+        super().setUp()
+        for cache in (version_index, version_items_cache):
+            cache.clear()
+            self.addCleanup(cache.clear)
 
 
 class GuideMixin(object):
@@ -41,6 +59,16 @@ class GuideVersionMixin(object):
             guide_version.guide_items.add(guide_items)
         return guide_version
 
+    def assert_fingerprint(self, guide_version):
+        """Assert the fingerprint matches guide items of the version."""
+        guide_version.refresh_from_db()
+        self.assertEqual(
+            guide_version.fingerprint,
+            combine(added=get_guide_items(
+                guide_version.guide_items.values_list('id', flat=True),
+            )),
+        )
+
     def create_last_version(self, guide, guide_items=None):
         """Create last guide version."""
         today = timezone.now().date()
@@ -74,3 +102,28 @@ class GuideItemMixin(object):
     def create_guide_item(self, code, value):  # noqa: WPS110
         """Create guide item."""
         return GuideItem.objects.create(code=code, value=value)
+
+
+class PublishVersionTestMixin(GuideMixin, GuideVersionMixin, GuideItemMixin):
+    """Provide a guide with the current version to publish from."""
+
+    new_version_name = 'new'
+    start_date = '2100-01-01'
+
+    def setUp(self):
+        """Set up."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guide = self.create_guide(self.default_guide_name)
+            self.current_version = self.create_current_version(self.guide)
+            self.surgeon = self.create_guide_item(code='1', value='surgeon')
+            self.therapist = self.create_guide_item(
+                code='2', value='therapist',
+            )
+            self.dentist = self.create_guide_item(code='3', value='dentist')
+            self.current_version.guide_items.add(
+                self.surgeon, self.therapist, self.dentist,
+            )
+
+    def get_contents(self, guide_version):
+        """Return (code, value) of guide items of the guide version."""
+        return set(guide_version.guide_items.values_list('code', 'value'))
@@ -0,0 +1,174 @@
+from unittest import mock
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from services.terminology.admin import (
+    GuideItemAdmin,
+    GuideVersionItemsFormSet,
+)
+from services.terminology.models import GuideItem
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class GuideVersionAdminTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+):
+    """Test admin of guide versions."""
+
+    items_count = 120
+
+    def setUp(self):
+        """Set up."""
+        self.client.force_login(get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password',
+        ))
+        self.guide = self.create_guide(self.default_guide_name)
+        self.guide_version = self.create_current_version(self.guide)
+        self.guide_version.guide_items.add(*[
+            self.create_guide_item(code=str(number), value=f'value {number}')
+            for number in range(self.items_count)
+        ])
+        self.url = reverse(
+            'admin:terminology_guideversion_change',
+            args=[self.guide_version.pk],
+        )
+
+    def get_formset(self, response):
+        """Return formset of guide items of the response."""
+        return response.context['inline_admin_formsets'][0].formset
+
+    def test_paginated_inline(self):
+        """Test guide items are rendered page by page."""
+        per_page = GuideVersionItemsFormSet.per_page
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'name="guide_items"')
+        self.assertEqual(
+            self.get_formset(response).initial_form_count(), per_page,
+        )
+        last_page = self.items_count // per_page + 1
+        response = self.client.get(self.url, {'items_page': last_page})
+        self.assertEqual(
+            self.get_formset(response).initial_form_count(),
+            self.items_count % per_page,
+        )
+
+    def test_inline_save_updates_fingerprint(self):
+        """Test removal, replacement and addition of guide items."""
+        response = self.client.get(self.url)
+        formset = self.get_formset(response)
+        post_data = {
+            'guide': self.guide.pk,
+            'version': self.guide_version.version,
+            'start_date': self.guide_version.start_date.isoformat(),
+        }
+        for management_field in formset.management_form:
+            post_data[management_field.html_name] = management_field.value()
+        for form in formset.forms:
+            for bound_field in form:
+                post_data[bound_field.html_name] = bound_field.value() or ''
+        replaced_form, added_form = formset.forms[1], formset.forms[-1]
+        replacement = self.create_guide_item(code='B', value='replacement')
+        addition = self.create_guide_item(code='A', value='addition')
+        post_data[formset.forms[0]['DELETE'].html_name] = 'on'
+        post_data[replaced_form['guideitem'].html_name] = replacement.pk
+        post_data[added_form['guideitem'].html_name] = addition.pk
+        response = self.client.post(self.url, post_data)
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            self.guide_version.guide_items.count(), self.items_count,
+        )
+        self.assertEqual(
+            set(self.guide_version.guide_items.filter(
+                code__in=['0', '1', 'A', 'B'],
+            ).values_list('code', flat=True)),
+            {'A', 'B'},
+        )
+        self.assert_fingerprint(self.guide_version)
+
+    def test_add_guide_items_from_file(self):
+        """Test the action adding guide items from a file."""
+        guide_items_file = SimpleUploadedFile(
+            'items.csv', 'code,value\n1,value 1\nA,new\n'.encode(),
+        )
+        response = self.client.post(
+            reverse('admin:terminology_guideversion_changelist'),
+            {
+                'action': 'add_guide_items_from_file',
+                ACTION_CHECKBOX_NAME: [self.guide_version.pk],
+                'apply': 'yes',
+                'guide_items_file': guide_items_file,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            self.guide_version.guide_items.count(), self.items_count + 1,
+        )
+        self.assertTrue(
+            self.guide_version.guide_items.filter(code='A').exists(),
+        )
+        self.assert_fingerprint(self.guide_version)
+
+
+class GuideItemAdminTests(GuideItemMixin, TestCase):
+    """Test admin of guide items."""
+
+    items_count = 30
+
+    def setUp(self):
+        """Set up."""
+        for number in range(self.items_count):
+            self.create_guide_item(code=str(number), value=f'value {number}')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE terminology_guideitem')
+
+    def test_estimated_count(self):
+        """Test the count of all guide items is estimated."""
+        paginator = GuideItemAdmin.paginator(
+            GuideItem.objects.order_by('pk'), 1,
+        )
+        with mock.patch.object(paginator, 'exact_count_limit', 0):
+            with self.assertNumQueries(1) as context:
+                self.assertEqual(paginator.count, self.items_count)
+                self.assertNotIn(
+                    'COUNT(', context.captured_queries[0]['sql'],
+                )
+
+    def test_exact_count(self):
+        """Test filtered guide items and small tables are counted."""
+        guide_items = GuideItem.objects.order_by('pk')
+        paginator = GuideItemAdmin.paginator(
+            guide_items.filter(code__startswith='1'), 1,
+        )
+        with mock.patch.object(paginator, 'exact_count_limit', 0):
+            self.assertEqual(
+                paginator.count,
+                guide_items.filter(code__startswith='1').count(),
+            )
+        paginator = GuideItemAdmin.paginator(guide_items, 1)
+        self.assertEqual(paginator.count, self.items_count)
+
+    def test_changelist(self):
+        """Test search in the changelist of guide items."""
+        self.client.force_login(get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password',
+        ))
+        response = self.client.get(
+            reverse('admin:terminology_guideitem_changelist'), {'q': '2'},
+        )
+        self.assertEqual(
+            response.context['cl'].result_count,
+            GuideItem.objects.filter(code__startswith='2').union(
+                GuideItem.objects.filter(value__icontains='2'),
+            ).count(),
+        )
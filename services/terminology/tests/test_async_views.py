@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TransactionTestCase
+from django.test.client import AsyncRequestFactory
+from django.urls import reverse
+from rest_framework import status
+
+from services.terminology import async_views
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+def sleep_in_database(request, seconds):
+    """Return response after a slow query."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_sleep(%s)', [seconds])
+    return HttpResponse('ok')
+
+
+class AsyncViewsTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TransactionTestCase,
+):
+    """Test async views.
+
+    Queries of async views run in other threads with their own database
+    connections, so data must be committed.
+    """
+
+    def setUp(self):
+        """Set up."""
+        self.factory = AsyncRequestFactory()
+        self.guide = self.create_guide(self.default_guide_name)
+        current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        current_version.guide_items.add(self.surgeon)
+
+    async def test_guide_item_list(self):
+        """Test async list of guide items."""
+        pk = self.guide.id
+        request = self.factory.get(
+            reverse('guide-item-list', kwargs={'pk': pk}),
+        )
+        response = await async_views.guide_item_list(request, pk=pk)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            json.loads(response.content)['results'],
+            [{
+                'id': self.surgeon.id,
+                'guide_id': pk,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            }],
+        )
+
+    async def test_guide_item_validate(self):
+        """Test async validation of guide items."""
+        pk = self.guide.id
+        request = self.factory.post(
+            reverse('guide-item-validate', kwargs={'pk': pk}),
+            [{
+                'id': self.surgeon.id,
+                'guide_id': pk,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            }],
+            content_type='application/json',
+        )
+        response = await async_views.guide_item_validate(request, pk=pk)
+        self.assertEqual(json.loads(response.content), {'all': True})
+
+    async def test_concurrent_slow_requests(self):
+        """Test that slow requests are served concurrently."""
+        view = async_views.as_async_view(sleep_in_database)
+        requests_count = 5
+        seconds = 0.5
+        started = time.monotonic()
+        responses = await asyncio.gather(*(
+            view(self.factory.get('/'), seconds)
+            for _ in range(requests_count)
+        ))
+        elapsed = time.monotonic() - started
+        self.assertEqual(
+            {response.content for response in responses}, {b'ok'},
+        )
+        self.assertLess(elapsed, seconds * requests_count / 2)
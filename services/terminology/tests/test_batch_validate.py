@@ -0,0 +1,147 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from services.terminology.models import Guide
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class GuideItemBatchValidateApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideItemBatchValidate api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.url = reverse('guide-item-batch-validate')
+        self.specialty = self.create_guide('specialty')
+        self.facility = self.create_guide('facility')
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.hospital = self.create_guide_item(code='1', value='hospital')
+        with self.captureOnCommitCallbacks(execute=True):
+            specialty_version = self.create_current_version(self.specialty)
+            facility_last_version = self.create_last_version(self.facility)
+            self.create_current_version(self.facility)
+            specialty_version.guide_items.add(self.surgeon)
+            facility_last_version.guide_items.add(self.hospital)
+
+    def get_guide_item(self, guide, guide_item):
+        """Return guide item data."""
+        return {
+            'id': guide_item.id,
+            'guide_id': guide.id,
+            'code': guide_item.code,
+            'value': guide_item.value,
+        }
+
+    def test_all_valid(self):
+        """Test guide items of several guides and a specific version."""
+        response = self.client.post(
+            self.url,
+            {
+                'versions': {self.facility.id: self.last_version_name},
+                'guide_items': [
+                    self.get_guide_item(self.specialty, self.surgeon),
+                    self.get_guide_item(self.facility, self.hospital),
+                ],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            str(self.specialty.id): {'all': True},
+            str(self.facility.id): {'all': True},
+        })
+
+    def test_invalid(self):
+        """Test errors of guide items of several guides."""
+        missing_guide_id = 1000000
+        wrong_code = self.get_guide_item(self.specialty, self.therapist)
+        wrong_code['code'] = '3'
+        response = self.client.post(
+            self.url,
+            {
+                'guide_items': [
+                    self.get_guide_item(self.specialty, self.surgeon),
+                    wrong_code,
+                    self.get_guide_item(self.facility, self.hospital),
+                    {'id': self.surgeon.id, 'guide_id': missing_guide_id},
+                ],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {
+            str(self.specialty.id): [
+                {},
+                {str(self.therapist.id): ['code is incorrect']},
+            ],
+            str(self.facility.id): [{str(self.hospital.id): False}],
+            str(missing_guide_id): 'guide_id does not exist',
+        })
+
+    def test_guide_id_is_required(self):
+        """Test guide item without guide_id."""
+        response = self.client.post(
+            self.url,
+            {'guide_items': [{'id': self.surgeon.id}]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 0})
+    def test_number_of_queries_does_not_depend_on_number_of_guides(self):
+        """Test that batch validation uses a fixed number of queries."""
+        guide_items = []
+        for number in range(5):
+            guide = self.create_guide(f'guide{number}')
+            guide_item = self.create_guide_item(code='1', value=f'{number}')
+            with self.captureOnCommitCallbacks(execute=True):
+                guide_version = self.create_current_version(guide)
+                guide_version.guide_items.add(guide_item)
+            guide_items.append(self.get_guide_item(guide, guide_item))
+        # The version index is loaded by the first request.
+        self.client.post(self.url, {'guide_items': guide_items}, format='json')
+        for size in (1, len(guide_items)):
+            # Guides, fingerprints of versions, guide items and memberships.
+            with self.assertNumQueries(4):
+                response = self.client.post(
+                    self.url,
+                    {'guide_items': guide_items[:size]},
+                    format='json',
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TERMINOLOGY={'VERSION_INDEX_ENABLED': False})
+    def test_versions_are_resolved_without_index(self):
+        """Test resolution of versions of several guides by the database."""
+        with self.assertNumQueries(2):
+            guide_versions = Guide.get_versions({
+                self.specialty.id: None,
+                self.facility.id: self.last_version_name,
+                1000000: None,
+            })
+        self.assertEqual(
+            {
+                guide_id: getattr(guide_version, 'version', None)
+                for guide_id, guide_version in guide_versions.items()
+            },
+            {
+                self.specialty.id: self.current_version_name,
+                self.facility.id: self.last_version_name,
+                1000000: None,
+            },
+        )
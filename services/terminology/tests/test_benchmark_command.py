@@ -0,0 +1,75 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from services.terminology.benchmarks import compare
+from services.terminology.synthetic import GuideGenerator
+
+
+class BenchmarkCommandTests(TestCase):
+    """Test benchmark command."""
+
+    def setUp(self):
+        """Set up."""
+        with self.captureOnCommitCallbacks(execute=True):
+            GuideGenerator(
+                guides_count=1, versions_count=2, items_count=5,
+            ).generate()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = str(Path(self.directory.name) / 'results.json')
+
+    def run_benchmark(self, *args):
+        """Call benchmark command."""
+        call_command(
+            'benchmark',
+            '--iterations=2',
+            '--host=testserver',
+            f'--output={self.output}',
+            *args,
+            stdout=io.StringIO(),
+        )
+        with open(self.output) as results_file:
+            return json.load(results_file)
+
+    def test_benchmark(self):
+        """Test that all endpoints are measured."""
+        measurements = self.run_benchmark()
+        self.assertEqual(set(measurements), {
+            'guide-list',
+            'guide-list-on-date',
+            'guide-item-list',
+            'guide-item-list-cursor',
+            'guide-item-search',
+            'guide-item-validate',
+        })
+        self.assertEqual(
+            set(measurements['guide-item-validate']),
+            {'p50', 'p95', 'p99', 'queries', 'peak_memory_kib'},
+        )
+
+    def test_regression(self):
+        """Test that regressions against the baseline are reported."""
+        baseline = str(Path(self.directory.name) / 'baseline.json')
+        with open(baseline, 'w') as baseline_file:
+            json.dump({'guide-item-list': {'queries': 0}}, baseline_file)
+        with self.assertRaisesMessage(
+            CommandError, 'guide-item-list queries',
+        ):
+            self.run_benchmark(f'--baseline={baseline}')
+
+    def test_compare(self):
+        """Test comparison of results with the baseline."""
+        baseline = {'endpoint': {'p95': 10, 'queries': 2}}
+        self.assertEqual(
+            compare({'endpoint': {'p95': 11.9, 'queries': 2}}, baseline), [],
+        )
+        self.assertEqual(
+            compare({'endpoint': {'p95': 12.1, 'queries': 3}}, baseline),
+            ['endpoint p95: 12.1 > 10', 'endpoint queries: 3 > 2'],
+        )
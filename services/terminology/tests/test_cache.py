@@ -0,0 +1,162 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from services.terminology.cache import version_items_cache
+from services.terminology.fingerprints import refresh_fingerprints
+from services.terminology.models import GuideVersion
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class VersionItemsCacheTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    TestCase,
+):
+    """Test cache of guide version items."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        self.last_version = self.create_last_version(self.guide)
+        self.current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.dentist = self.create_guide_item(code='3', value='dentist')
+        self.last_version.guide_items.add(self.surgeon)
+        self.current_version.guide_items.add(self.therapist, self.surgeon)
+
+    def get_current_version_items(self):
+        """Return cached guide items of the current version."""
+        return version_items_cache.get(self.current_version)
+
+    def test_hit_and_miss(self):
+        """Test hit and miss counters."""
+        version_items = self.get_current_version_items()
+        self.assertEqual(
+            list(version_items.ids), [self.surgeon.id, self.therapist.id],
+        )
+        self.assertEqual(
+            version_items.get(self.therapist.id),
+            (self.therapist.code, self.therapist.value),
+        )
+        with self.assertNumQueries(0):
+            self.get_current_version_items()
+        stats = version_items_cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['items'], 2)
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 2})
+    def test_least_recently_used_version_is_evicted(self):
+        """Test that entries are evicted by total number of items."""
+        version_items_cache.get(self.last_version)
+        self.get_current_version_items()
+        stats = version_items_cache.get_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['entries'], 1)
+        with self.assertNumQueries(0):
+            self.get_current_version_items()
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 1})
+    def test_large_version_is_not_cached(self):
+        """Test that version larger than the cache is not cached."""
+        self.assertIsNone(self.get_current_version_items())
+        self.assertEqual(version_items_cache.get_stats()['entries'], 0)
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.get_current_version_items())
+
+        self.current_version.guide_items.remove(self.therapist)
+        self.current_version.refresh_from_db()
+        version_items = self.get_current_version_items()
+        self.assertEqual(list(version_items.ids), [self.surgeon.id])
+
+    def test_validation_does_not_load_version(self):
+        """Test validation checks uncached guide items in the database."""
+        url = reverse('guide-item-validate', kwargs={'pk': self.guide.id})
+        response = self.client.post(
+            url,
+            [{
+                'id': self.surgeon.id,
+                'guide_id': self.guide.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            }],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(version_items_cache.get_stats()['entries'], 0)
+
+    def test_invalidation_on_guide_items_change(self):
+        """Test invalidation when guide items of the version are changed."""
+        self.get_current_version_items()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.current_version.guide_items.add(self.dentist)
+        version_items = self.get_current_version_items()
+        self.assertIn(self.dentist.id, version_items)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dentist.guideversion_set.remove(self.current_version)
+        version_items = self.get_current_version_items()
+        self.assertNotIn(self.dentist.id, version_items)
+
+    def test_invalidation_on_guide_item_save_and_delete(self):
+        """Test invalidation when a guide item is saved or deleted."""
+        self.get_current_version_items()
+        self.surgeon.value = 'new surgeon'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.surgeon.save()
+        version_items = self.get_current_version_items()
+        self.assertEqual(
+            version_items.get(self.surgeon.id), ('1', 'new surgeon'),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.surgeon.delete()
+        version_items = self.get_current_version_items()
+        self.assertEqual(list(version_items.ids), [self.therapist.id])
+
+    def test_entry_of_other_fingerprint_is_reloaded(self):
+        """Test reload of the entry changed by another process."""
+        self.get_current_version_items()
+        GuideVersion.guide_items.through.objects.create(
+            guideversion_id=self.current_version.id,
+            guideitem_id=self.dentist.id,
+        )
+        refresh_fingerprints([self.current_version.id])
+        self.current_version.refresh_from_db()
+        version_items = self.get_current_version_items()
+        self.assertIn(self.dentist.id, version_items)
+
+    def test_guide_item_list_is_served_from_cache(self):
+        """Test that GuideItemList takes guide items from the cache."""
+        url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        expected_data = [
+            {
+                'id': self.surgeon.id,
+                'guide_id': self.guide.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            },
+            {
+                'id': self.therapist.id,
+                'guide_id': self.guide.id,
+                'code': self.therapist.code,
+                'value': self.therapist.value,
+            },
+        ]
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], expected_data)
@@ -0,0 +1,155 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from services.terminology.fingerprints import combine
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class GuideVersionChecksumApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideVersionChecksum api."""
+
+    chunk_size = 2
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        self.current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.dentist = self.create_guide_item(code='3', value='dentist')
+        self.current_version.guide_items.add(
+            self.surgeon, self.therapist, self.dentist,
+        )
+        self.url = reverse(
+            'guide-item-checksum', kwargs={'pk': self.guide.id},
+        )
+
+    def get_fingerprint(self, *guide_items):
+        """Return the fingerprint of the guide items computed by a client."""
+        return combine(added=(
+            (guide_item.id, guide_item.code, guide_item.value)
+            for guide_item in guide_items
+        ))
+
+    def check(self, request_data):
+        """Post fingerprints and return the response data."""
+        response = self.client.post(self.url, request_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_current(self):
+        """Test the copy is current."""
+        response_data = self.check({'fingerprint': self.get_fingerprint(
+            self.dentist, self.surgeon, self.therapist,
+        )})
+        self.assertEqual(response_data, {
+            'fingerprint': self.get_fingerprint(
+                self.surgeon, self.therapist, self.dentist,
+            ),
+            'current': True,
+        })
+
+    def test_chunks(self):
+        """Test fingerprints of ranges are returned for a stale copy."""
+        response_data = self.check({
+            'fingerprint': self.get_fingerprint(self.surgeon),
+            'chunk_size': self.chunk_size,
+        })
+        self.assertFalse(response_data['current'])
+        self.assertEqual(response_data['chunks'], [
+            {
+                'start': 0,
+                'end': self.dentist.id,
+                'count': 2,
+                'fingerprint': self.get_fingerprint(
+                    self.surgeon, self.therapist,
+                ),
+            },
+            {
+                'start': self.dentist.id,
+                'end': None,
+                'count': 1,
+                'fingerprint': self.get_fingerprint(self.dentist),
+            },
+        ])
+
+    def test_mismatched_chunks(self):
+        """Test guide items of mismatched ranges only are returned."""
+        response_data = self.check({
+            'fingerprint': self.get_fingerprint(self.surgeon, self.dentist),
+            'chunks': [
+                {
+                    'start': self.dentist.id,
+                    'fingerprint': self.get_fingerprint(self.dentist),
+                },
+                {
+                    'start': 0,
+                    'end': self.dentist.id,
+                    'fingerprint': self.get_fingerprint(self.surgeon),
+                },
+            ],
+        })
+        self.assertFalse(response_data['current'])
+        self.assertEqual(response_data['mismatched'], [{
+            'start': 0,
+            'end': self.dentist.id,
+            'fingerprint': self.get_fingerprint(self.surgeon, self.therapist),
+            'guide_items': [
+                {
+                    'id': guide_item.id,
+                    'guide_id': self.guide.id,
+                    'code': guide_item.code,
+                    'value': guide_item.value,
+                }
+                for guide_item in (self.surgeon, self.therapist)
+            ],
+        }])
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 0})
+    def test_uncached_version(self):
+        """Test ranges of versions missing in the cache are streamed."""
+        response_data = self.check({
+            'fingerprint': self.get_fingerprint(),
+            'chunk_size': self.chunk_size,
+        })
+        self.assertEqual(
+            [chunk['count'] for chunk in response_data['chunks']], [2, 1],
+        )
+
+    def test_invalid_data(self):
+        """Test invalid fingerprints, ranges and versions are rejected."""
+        fingerprint = self.get_fingerprint()
+        invalid_requests = (
+            ('', {'fingerprint': 'abc'}),
+            ('', {
+                'fingerprint': fingerprint,
+                'chunks': [
+                    {'start': 0, 'end': 5, 'fingerprint': fingerprint},
+                    {'start': 4, 'fingerprint': fingerprint},
+                ],
+            }),
+            ('?version=unknown', {'fingerprint': fingerprint}),
+        )
+        for query_string, request_data in invalid_requests:
+            with self.subTest(request_data=request_data):
+                response = self.client.post(
+                    f'{self.url}{query_string}', request_data, format='json',
+                )
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST,
+                )
@@ -0,0 +1,90 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class GuideItemLookupByCodeApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideItemLookupByCode api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide('specialty')
+        self.url = reverse('guide-item-lookup', kwargs={'pk': self.guide.id})
+        last_version = self.create_last_version(self.guide)
+        current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.dentist = self.create_guide_item(code='2', value='dentist')
+        current_version.guide_items.add(self.surgeon, self.therapist)
+        last_version.guide_items.add(self.dentist)
+
+    def get_guide_item(self, guide_item):
+        """Return canonical guide item data."""
+        return {
+            'id': guide_item.id,
+            'guide_id': self.guide.id,
+            'code': guide_item.code,
+            'value': guide_item.value,
+        }
+
+    def test_lookup(self):
+        """Test guide items are resolved with one query."""
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.url,
+                [{'code': '2'}, {'code': '1', 'value': 'surgeon'}],
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            self.get_guide_item(self.therapist),
+            self.get_guide_item(self.surgeon),
+        ])
+
+    def test_lookup_version(self):
+        """Test guide items of the specified version."""
+        response = self.client.post(
+            f'{self.url}?version={self.last_version_name}',
+            [{'code': '2'}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [self.get_guide_item(self.dentist)])
+
+    def test_invalid(self):
+        """Test missing codes and incorrect values."""
+        response = self.client.post(
+            self.url,
+            [{'code': '1'}, {'code': '3'}, {'code': '2', 'value': 'dentist'}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), [
+            {},
+            {'code': {'3': 'does not exist'}},
+            {'2': ['value is incorrect']},
+        ])
+
+    def test_guide_does_not_exist(self):
+        """Test lookup in missing guide."""
+        missing_guide_id = 1000000
+        response = self.client.post(
+            reverse('guide-item-lookup', kwargs={'pk': missing_guide_id}),
+            [{'code': '1'}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,142 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from services.terminology.cache import version_items_cache
+from services.terminology.deduplication import (
+    delete_orphaned_guide_items,
+    merge_duplicate_guide_items,
+)
+from services.terminology.diff import CHANGED
+from services.terminology.models import GuideItem
+from services.terminology.serializers import (
+    GuideItemCodeSerializer,
+    GuideItemSerializer,
+)
+from services.terminology.version_serializers import (
+    GuideVersionChangeSerializer,
+)
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class DeduplicationTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+):
+    """Test deduplication of guide items."""
+
+    def setUp(self):
+        """Set up guide versions sharing duplicate guide items."""
+        # Duplicates are only possible in data created before the unique
+        # constraint, the constraint is dropped until the end of the test.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'ALTER TABLE terminology_guideitem '
+                'DROP CONSTRAINT unique_guide_item_content',
+            )
+        guide = self.create_guide(self.default_guide_name)
+        self.last_version = self.create_last_version(guide)
+        self.current_version = self.create_current_version(guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.surgeon_copies = [
+            self.create_guide_item(code='1', value='surgeon')
+            for _ in range(2)
+        ]
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.orphan = self.create_guide_item(code='3', value='dentist')
+        self.last_version.guide_items.add(self.surgeon_copies[0])
+        self.current_version.guide_items.add(
+            self.surgeon, *self.surgeon_copies, self.therapist,
+        )
+
+    def test_merge(self):
+        """Test duplicates are replaced by the original guide item."""
+        merged_count = merge_duplicate_guide_items(batch_size=1)
+        self.assertEqual(merged_count, len(self.surgeon_copies))
+        self.assertQuerysetEqual(
+            GuideItem.objects.filter(code='1'), [self.surgeon],
+        )
+        self.assertQuerysetEqual(
+            self.last_version.guide_items.all(), [self.surgeon],
+        )
+        self.assertQuerysetEqual(
+            self.current_version.guide_items.order_by('id'),
+            [self.surgeon, self.therapist],
+        )
+        self.assert_fingerprint(self.last_version)
+        self.assert_fingerprint(self.current_version)
+        self.assertEqual(merge_duplicate_guide_items(), 0)
+
+    @mock.patch.object(version_items_cache, 'invalidate')
+    def test_cache_invalidated_after_commit(self, invalidate):
+        """Test cached guide items are invalidated after commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            merge_duplicate_guide_items()
+            invalidate.assert_not_called()
+        invalidate.assert_called_once()
+        self.assertCountEqual(
+            invalidate.call_args.args[0],
+            [self.last_version.pk, self.current_version.pk],
+        )
+
+    def test_delete_orphans(self):
+        """Test guide items not included in any version are deleted."""
+        self.assertEqual(delete_orphaned_guide_items(batch_size=1), 1)
+        self.assertFalse(
+            GuideItem.objects.filter(pk=self.orphan.pk).exists(),
+        )
+        self.assertEqual(GuideItem.objects.count(), 4)
+
+    def test_command(self):
+        """Test dedupe_guide_items command."""
+        stdout = io.StringIO()
+        call_command('dedupe_guide_items', '--keep-orphans', stdout=stdout)
+        self.assertIn('2 duplicate guide items are merged', stdout.getvalue())
+        self.assertTrue(GuideItem.objects.filter(pk=self.orphan.pk).exists())
+
+        call_command('dedupe_guide_items', stdout=stdout)
+        self.assertIn('1 orphaned guide items are deleted', stdout.getvalue())
+        self.assertQuerysetEqual(
+            GuideItem.objects.order_by('id'), [self.surgeon, self.therapist],
+        )
+
+
+class UniqueContentSerializerTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+):
+    """Test serializers accept guide items with existing content."""
+
+    def setUp(self):
+        """Set up."""
+        guide = self.create_guide(self.default_guide_name)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.current_version = self.create_current_version(guide)
+        self.current_version.guide_items.add(self.surgeon)
+
+    def test_existing_guide_item_is_valid(self):
+        """Test the unique constraint of the content is not validated."""
+        guide_item = {'code': '1', 'value': 'surgeon'}
+        serializers = [
+            GuideItemSerializer(data={
+                'id': self.surgeon.id,
+                'guide_id': self.current_version.guide_id,
+                **guide_item,
+            }),
+            GuideItemCodeSerializer(
+                data=guide_item,
+                context={'guide_version': self.current_version},
+            ),
+            GuideVersionChangeSerializer(
+                data={'change': CHANGED, **guide_item},
+            ),
+        ]
+        for serializer in serializers:
+            with self.subTest(serializer=type(serializer).__name__):
+                self.assertTrue(serializer.is_valid(), serializer.errors)
@@ -0,0 +1,120 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from services.terminology.models import Guide
+from services.terminology.version_index import version_index
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class EffectiveVersionTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    TestCase,
+):
+    """Test materialized effective versions of guides."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        self.last_version = self.create_last_version(self.guide)
+        self.current_version = self.create_current_version(self.guide)
+        self.future_version = self.create_future_version(self.guide)
+
+    def get_effective_version(self):
+        """Return the stored effective version of the guide."""
+        self.guide.refresh_from_db()
+        return self.guide.effective_version
+
+    def test_refreshed_by_signals(self):
+        """Test saved and deleted guide versions refresh the guide."""
+        self.assertEqual(self.get_effective_version(), self.current_version)
+        self.assertEqual(self.guide.effective_date, timezone.now().date())
+        self.current_version.start_date = self.future_version.start_date
+        self.current_version.save()
+        self.assertEqual(self.get_effective_version(), self.last_version)
+        self.last_version.delete()
+        self.assertIsNone(self.get_effective_version())
+
+    def test_refreshed_by_guide_save(self):
+        """Test a save of a stale guide does not keep its version."""
+        stale_guide = Guide.objects.get(pk=self.guide.pk)
+        self.current_version.delete()
+        stale_guide.save()
+        self.assertEqual(self.get_effective_version(), self.last_version)
+
+    def test_same_start_date(self):
+        """Test the last created version of the date is effective."""
+        with self.captureOnCommitCallbacks(execute=True):
+            same_date_version = self.create_version(
+                self.guide, 'same date', self.current_version.start_date,
+            )
+        self.assertEqual(self.get_effective_version(), same_date_version)
+        self.assertEqual(
+            version_index.get_version_on_date(
+                self.guide.id, self.current_version.start_date,
+            ),
+            same_date_version,
+        )
+
+    def test_current_version(self):
+        """Test the current version is the stored effective version."""
+        Guide.objects.filter(pk=self.guide.pk).update(
+            effective_version=self.last_version,
+        )
+        guide = Guide.objects.select_related('effective_version').get(
+            pk=self.guide.pk,
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(guide.current_version, self.last_version)
+
+    def test_stale_current_version(self):
+        """Test the version is looked up by date after the day rollover."""
+        yesterday = timezone.now().date() - datetime.timedelta(days=1)
+        Guide.objects.filter(pk=self.guide.pk).update(
+            effective_version=self.last_version, effective_date=yesterday,
+        )
+        self.guide.refresh_from_db()
+        self.assertEqual(self.guide.current_version, self.current_version)
+
+    @override_settings(TERMINOLOGY={
+        'VERSION_INDEX_ENABLED': False,
+        'VERSION_CACHE_MAX_ITEMS': 0,
+    })
+    def test_guide_item_list(self):
+        """Test guide items are listed without a lookup of the version."""
+        self.current_version.guide_items.add(
+            self.create_guide_item(code='1', value='surgeon'),
+        )
+        url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_command(self):
+        """Test refresh_effective_versions command."""
+        stdout = io.StringIO()
+        call_command(
+            'refresh_effective_versions',
+            '--date',
+            self.future_version.start_date.isoformat(),
+            stdout=stdout,
+        )
+        self.assertEqual(self.get_effective_version(), self.future_version)
+        self.assertIn('1 guides', stdout.getvalue())
+        with self.assertRaisesMessage(CommandError, '--date'):
+            call_command('refresh_effective_versions', '--date', 'today')
@@ -0,0 +1,109 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from services.terminology.fingerprints import (
+    EMPTY_FINGERPRINT,
+    combine,
+    refresh_fingerprints,
+)
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class FingerprintTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+):
+    """Test fingerprints of guide versions."""
+
+    def setUp(self):
+        """Set up."""
+        self.guide = self.create_guide(self.default_guide_name)
+        self.guide_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.dentist = self.create_guide_item(code='3', value='dentist')
+
+    def assert_fingerprint_is_actual(self):
+        """Assert that the stored fingerprint matches guide items."""
+        self.guide_version.refresh_from_db()
+        stored = self.guide_version.fingerprint
+        refreshed = refresh_fingerprints([self.guide_version.pk])
+        self.assertEqual(stored, refreshed[0].fingerprint)
+        return stored
+
+    def test_combine(self):
+        """Test that the fingerprint does not depend on order of items."""
+        rows = [
+            (number, str(number), f'value{number}') for number in range(3)
+        ]
+        fingerprint = combine(added=rows)
+        reversed_rows = list(reversed(rows))
+        self.assertEqual(fingerprint, combine(added=reversed_rows))
+        first = combine(added=rows[:1])
+        self.assertEqual(combine(first, added=rows[1:]), fingerprint)
+        self.assertEqual(combine(fingerprint, removed=rows), EMPTY_FINGERPRINT)
+
+    def test_guide_items_of_version_changed(self):
+        """Test add, remove and clear of guide items of the version."""
+        self.assertEqual(self.guide_version.fingerprint, EMPTY_FINGERPRINT)
+        self.guide_version.guide_items.add(self.surgeon, self.therapist)
+        added = self.assert_fingerprint_is_actual()
+        self.assertNotEqual(added, EMPTY_FINGERPRINT)
+        self.guide_version.guide_items.remove(self.therapist, self.dentist)
+        self.assertNotEqual(self.assert_fingerprint_is_actual(), added)
+        self.guide_version.guide_items.clear()
+        self.assertEqual(
+            self.assert_fingerprint_is_actual(), EMPTY_FINGERPRINT,
+        )
+
+    def test_versions_of_guide_item_changed(self):
+        """Test changes of guide versions through the guide item."""
+        future_version = self.create_future_version(self.guide)
+        self.guide_version.guide_items.add(self.surgeon)
+        self.surgeon.guideversion_set.add(future_version)
+        self.therapist.guideversion_set.add(self.guide_version)
+        self.assert_fingerprint_is_actual()
+        self.therapist.guideversion_set.remove(self.guide_version)
+        self.assert_fingerprint_is_actual()
+        self.surgeon.guideversion_set.clear()
+        self.assertEqual(
+            self.assert_fingerprint_is_actual(), EMPTY_FINGERPRINT,
+        )
+
+    def test_guide_item_changed(self):
+        """Test change and deletion of a guide item of the version."""
+        self.guide_version.guide_items.add(self.surgeon, self.therapist)
+        fingerprint = self.assert_fingerprint_is_actual()
+        modified = self.guide_version.modified
+        self.surgeon.value = 'general surgeon'
+        self.surgeon.save()
+        self.assertNotEqual(self.assert_fingerprint_is_actual(), fingerprint)
+        self.assertGreater(self.guide_version.modified, modified)
+        self.therapist.delete()
+        self.assert_fingerprint_is_actual()
+
+    def test_guide_item_change_is_incremental(self):
+        """Test guide items of versions are not read on a guide item change."""
+        self.guide_version.guide_items.add(self.surgeon, self.therapist)
+        self.guide_version.refresh_from_db()
+        modified = self.guide_version.modified
+        self.surgeon.save()
+        self.guide_version.refresh_from_db()
+        self.assertEqual(self.guide_version.modified, modified)
+
+        self.surgeon.value = 'general surgeon'
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            self.surgeon.save()
+        version_reads = [
+            query['sql']
+            for query in queries.captured_queries
+            if 'JOIN' in query['sql'] and '"value"' in query['sql']
+        ]
+        self.assertEqual(version_reads, [])
+        self.assert_fingerprint_is_actual()
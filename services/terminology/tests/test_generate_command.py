@@ -0,0 +1,37 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from services.terminology.models import Guide
+
+
+class GenerateGuidesCommandTests(TestCase):
+    """Test generate_guides command."""
+
+    def test_generate_guides(self):
+        """Test generation of guides with shared guide items."""
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                'generate_guides',
+                '--guides=2',
+                '--versions=3',
+                '--items=10',
+                '--shared-ratio=0.8',
+                '--seed=1',
+                stdout=io.StringIO(),
+            )
+        guides = Guide.objects.order_by('id')
+        self.assertEqual(len(guides), 2)
+        for guide in guides:
+            guide_versions = list(guide.versions.order_by('start_date'))
+            self.assertEqual(len(guide_versions), 3)
+            self.assertEqual(guide.current_version, guide_versions[-1])
+            previous_ids = set(
+                guide_versions[0].guide_items.values_list('id', flat=True),
+            )
+            guide_item_ids = set(
+                guide_versions[1].guide_items.values_list('id', flat=True),
+            )
+            self.assertEqual(len(guide_item_ids), 10)
+            self.assertEqual(len(previous_ids & guide_item_ids), 8)
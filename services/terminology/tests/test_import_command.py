@@ -0,0 +1,111 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from services.terminology.fingerprints import combine
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class ImportGuideVersionCommandTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+):
+    """Test import_guide_version command."""
+
+    def setUp(self):
+        """Set up."""
+        self.guide = self.create_guide(self.default_guide_name)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, text):
+        """Write file to the temporary directory and return its path."""
+        path = Path(self.directory.name) / name
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+
+    def import_file(self, path, *args):
+        """Call import_guide_version command."""
+        call_command(
+            'import_guide_version',
+            self.guide.id,
+            'imported',
+            '2021-01-01',
+            path,
+            *args,
+            stdout=io.StringIO(),
+        )
+        return self.guide.versions.get(version='imported')
+
+    def get_items(self, guide_version):
+        """Return (code, value) of guide items of the guide version."""
+        return sorted(guide_version.guide_items.values_list('code', 'value'))
+
+    def test_import_csv(self):
+        """Test import of CSV file reusing existing guide items."""
+        path = self.write_file(
+            'items.csv',
+            'id,code,value\n'
+            '10,1,surgeon\n'
+            '11,2,"therapist, general"\n'
+            '12,2,"therapist, general"\n',
+        )
+        guide_version = self.import_file(path, '--batch-size', '1')
+        self.assertEqual(
+            self.get_items(guide_version),
+            [('1', 'surgeon'), ('2', 'therapist, general')],
+        )
+        self.assertIn(self.surgeon, guide_version.guide_items.all())
+        self.assertEqual(
+            guide_version.fingerprint,
+            combine(added=guide_version.guide_items.values_list(
+                'id', 'code', 'value',
+            )),
+        )
+
+    def test_import_ndjson_in_parallel(self):
+        """Test import of NDJSON file parsed by several processes."""
+        path = self.write_file(
+            'items.ndjson',
+            '{"code": "1", "value": "surgeon"}\n'
+            '\n'
+            '{"code": 3, "value": "dentist"}\n',
+        )
+        guide_version = self.import_file(path, '--workers', '2')
+        self.assertEqual(
+            self.get_items(guide_version),
+            [('1', 'surgeon'), ('3', 'dentist')],
+        )
+
+    def test_invalid_file(self):
+        """Test that invalid file is not imported."""
+        path = self.write_file('items.ndjson', '{"code": "1", "value": ""}\n')
+        with self.assertRaisesMessage(CommandError, 'Line 1'):
+            self.import_file(path)
+        self.assertFalse(self.guide.versions.exists())
+
+    def test_version_already_exists(self):
+        """Test that existing version is not overwritten."""
+        self.create_version(self.guide, 'imported', '2021-01-01')
+        path = self.write_file('items.csv', 'code,value\n1,surgeon\n')
+        with self.assertRaisesMessage(CommandError, 'already exists'):
+            self.import_file(path)
+
+    def test_version_created_concurrently(self):
+        """Test that version created after the check is not overwritten."""
+        self.create_version(self.guide, 'imported', '2021-01-01')
+        path = self.write_file('items.csv', 'code,value\n1,surgeon\n')
+        with mock.patch.object(QuerySet, 'exists', return_value=False):
+            with self.assertRaisesMessage(CommandError, 'already exists'):
+                self.import_file(path)
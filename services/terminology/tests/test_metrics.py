@@ -0,0 +1,144 @@
+from django.test import TestCase, TransactionTestCase
+from django.test.client import AsyncRequestFactory
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from services.terminology import async_views
+from services.terminology.metrics import Histogram, request_metrics
+from services.terminology.middleware import MetricsMiddleware
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class MetricsTestMixin(GuideMixin, GuideVersionMixin, GuideItemMixin):
+    """Provide a guide and clean metrics."""
+
+    def setUp(self):
+        """Set up."""
+        request_metrics.reset()
+        self.addCleanup(request_metrics.reset)
+        self.guide = self.create_guide(self.default_guide_name)
+        current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        current_version.guide_items.add(self.surgeon)
+
+    def get_samples(self):
+        """Return samples of the metrics endpoint by names with labels."""
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if not line.startswith('#'):
+                name, sample_value = line.rsplit(' ', 1)
+                samples[name] = float(sample_value)
+        return samples
+
+
+class MetricsTests(MetricsTestMixin, TestCase):
+    """Test request metrics."""
+
+    def test_request_metrics(self):
+        """Test latency, queries and response size of a request."""
+        url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        response = self.client.get(url)
+        samples = self.get_samples()
+        route = '{route="guide-item-list"}'
+        self.assertEqual(
+            samples[
+                'terminology_requests_total'
+                '{route="guide-item-list",method="GET",status="200"}'
+            ],
+            1,
+        )
+        self.assertEqual(
+            samples[f'terminology_request_duration_seconds_count{route}'], 1,
+        )
+        self.assertGreater(
+            samples[f'terminology_request_duration_seconds_sum{route}'], 0,
+        )
+        self.assertGreater(
+            samples[f'terminology_request_db_queries_sum{route}'], 0,
+        )
+        self.assertGreater(
+            samples[f'terminology_request_db_duration_seconds_sum{route}'], 0,
+        )
+        self.assertEqual(
+            samples[f'terminology_response_size_bytes_sum{route}'],
+            len(response.content),
+        )
+        self.assertEqual(
+            samples[
+                'terminology_response_size_bytes_bucket'
+                '{route="guide-item-list",le="+Inf"}'
+            ],
+            1,
+        )
+
+    def test_validation_payload(self):
+        """Test size of validation payloads."""
+        url = reverse('guide-item-validate', kwargs={'pk': self.guide.id})
+        response = self.client.post(
+            url,
+            [{
+                'id': self.surgeon.id,
+                'guide_id': self.guide.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            }],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        samples = self.get_samples()
+        self.assertEqual(
+            samples[
+                'terminology_validation_payload_size_bytes_sum'
+                '{route="guide-item-validate"}'
+            ],
+            int(response.wsgi_request.META['CONTENT_LENGTH']),
+        )
+        self.assertNotIn(
+            'terminology_validation_payload_size_bytes_count'
+            '{route="metrics"}',
+            samples,
+        )
+
+    def test_histogram(self):
+        """Test buckets of a histogram are cumulative."""
+        histogram = Histogram('test', 'Test histogram.', ('name',), (1, 5))
+        for observed in (0.5, 1, 3, 10):
+            histogram.observe(('a"b',), observed)
+        self.assertEqual(histogram.collect()[2:], [
+            r'test_bucket{name="a\"b",le="1.0"} 2',
+            r'test_bucket{name="a\"b",le="5.0"} 3',
+            r'test_bucket{name="a\"b",le="+Inf"} 4',
+            r'test_sum{name="a\"b"} 14.5',
+            r'test_count{name="a\"b"} 4',
+        ])
+
+
+class AsyncMetricsTests(MetricsTestMixin, TransactionTestCase):
+    """Test request metrics of async views.
+
+    Queries of async views run in other threads with their own database
+    connections, so data must be committed.
+    """
+
+    async def test_async_view(self):
+        """Test queries of the thread pool are counted."""
+        pk = self.guide.id
+        url = reverse('guide-item-list', kwargs={'pk': pk})
+        request = AsyncRequestFactory().get(url)
+        request.resolver_match = resolve(url)
+
+        async def get_response(view_request):  # noqa: WPS430
+            return await async_views.guide_item_list(view_request, pk=pk)
+
+        response = await MetricsMiddleware(get_response)(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries_count = request_metrics.db_queries.collect()[-1]
+        self.assertRegex(queries_count, 'route="guide-item-list"} [1-9]')
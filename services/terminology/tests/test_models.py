@@ -2,20 +2,28 @@
 from django.db.utils import IntegrityError
 from django.test import TestCase
 
+from services.terminology.models import GuideItem
+
 from .mixins import (  # noqa: WPS300
     GuideItemMixin,
     GuideMixin,
     GuideVersionMixin,
+    ProcessCacheMixin,
 )
 
 
 class GuideModelTests(  # noqa: WPS215
-    GuideMixin, GuideVersionMixin, GuideItemMixin, TestCase,
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    TestCase,
 ):
     """Test Guide model."""
 
     def setUp(self):
         """Set up."""
+        super().setUp()
         self.create_guide(name=self.default_guide_name)
         self.create_guide_item(code=1, value='surgeon')
         self.create_guide_item(code=2, value='therapist')
@@ -49,8 +57,8 @@ class GuideModelTests(  # noqa: WPS215
         last_version = self.create_last_version(guide)
         self.create_current_version(guide)
 
-        surgeon = self.create_guide_item(code='1', value='surgeon')
-        therapist = self.create_guide_item(code='2', value='therapist')
+        surgeon = GuideItem.objects.get(code='1', value='surgeon')
+        therapist = GuideItem.objects.get(code='2', value='therapist')
 
         last_version.guide_items.add(surgeon, therapist)
         self.assertQuerysetEqual(
@@ -62,7 +70,12 @@ class GuideModelTests(  # noqa: WPS215
         )
 
 
-class GuideVersionModelTests(GuideMixin, GuideVersionMixin, TestCase):
+class GuideVersionModelTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    TestCase,
+):
     """Test GuideVersion model."""
 
     def test_unique_version_for_specific_guide(self):
@@ -81,7 +94,7 @@ class GuideVersionModelTests(GuideMixin, GuideVersionMixin, TestCase):
             guide.versions.create(version='', start_date='2021-12-01')
 
 
-class GuideItemModelTests(GuideItemMixin, TestCase):
+class GuideItemModelTests(ProcessCacheMixin, GuideItemMixin, TestCase):
     """Test GuideItem model."""
 
     def test_code_cannot_be_empty(self):
@@ -95,3 +108,11 @@ class GuideItemModelTests(GuideItemMixin, TestCase):
         raise_text = 'constraint "non_empty_value"'
         with self.assertRaisesMessage(IntegrityError, raise_text):
             self.create_guide_item(code='1', value='')
+
+    def test_unique_content(self):
+        """Identical guide items cannot be created."""
+        self.create_guide_item(code='1', value='value1')
+        self.create_guide_item(code='1', value='value2')
+        raise_text = 'constraint "unique_guide_item_content"'
+        with self.assertRaisesMessage(IntegrityError, raise_text):
+            self.create_guide_item(code='1', value='value1')
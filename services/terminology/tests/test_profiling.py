@@ -0,0 +1,144 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from services.terminology.models import GuideItem
+from services.terminology.profiling import (
+    PROFILE_FILE,
+    ProfileReport,
+    RequestProfile,
+)
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+
+class ProfilingTestMixin(GuideMixin, GuideVersionMixin, GuideItemMixin):
+    """Provide a guide and a directory of profiles."""
+
+    repeated_lookups = 3
+
+    def setUp(self):
+        """Set up."""
+        self.guide = self.create_guide(self.default_guide_name)
+        current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        current_version.guide_items.add(self.surgeon)
+        self.url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(TERMINOLOGY={
+            'PROFILE_DIR': self.directory,
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def get_bundles(self):
+        """Return bundles of the directory of profiles."""
+        return ProfileReport.find_bundles(self.directory)
+
+    def profile_lookups(self):
+        """Profile repeated lookups of guide items and save the profile."""
+        request_profile = RequestProfile()
+        with request_profile:
+            for _ in range(self.repeated_lookups):
+                GuideItem.objects.get(pk=self.surgeon.pk)
+        return request_profile.save(self.directory, {'path': '/lookups'})
+
+
+class ProfilingMiddlewareTests(ProfilingTestMixin, APITestCase):
+    """Test ProfilingMiddleware."""
+
+    def test_not_profiled(self):
+        """Test requests without the header are not profiled."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_bundles(), [])
+
+    def test_staff_header(self):
+        """Test requests of staff users with the header are profiled."""
+        self.client.force_login(get_user_model().objects.create_user(
+            'admin', is_staff=True,
+        ))
+        response = self.client.get(self.url, HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        bundles = self.get_bundles()
+        self.assertEqual(len(bundles), 1)
+        self.assertTrue((bundles[0] / PROFILE_FILE).exists())
+        request_info = ProfileReport(bundles).requests[0]
+        self.assertEqual(request_info['route'], 'guide-item-list')
+        self.assertEqual(request_info['status'], status.HTTP_200_OK)
+        self.assertTrue(request_info['statements'])
+        self.assertTrue(all(
+            statement['origin'] for statement in request_info['statements']
+        ))
+
+    def test_not_staff_header(self):
+        """Test requests of other users are not profiled."""
+        self.client.force_login(get_user_model().objects.create_user('user'))
+        with mock.patch.object(RequestProfile, '__enter__') as enter:
+            self.client.get(self.url, HTTP_X_PROFILE='1')
+            self.client.logout()
+            self.client.get(self.url, HTTP_X_PROFILE='1')
+            enter.assert_not_called()
+        self.assertEqual(self.get_bundles(), [])
+
+    def test_sampling(self):
+        """Test sampled requests are profiled."""
+        with override_settings(TERMINOLOGY={
+            'PROFILE_DIR': self.directory,
+            'PROFILE_SAMPLE_RATE': 1,
+        }):
+            self.client.get(self.url)
+        self.assertEqual(len(self.get_bundles()), 1)
+
+
+class ProfileReportTests(ProfilingTestMixin, APITestCase):
+    """Test ProfileReport and profile_report command."""
+
+    def test_repeated_statements(self):
+        """Test N+1 patterns are found."""
+        self.profile_lookups()
+        report = ProfileReport(self.get_bundles())
+        rows = report.get_repeated_statements(self.repeated_lookups)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['max_count'], self.repeated_lookups)
+        self.assertEqual(rows[0]['requests'], 1)
+        self.assertIn('profile_lookups', rows[0]['origin'][-1])
+        self.assertEqual(
+            report.get_repeated_statements(self.repeated_lookups + 1), [],
+        )
+        top_statements = report.get_top_statements(limit=1)
+        self.assertEqual(top_statements[0]['count'], self.repeated_lookups)
+
+    def test_command(self):
+        """Test the report merges bundles."""
+        for _ in range(2):
+            self.profile_lookups()
+        stdout = io.StringIO()
+        call_command(
+            'profile_report',
+            threshold=self.repeated_lookups,
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        self.assertIn('2 profiled requests', output)
+        self.assertIn('Top functions', output)
+        self.assertIn('profile_lookups', output)
+        self.assertIn('up to 3 calls per request in 2 requests', output)
+
+    def test_command_without_profiles(self):
+        """Test the command fails without profiles."""
+        with self.assertRaises(CommandError):
+            call_command('profile_report', stdout=io.StringIO())
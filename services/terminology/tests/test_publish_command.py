@@ -0,0 +1,88 @@
+import io
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .mixins import PublishVersionTestMixin  # noqa: WPS300
+
+
+class PublishGuideVersionCommandTests(PublishVersionTestMixin, APITestCase):
+    """Test publish_guide_version command."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.last_version = self.create_last_version(self.guide)
+            self.last_version.guide_items.add(self.surgeon)
+
+    def write_file(self, suffix, file_content):
+        """Write a temporary file and return its path."""
+        temporary_file = tempfile.NamedTemporaryFile(suffix=suffix)
+        self.addCleanup(temporary_file.close)
+        temporary_file.write(file_content)
+        temporary_file.flush()
+        return temporary_file.name
+
+    def publish(self, *args):
+        """Call the command and return its output."""
+        stdout = io.StringIO()
+        call_command(
+            'publish_guide_version',
+            self.guide.id,
+            self.new_version_name,
+            self.start_date,
+            *args,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_publish_diff(self):
+        """Test the diff of versions applied to the old version."""
+        response = self.client.get(
+            reverse(
+                'guide-version-diff',
+                kwargs={
+                    'pk': self.guide.id,
+                    'old_version': self.last_version_name,
+                    'new_version': self.current_version_name,
+                },
+            ),
+            {'format': 'csv'},
+        )
+        path = self.write_file('.csv', b''.join(response.streaming_content))
+
+        output = self.publish(
+            '--base-version', self.last_version_name, '--changes', path,
+        )
+        self.assertIn(
+            f'is published from version {self.last_version_name}', output,
+        )
+        guide_version = self.guide.versions.get(
+            version=self.new_version_name,
+        )
+        self.assertEqual(
+            self.get_contents(guide_version),
+            self.get_contents(self.current_version),
+        )
+        self.assertEqual(
+            guide_version.fingerprint, self.current_version.fingerprint,
+        )
+
+    def test_invalid_changes(self):
+        """Test invalid changes are reported and nothing is published."""
+        path = self.write_file(
+            '.ndjson',
+            b'{"change": "added", "code": "6", "value": "nurse"}\n'
+            b'{"change": "moved", "code": "1"}\n',
+        )
+        with self.assertRaisesMessage(CommandError, 'Change 2:'):
+            self.publish('--changes', path, '--batch-size', '1')
+        self.assertFalse(
+            self.guide.versions.filter(
+                version=self.new_version_name,
+            ).exists(),
+        )
@@ -0,0 +1,186 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from services.terminology.diff import ADDED, CHANGED, REMOVED
+from services.terminology.publishing import (
+    VersionExistsError,
+    publish_version,
+)
+from services.terminology.version_serializers import (
+    GuideVersionPublishSerializer,
+)
+
+from .mixins import PublishVersionTestMixin  # noqa: WPS300
+
+
+class PublishVersionTests(PublishVersionTestMixin, APITestCase):
+    """Test publish_version."""
+
+    def test_copy(self):
+        """Test the new version shares guide items of the base version."""
+        guide_version = publish_version(
+            self.current_version, self.new_version_name, self.start_date,
+        )
+        self.assertEqual(guide_version.guide_id, self.guide.id)
+        self.assertQuerysetEqual(
+            guide_version.guide_items.order_by('id'),
+            [self.surgeon, self.therapist, self.dentist],
+        )
+        self.assertEqual(
+            guide_version.fingerprint, self.current_version.fingerprint,
+        )
+
+    def test_changes(self):
+        """Test changes are applied in batches."""
+        changes = [
+            {'change': ADDED, 'code': '4', 'value': 'surgeon'},
+            {'change': REMOVED, 'code': '2'},
+            {'change': CHANGED, 'code': '3', 'value': 'orthodontist'},
+            {'change': CHANGED, 'code': '1', 'value': 'surgeon'},
+        ]
+        guide_version = publish_version(
+            self.current_version,
+            self.new_version_name,
+            self.start_date,
+            changes,
+            batch_size=2,
+        )
+        self.assertEqual(self.get_contents(guide_version), {
+            ('1', 'surgeon'),
+            ('3', 'orthodontist'),
+            ('4', 'surgeon'),
+        })
+        self.assertIn(self.surgeon, guide_version.guide_items.all())
+        self.assert_fingerprint(guide_version)
+        self.assertEqual(
+            self.get_contents(self.current_version),
+            {('1', 'surgeon'), ('2', 'therapist'), ('3', 'dentist')},
+        )
+        self.assert_fingerprint(self.current_version)
+
+    def test_existing_version(self):
+        """Test an existing version is not published again."""
+        with self.assertRaisesMessage(VersionExistsError, 'already exists'):
+            publish_version(
+                self.current_version,
+                self.current_version_name,
+                self.start_date,
+            )
+
+
+class GuideVersionPublishApiViewTests(PublishVersionTestMixin, APITestCase):
+    """Test GuideVersionPublish api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.url = reverse(
+            'guide-version-publish', kwargs={'pk': self.guide.id},
+        )
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            'admin', is_staff=True,
+        ))
+
+    def test_publish(self):
+        """Test the new version is created from the current version."""
+        response = self.client.post(
+            self.url,
+            {
+                'version': self.new_version_name,
+                'start_date': self.start_date,
+                'changes': [
+                    {'change': REMOVED, 'code': '1'},
+                    {'change': ADDED, 'code': '5', 'value': 'pediatrician'},
+                ],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        guide_version = self.guide.versions.get(
+            version=self.new_version_name,
+        )
+        self.assertEqual(response.json(), {
+            'id': guide_version.id,
+            'guide_id': self.guide.id,
+            'version': self.new_version_name,
+            'start_date': self.start_date,
+            'fingerprint': guide_version.fingerprint,
+        })
+        self.assertEqual(self.get_contents(guide_version), {
+            ('2', 'therapist'), ('3', 'dentist'), ('5', 'pediatrician'),
+        })
+        self.assert_fingerprint(guide_version)
+
+    def test_invalid(self):
+        """Test invalid versions and changes."""
+        response = self.client.post(
+            self.url,
+            {
+                'version': self.current_version_name,
+                'start_date': self.start_date,
+                'base_version': 'unknown',
+                'changes': [{'change': ADDED, 'code': '5'}],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {
+            'version': ['version already exists'],
+            'changes': [{'value': ['This field is required.']}],
+        })
+
+        response = self.client.post(
+            self.url,
+            {
+                'version': self.new_version_name,
+                'start_date': self.start_date,
+                'base_version': 'unknown',
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {'base_version': ['version does not exist']},
+        )
+
+    def test_concurrent_publish(self):
+        """Test a version published after validation is rejected."""
+        with mock.patch.object(
+            GuideVersionPublishSerializer,
+            'validate_version',
+            lambda serializer, version: version,
+        ):
+            response = self.client.post(
+                self.url,
+                {
+                    'version': self.current_version_name,
+                    'start_date': self.start_date,
+                },
+                format='json',
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {'version': ['version already exists']},
+        )
+
+    def test_permissions(self):
+        """Test only staff users can publish versions."""
+        self.client.force_authenticate(None)
+        response = self.client.post(
+            self.url,
+            {
+                'version': self.new_version_name,
+                'start_date': self.start_date,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(
+            self.guide.versions.filter(
+                version=self.new_version_name,
+            ).exists(),
+        )
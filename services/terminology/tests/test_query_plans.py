@@ -0,0 +1,122 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from services.terminology.list_views import GuideList
+from services.terminology.models import Guide, GuideItem, GuideVersion
+from services.terminology.synthetic import GuideGenerator
+from services.terminology.validation import GuideItemLookup
+
+
+class QueryPlanTests(TestCase):
+    """Test that main queries of the endpoints are served by indexes.
+
+    Sequential scans are disabled, so a sequential scan in the plan means
+    that there is no index for the query.
+    """
+
+    hot_tables = (
+        'terminology_guideversion',
+        'terminology_guideversion_guide_items',
+        'terminology_guideitem',
+    )
+
+    def setUp(self):
+        """Set up."""
+        GuideGenerator(
+            guides_count=3,
+            versions_count=3,
+            items_count=30,  # noqa: WPS432
+            shared_ratio=0.5,
+            seed=1,
+        ).generate()
+        self.guide = Guide.objects.order_by('id').first()
+        self.guide_version = self.guide.versions.order_by('start_date').last()
+        self.today = timezone.now().date()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assert_no_seq_scan(self, queryset):
+        """Assert that the plan of the queryset has no sequential scans."""
+        self.assert_plan_without_seq_scan(queryset.explain())
+
+    def assert_queries_without_seq_scan(self, function, *args):
+        """Assert that plans of queries of the call have no seq scans."""
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            function(*args)
+        self.assertTrue(queries.captured_queries)
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                cursor.execute(f'EXPLAIN {query["sql"]}')
+                self.assert_plan_without_seq_scan(
+                    '\n'.join(row[0] for row in cursor.fetchall()),
+                )
+
+    def assert_plan_without_seq_scan(self, plan):
+        """Assert that the plan has no sequential scans of hot tables."""
+        for table in self.hot_tables:
+            self.assertNotIn(f'Seq Scan on {table} ', f'{plan}\n')
+
+    @override_settings(TERMINOLOGY={'VERSION_INDEX_ENABLED': False})
+    def test_version_on_date(self):
+        """Test query of the version effective on the date."""
+        self.assert_queries_without_seq_scan(
+            self.guide.get_version_on_date, self.today,
+        )
+
+    def test_version_by_name(self):
+        """Test query of the version by its name."""
+        self.assert_no_seq_scan(self.guide.versions.filter(version='1'))
+
+    @override_settings(TERMINOLOGY={'VERSION_INDEX_ENABLED': False})
+    def test_versions_of_all_guides_on_date(self):
+        """Test query of GuideList with start_date_lte."""
+        view = GuideList()
+        view.request = view.initialize_request(APIRequestFactory().get(
+            '/', {'start_date_lte': self.today.isoformat()},
+        ))
+        self.assert_no_seq_scan(view.get_queryset())
+
+    def test_guide_items_of_version(self):
+        """Test queries of GuideItemList."""
+        guide_items = self.guide_version.guide_items.order_by('id')
+        first_id = guide_items.values_list('id', flat=True).first()
+        self.assert_no_seq_scan(guide_items)
+        self.assert_no_seq_scan(guide_items.filter(pk__gt=first_id)[:10])
+
+    def test_validation_lookup(self):
+        """Test query of GuideItemValidate."""
+        guide_item_ids = self.guide_version.guide_items.values_list(
+            'id', flat=True,
+        )
+        lookup = GuideItemLookup(self.guide_version)
+        self.assert_no_seq_scan(lookup.get_queryset(list(guide_item_ids)))
+
+    def test_versions_of_guide_item(self):
+        """Test query of versions containing the guide item."""
+        guide_item = self.guide_version.guide_items.first()
+        self.assert_no_seq_scan(
+            GuideVersion.objects.filter(guide_items=guide_item),
+        )
+
+    def test_code_lookups(self):
+        """Test lookups by code and by the prefix of the code."""
+        guide_items = GuideItem.objects.all()
+        self.assert_no_seq_scan(guide_items.filter(code='1-0-1'))
+        self.assert_no_seq_scan(guide_items.filter(code__startswith='1-0-'))
+
+    def test_value_search(self):
+        """Test case-insensitive substring search of the value."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_indexes WHERE indexname = %s",
+                ['guideitem_value_trgm_idx'],
+            )
+            if cursor.fetchone() is None:
+                self.skipTest('pg_trgm extension is not available')
+        plan = GuideItem.objects.filter(value__icontains='UE 1-0').explain()
+        self.assertIn('guideitem_value_trgm_idx', plan)
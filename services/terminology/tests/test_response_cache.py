@@ -0,0 +1,144 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from services.terminology.models import GuideVersion
+from services.terminology.response_cache import guide_list_cache
+from services.terminology.version_index import version_index
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+FILE_BASED_CACHE = 'django.core.cache.backends.filebased.FileBasedCache'
+
+
+class GuideListResponseCacheTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    TestCase,
+):
+    """Test cache of responses of GuideList."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        guide_list_cache.clear()
+        self.url = reverse('guide-list')
+        self.guide = self.create_guide(self.default_guide_name)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guide_version = self.create_current_version(self.guide)
+
+    def get_list(self, query_string='', **extra):
+        """Return response of the list of guides."""
+        return self.client.get(f'{self.url}{query_string}', **extra)
+
+    def get_entries(self):
+        """Return the number of cached responses."""
+        return guide_list_cache.get_stats()['entries']
+
+    def test_hit(self):
+        """Test the cached response is returned without queries."""
+        response = self.get_list()
+        with self.assertNumQueries(0):
+            cached_response = self.get_list()
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+        self.assertEqual(guide_list_cache.get_stats(), {
+            'hits': 1, 'misses': 1, 'hit_ratio': 0.5, 'entries': 1,
+        })
+
+    def test_keyed_by_query_string(self):
+        """Test pages and filters are cached separately."""
+        self.get_list()
+        self.get_list('?page=1')
+        self.get_list('?start_date_lte=2000-01-01')
+        self.get_list('?page=1')
+        self.assertEqual(self.get_entries(), 3)
+        self.assertEqual(guide_list_cache.hits, 1)
+
+    def test_keyed_by_version_index(self):
+        """Test a list built from a stale version index is not served.
+
+        The version is created without signals like by another process, the
+        index keeps the old state until it is reloaded, e.g. after
+        VERSION_INDEX_MAX_AGE.
+        """
+        today = timezone.now().date()
+        query_string = f'?start_date_lte={today}'
+        response = self.get_list(query_string)
+        new_version = GuideVersion.objects.bulk_create([
+            GuideVersion(guide=self.guide, version='new', start_date=today),
+        ])[0]
+        self.assertEqual(
+            self.get_list(query_string).content, response.content,
+        )
+        version_index.clear()
+        response = self.get_list(query_string)
+        self.assertEqual(
+            [guide['version'] for guide in response.json()['results']],
+            [new_version.version],
+        )
+
+    def test_invalidated_by_guide_save(self):
+        """Test changes of guides invalidate cached responses."""
+        self.get_list()
+        self.guide.name = 'new name'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guide.save()
+        self.assertEqual(self.get_entries(), 0)
+        response = self.get_list()
+        self.assertEqual(response.json()['results'][0]['name'], 'new name')
+
+    def test_invalidated_by_guide_version_changes(self):
+        """Test created and deleted guide versions invalidate the cache."""
+        self.get_list()
+        with self.captureOnCommitCallbacks(execute=True):
+            last_version = self.create_last_version(self.guide)
+        self.assertEqual(self.get_entries(), 0)
+        response = self.get_list()
+        self.assertEqual(response.json()['count'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            last_version.delete()
+        self.assertEqual(self.get_entries(), 0)
+        response = self.get_list()
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_guide_items_do_not_invalidate(self):
+        """Test changes of guide items keep cached responses."""
+        self.get_list()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guide_version.guide_items.add(
+                self.create_guide_item(code='1', value='surgeon'),
+            )
+        self.assertEqual(self.get_entries(), 1)
+
+    def test_browsable_api_is_not_cached(self):
+        """Test HTML responses are not cached."""
+        self.get_list(HTTP_ACCEPT='text/html')
+        self.assertEqual(self.get_entries(), 0)
+
+    def test_disabled(self):
+        """Test responses are not cached with zero timeout."""
+        with override_settings(TERMINOLOGY={'RESPONSE_CACHE_TIMEOUT': 0}):
+            self.get_list()
+        self.assertEqual(self.get_entries(), 0)
+
+    def test_file_based_cache(self):
+        """Test responses are cached by the file based backend."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with override_settings(CACHES={'default': {
+                'BACKEND': FILE_BASED_CACHE,
+                'LOCATION': cache_dir,
+            }}):
+                response = self.get_list()
+                with self.assertNumQueries(0):
+                    cached_response = self.get_list()
+        self.assertEqual(cached_response.content, response.content)
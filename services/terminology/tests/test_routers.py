@@ -0,0 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from services.terminology.middleware import PRIMARY_COOKIE
+from services.terminology.models import GuideItem
+from services.terminology.routers import APP_LABEL, ReplicaRouting
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+REPLICA = 'replica'
+
+
+@override_settings(TERMINOLOGY={'READ_REPLICAS': [REPLICA]})
+class ReplicaRoutingTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    TransactionTestCase,
+):
+    """Test routing of terminology reads to the replica."""
+
+    databases = frozenset((DEFAULT_DB_ALIAS, REPLICA))
+    client_class = APIClient
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        self.current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.current_version.guide_items.add(self.surgeon)
+        self.replica_queries = []
+
+    def record_replica_query(  # noqa: WPS211
+        self, execute, sql, params, many, context,  # noqa: WPS110
+    ):
+        """Record SQL of a query of the replica."""
+        self.replica_queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def request(self, method, url, *args, **kwargs):
+        """Make the request and return it with the replica used."""
+        self.replica_queries.clear()
+        with connections[REPLICA].execute_wrapper(self.record_replica_query):
+            response = getattr(self.client, method)(url, *args, **kwargs)
+        return response, bool(self.replica_queries)
+
+    def get_list(self):
+        """Request guide items of the current version."""
+        return self.request(
+            'get', reverse('guide-item-list', kwargs={'pk': self.guide.id}),
+        )
+
+    def test_reads(self):
+        """Test reads of the API go to the replica."""
+        response, used_replica = self.get_list()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertTrue(used_replica)
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_read_only_post(self):
+        """Test validation reads from the replica."""
+        response, used_replica = self.request(
+            'post',
+            reverse('guide-item-validate', kwargs={'pk': self.guide.id}),
+            [{
+                'id': self.surgeon.id,
+                'guide_id': self.guide.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            }],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(used_replica)
+
+    def test_read_your_writes(self):
+        """Test reads go to the primary after a write."""
+        self.client.force_login(get_user_model().objects.create_user(
+            'admin', is_staff=True,
+        ))
+        response, used_replica = self.request(
+            'post',
+            reverse('guide-version-publish', kwargs={'pk': self.guide.id}),
+            {
+                'version': 'next',
+                'start_date': '2100-01-01',
+                'base_version': self.current_version_name,
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(used_replica)
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+        _, used_replica = self.get_list()
+        self.assertFalse(used_replica)
+
+    def test_admin(self):
+        """Test the admin uses the primary."""
+        self.client.force_login(get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password',
+        ))
+        response, used_replica = self.request(
+            'get', reverse('admin:terminology_guideitem_changelist'),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(used_replica)
+
+    def test_outside_requests(self):
+        """Test code outside requests uses the primary."""
+        self.assertEqual(router.db_for_read(GuideItem), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(GuideItem), DEFAULT_DB_ALIAS)
+        with ReplicaRouting() as routing:
+            routing.replica_reads = True
+            self.assertEqual(router.db_for_read(GuideItem), REPLICA)
+            router.db_for_write(GuideItem)
+            self.assertEqual(router.db_for_read(GuideItem), DEFAULT_DB_ALIAS)
+        self.assertFalse(router.allow_migrate(REPLICA, APP_LABEL))
+
+    @override_settings(TERMINOLOGY={'READ_REPLICAS': []})
+    def test_without_replicas(self):
+        """Test all queries go to the primary without replicas."""
+        response, used_replica = self.get_list()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(used_replica)
@@ -0,0 +1,93 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class GuideItemSearchApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideItemSearch api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide('diagnosis')
+        self.url = reverse('guide-item-search', kwargs={'pk': self.guide.id})
+        last_version = self.create_last_version(self.guide)
+        current_version = self.create_current_version(self.guide)
+        self.cholera = self.create_guide_item(code='A00', value='Cholera')
+        self.typhoid = self.create_guide_item(code='A01', value='Typhoid')
+        self.fever = self.create_guide_item(
+            code='A01.0', value='Typhoid FEVER',
+        )
+        self.tuberculosis = self.create_guide_item(
+            code='A15', value='Respiratory tuberculosis',
+        )
+        current_version.guide_items.add(
+            self.cholera, self.typhoid, self.fever, self.tuberculosis,
+        )
+        last_version.guide_items.add(self.cholera)
+
+    def search(self, query_string):
+        """Return codes of found guide items."""
+        response = self.client.get(f'{self.url}?{query_string}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            guide_item['code'] for guide_item in response.json()['results']
+        ]
+
+    def test_code_prefix(self):
+        """Test search by the prefix of the code."""
+        self.assertEqual(self.search('code=A01'), ['A01', 'A01.0'])
+        self.assertEqual(self.search('code=a01'), [])
+
+    def test_value_substring(self):
+        """Test case-insensitive search by a substring of the value."""
+        self.assertEqual(self.search('value=fever'), ['A01.0'])
+        self.assertEqual(self.search('value=TYPH'), ['A01', 'A01.0'])
+        self.assertEqual(self.search('value=%25%25%25'), [])
+
+    def test_code_and_value(self):
+        """Test search by both the code and the value."""
+        self.assertEqual(self.search('code=A&value=ber'), ['A15'])
+
+    def test_version(self):
+        """Test search in the specified version."""
+        self.assertEqual(
+            self.search(f'code=A&version={self.last_version_name}'), ['A00'],
+        )
+
+    def test_keyset_pagination(self):
+        """Test pages of found guide items."""
+        response = self.client.get(f'{self.url}?code=A&page_size=3')
+        page = response.json()
+        self.assertEqual(len(page['results']), 3)
+        response = self.client.get(page['next'])
+        self.assertEqual(response.json(), {
+            'next': None,
+            'results': [{
+                'id': self.tuberculosis.id,
+                'guide_id': self.guide.id,
+                'code': 'A15',
+                'value': 'Respiratory tuberculosis',
+            }],
+        })
+
+    def test_invalid_parameters(self):
+        """Test search without parameters and with a short value."""
+        for query_string in ('', 'value=ty'):
+            response = self.client.get(f'{self.url}?{query_string}')
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST,
+            )
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from unittest import mock
+
+from django.db import models
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from services.terminology import renderers
+from services.terminology.models import GuideVersion
+from services.terminology.serializers import (
+    GuideItemSerializer,
+    GuideSerializer,
+)
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+)
+
+# Quotes, escaped characters, line and paragraph separators, emoji.
+TRICKY_TEXT = ''.join([
+    'Справочник "№1" / \t\n\x1f',
+    chr(92),  # noqa: WPS432
+    chr(0x2028),  # noqa: WPS432
+    chr(0x2029),  # noqa: WPS432
+    chr(0x1F600),  # noqa: WPS432
+])
+
+
+@override_settings(TERMINOLOGY={
+    'VERSION_CACHE_MAX_ITEMS': 0,
+    'RESPONSE_CACHE_TIMEOUT': 0,
+})
+class ValuesListConformanceTests(  # noqa: WPS215
+    GuideMixin, GuideVersionMixin, GuideItemMixin, APITestCase,
+):
+    """Test lists built from rows are the same as from model instances."""
+
+    def setUp(self):
+        """Set up."""
+        self.guide = self.create_guide(TRICKY_TEXT)
+        self.other_guide = self.create_guide(
+            'facility', description=TRICKY_TEXT,
+        )
+        self.create_last_version(self.guide)
+        self.guide_version = self.create_current_version(self.guide)
+        self.create_current_version(self.other_guide)
+        self.guide_version.guide_items.add(
+            self.create_guide_item(code='1', value=TRICKY_TEXT),
+            self.create_guide_item(code='"2"', value='-'),
+        )
+
+    def assert_conformance(self, url, expected):
+        """Assert the response is expected with and without orjson."""
+        for orjson in (renderers.orjson, None):
+            with mock.patch.object(renderers, 'orjson', orjson):
+                response = self.client.get(url)
+            self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_guide_list(self):
+        """Test list of guides."""
+        guide_versions = GuideVersion.objects.order_by('id')
+        self.assert_conformance(reverse('guide-list'), OrderedDict([
+            ('count', 3),
+            ('next', None),
+            ('previous', None),
+            ('results', GuideSerializer(guide_versions, many=True).data),
+        ]))
+
+    @override_settings(TERMINOLOGY={'VERSION_INDEX_ENABLED': False})
+    def test_guide_list_queries(self):
+        """Test guides are listed with a join instead of query per guide."""
+        with self.assertNumQueries(3):
+            self.client.get(reverse('guide-list'))
+
+    def test_guide_item_list(self):
+        """Test list of guide items with keyset pagination."""
+        guide_items = self.guide_version.guide_items.annotate(
+            guide_id=models.Value(
+                self.guide.id, output_field=models.IntegerField(),
+            ),
+        ).order_by('id')
+        url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        self.assert_conformance(f'{url}?cursor=', OrderedDict([
+            ('next', None),
+            ('results', GuideItemSerializer(guide_items, many=True).data),
+        ]))
@@ -0,0 +1,191 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from services.terminology.cache import version_items_cache
+from services.terminology.snapshots import (
+    VersionSnapshot,
+    build_version_snapshots,
+    get_snapshot_path,
+    version_snapshots,
+)
+
+from .mixins import (  # noqa: WPS300
+    GuideItemMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class VersionSnapshotTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test snapshots of superseded guide versions."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        version_snapshots.clear()
+        self.addCleanup(version_snapshots.clear)
+        self.guide = self.create_guide(self.default_guide_name)
+        self.last_version = self.create_last_version(self.guide)
+        self.current_version = self.create_current_version(self.guide)
+        self.future_version = self.create_future_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='терапевт')
+        self.dentist = self.create_guide_item(code='3', value='dentist')
+        self.last_version.guide_items.add(self.surgeon, self.therapist)
+        self.current_version.guide_items.add(self.surgeon)
+        self.last_version.refresh_from_db()
+        self.directory = self.enable_snapshots()
+
+    def enable_snapshots(self):
+        """Set a temporary directory of snapshots and return it."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(TERMINOLOGY={
+            'SNAPSHOT_DIR': directory.name,
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return directory.name
+
+    def build(self):
+        """Build snapshots for today."""
+        return build_version_snapshots(
+            self.directory, timezone.now().date(),
+        )
+
+    def get_list(self):
+        """Return guide items of the last version from the list endpoint."""
+        response = self.client.get(
+            reverse('guide-item-list', kwargs={'pk': self.guide.id}),
+            {'version': self.last_version_name},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()['results']
+
+    def test_build(self):
+        """Test only superseded versions get snapshots."""
+        self.assertEqual(self.build(), (1, 0))
+        self.assertEqual(self.build(), (0, 0))
+        fingerprint = self.last_version.fingerprint
+        snapshot = VersionSnapshot(get_snapshot_path(
+            self.directory, self.last_version.pk, fingerprint,
+        ))
+        self.assertEqual(snapshot.guide_version_id, self.last_version.pk)
+        self.assertEqual(snapshot.fingerprint, fingerprint)
+
+    def test_rebuild(self):
+        """Test snapshots of changed and current versions are replaced."""
+        self.build()
+        self.last_version.guide_items.add(self.dentist)
+        self.assertEqual(self.build(), (1, 1))
+        self.current_version.delete()
+        self.assertEqual(self.build(), (0, 1))
+
+    def test_sequence(self):
+        """Test snapshots behave like cached guide items."""
+        self.build()
+        snapshot = version_snapshots.get(self.last_version)
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(list(snapshot.ids), [
+            self.surgeon.id, self.therapist.id,
+        ])
+        self.assertEqual(snapshot[-1], {
+            'id': self.therapist.id,
+            'guide_id': self.guide.id,
+            'code': self.therapist.code,
+            'value': self.therapist.value,
+        })
+        self.assertEqual(snapshot[1:], [snapshot[1]])
+        with self.assertRaises(IndexError):
+            snapshot[2]  # noqa: WPS428
+
+    def test_lookup(self):
+        """Test guide items are looked up by id."""
+        self.build()
+        snapshot = version_snapshots.get(self.last_version)
+        self.assertIn(self.surgeon.id, snapshot)
+        self.assertNotIn(self.dentist.id, snapshot)
+        self.assertEqual(
+            snapshot.get(self.therapist.id),
+            (self.therapist.code, self.therapist.value),
+        )
+        self.assertIsNone(snapshot.get(self.dentist.id))
+        self.assertEqual(snapshot.index_after(self.surgeon.id), 1)
+        self.assertIsNone(version_snapshots.get(self.current_version))
+
+    def test_missing_snapshot(self):
+        """Test a missing snapshot is looked up again once it is built."""
+        with mock.patch(
+            'services.terminology.snapshots.VersionSnapshot',
+            wraps=VersionSnapshot,
+        ) as snapshot_class:
+            self.assertIsNone(version_snapshots.get(self.last_version))
+            self.assertIsNone(version_snapshots.get(self.last_version))
+            self.assertEqual(snapshot_class.call_count, 1)
+            self.build()
+            self.assertIsNotNone(version_snapshots.get(self.last_version))
+            self.assertEqual(snapshot_class.call_count, 2)
+
+    def test_list(self):
+        """Test the list is served from the snapshot."""
+        expected_list = self.get_list()
+        version_items_cache.clear()
+        self.build()
+        self.assertEqual(self.get_list(), expected_list)
+        self.assertEqual(version_items_cache.get_stats()['misses'], 0)
+
+    def test_changed_version(self):
+        """Test a changed version is not served from the old snapshot."""
+        self.build()
+        self.get_list()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.last_version.guide_items.add(self.dentist)
+        self.assertEqual(
+            [guide_item['id'] for guide_item in self.get_list()],
+            [self.surgeon.id, self.therapist.id, self.dentist.id],
+        )
+
+    def test_validate(self):
+        """Test guide items are validated against the snapshot."""
+        self.build()
+        url = reverse('guide-item-validate', kwargs={'pk': self.guide.id})
+        url = f'{url}?version={self.last_version_name}'
+        response = self.client.post(
+            url,
+            [
+                {
+                    'id': guide_item.id,
+                    'guide_id': self.guide.id,
+                    'code': guide_item.code,
+                    'value': guide_item.value,
+                }
+                for guide_item in (self.therapist, self.dentist)
+            ],
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        expected_errors = [{str(self.dentist.id): False}]
+        self.assertEqual(response.json(), expected_errors)
+        self.assertEqual(version_items_cache.get_stats()['misses'], 0)
+
+    def test_command(self):
+        """Test build_version_snapshots command."""
+        stdout = io.StringIO()
+        call_command('build_version_snapshots', stdout=stdout)
+        self.assertIn('1 snapshots are written', stdout.getvalue())
+        self.assertIsNotNone(version_snapshots.get(self.last_version))
@@ -0,0 +1,146 @@
+import datetime
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from services.terminology.version_index import version_index
+
+from .mixins import (  # noqa: WPS300
+    GuideMixin,
+    GuideVersionMixin,
+    ProcessCacheMixin,
+)
+
+
+class VersionIndexTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    TestCase,
+):
+    """Test index of guide versions by start date."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.last_version = self.create_last_version(self.guide)
+            self.current_version = self.create_current_version(self.guide)
+            self.future_version = self.create_future_version(self.guide)
+        self.today = self.current_version.start_date
+
+    def test_get_version_on_date(self):
+        """Test getting version effective on the date."""
+        yesterday = self.today - datetime.timedelta(days=1)
+        long_ago = self.last_version.start_date - datetime.timedelta(days=1)
+        self.assertEqual(
+            version_index.get_version_on_date(self.guide.id, self.today),
+            self.current_version,
+        )
+        with self.assertNumQueries(0):
+            guide_version = version_index.get_version_on_date(
+                self.guide.id, yesterday,
+            )
+        self.assertEqual(guide_version, self.last_version)
+        self.assertEqual(guide_version.version, self.last_version_name)
+        self.assertIsNone(
+            version_index.get_version_on_date(self.guide.id, long_ago),
+        )
+
+    def test_same_start_date(self):
+        """Test the index and the database take the last created version."""
+        same_date_version = self.create_version(
+            self.guide, 'same date', self.today,
+        )
+        for enabled in (True, False):
+            with override_settings(TERMINOLOGY={
+                'VERSION_INDEX_ENABLED': enabled,
+            }):
+                self.assertEqual(
+                    self.guide.get_version_on_date(self.today),
+                    same_date_version,
+                )
+
+    def test_get_version_by_name(self):
+        """Test getting version by name."""
+        self.assertEqual(
+            version_index.get_version(self.guide.id, self.future_version_name),
+            self.future_version,
+        )
+        self.assertIsNone(version_index.get_version(self.guide.id, 'none'))
+
+    def test_get_version_ids_on_date(self):
+        """Test getting versions of all guides effective on the date."""
+        guide2 = self.create_guide('guide2')
+        last_version_g2 = self.create_last_version(guide2)
+        self.create_guide('guide3')
+        self.assertCountEqual(
+            version_index.get_version_ids_on_date(self.today),
+            [self.current_version.id, last_version_g2.id],
+        )
+
+    def test_index_is_updated_on_version_change(self):
+        """Test that the index follows changes of guide versions."""
+        version_index.get_version_on_date(self.guide.id, self.today)
+
+        self.current_version.start_date = self.future_version.start_date
+        with self.captureOnCommitCallbacks(execute=True):
+            self.current_version.save()
+        self.assertEqual(
+            version_index.get_version_on_date(self.guide.id, self.today),
+            self.last_version,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.last_version.delete()
+        self.assertIsNone(
+            version_index.get_version_on_date(self.guide.id, self.today),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            guide_version = self.create_version(
+                self.guide, 'new', self.today.isoformat(),
+            )
+        self.assertEqual(
+            version_index.get_version_on_date(self.guide.id, self.today),
+            guide_version,
+        )
+
+    def test_rolled_back_version_is_not_indexed(self):
+        """Test that changes of rolled back transactions are ignored."""
+        version_index.get_version_on_date(self.guide.id, self.today)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self.create_version(self.guide, 'phantom', self.today)
+                    raise ValueError('Rollback')
+        self.assertIsNone(version_index.get_version(self.guide.id, 'phantom'))
+        self.assertEqual(
+            version_index.get_version_on_date(self.guide.id, self.today),
+            self.current_version,
+        )
+
+    def test_bypassed_with_pending_updates(self):
+        """Test that the writing transaction sees its own versions."""
+        self.assertTrue(version_index.enabled)
+        self.assertIsNone(version_index.get_version(self.guide.id, 'new'))
+        with self.captureOnCommitCallbacks(execute=True):
+            guide_version = self.create_version(
+                self.guide, 'new', self.today,
+            )
+            self.assertFalse(version_index.enabled)
+            self.assertEqual(
+                self.guide.get_version_on_date(self.today), guide_version,
+            )
+        self.assertTrue(version_index.enabled)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.guide.get_version_on_date(self.today), guide_version,
+            )
+
+    @override_settings(TERMINOLOGY={'VERSION_INDEX_ENABLED': False})
+    def test_disabled_index(self):
+        """Test that versions are resolved by the database when disabled."""
+        with self.assertNumQueries(1):
+            self.assertEqual(self.guide.current_version, self.current_version)
@@ -1,19 +1,38 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.http import urlencode
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from services.terminology.models import GuideVersion
+from services.terminology.response_cache import guide_list_cache
+
 from .mixins import (  # noqa: WPS300
     GuideItemMixin,
     GuideMixin,
     GuideVersionMixin,
+    ProcessCacheMixin,
 )
 
 
-class GuideListApiViewTests(GuideMixin, GuideVersionMixin, APITestCase):
+class GuideListApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    APITestCase,
+):
     """Test GuideList view."""
 
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        guide_list_cache.clear()
+
     def test_get_empty_guide_list(self):
         """Test getting empty guide list."""
         url = reverse('guide-list')
@@ -79,11 +98,12 @@ class GuideListApiViewTests(GuideMixin, GuideVersionMixin, APITestCase):
             self.default_guide_short_name,
             self.default_guide_description,
         )
-        self.create_last_version(guide1)
-        current_version_g1 = self.create_current_version(guide1)
-        self.create_future_version(guide1)
         guide2 = self.create_guide('guide2')
-        current_version_g2 = self.create_current_version(guide2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_last_version(guide1)
+            current_version_g1 = self.create_current_version(guide1)
+            self.create_future_version(guide1)
+            current_version_g2 = self.create_current_version(guide2)
         url = reverse('guide-list')
         today = timezone.now().date()
         query_string = {'start_date_lte': today.isoformat()}
@@ -120,14 +140,55 @@ class GuideListApiViewTests(GuideMixin, GuideVersionMixin, APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, expected_data)
 
+    def test_get_guide_list_with_cursor(self):
+        """Test getting guide list page by page with a cursor."""
+        guide1 = self.create_guide(self.default_guide_name)
+        guide_versions = [
+            self.create_last_version(guide1),
+            self.create_current_version(guide1),
+            self.create_future_version(guide1),
+        ]
+        url = reverse('guide-list')
+        query_string = {'cursor': '', 'page_size': 2}
+        captured_queries = CaptureQueriesContext(connection)
+        with captured_queries:
+            response = self.client.get(url, query_string, format='json')
+        self.assertFalse(any(
+            'COUNT(*)' in query['sql'] for query in captured_queries
+        ))
+        self.assertNotIn('count', response.data)
+        self.assertEqual(
+            [row['version'] for row in response.json()['results']],
+            [guide_version.version for guide_version in guide_versions[:2]],
+        )
+
+        response = self.client.get(f'{response.data["next"]}&count=true')
+        self.assertEqual(response.data['count'], len(guide_versions))
+        self.assertEqual(
+            [row['version'] for row in response.json()['results']],
+            [guide_versions[2].version],
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        """Test that invalid cursor is rejected."""
+        url = reverse('guide-list')
+        response = self.client.get(url, {'cursor': 'invalid'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class GuideItemListApiViewTests(  # noqa: WPS215
-    GuideMixin, GuideVersionMixin, GuideItemMixin, APITestCase,
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
 ):
     """Test GuideItemList api."""
 
     def setUp(self):
         """Set up."""
+        super().setUp()
         self.guide1 = self.create_guide(self.default_guide_name)
         self.pk = self.guide1.id
         self.last_version_g1 = self.create_last_version(self.guide1)
@@ -208,12 +269,17 @@ class GuideItemListApiViewTests(  # noqa: WPS215
 
 
 class GuideItemValidateApiViewTests(  # noqa: WPS215
-    GuideMixin, GuideVersionMixin, GuideItemMixin, APITestCase,
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
 ):
     """Test GuideItemValidate api."""
 
     def setUp(self):
         """Set up."""
+        super().setUp()
         self.guide1 = self.create_guide(self.default_guide_name)
         self.pk = self.guide1.id
         self.last_version_g1 = self.create_last_version(self.guide1)
@@ -376,3 +442,411 @@ class GuideItemValidateApiViewTests(  # noqa: WPS215
         ]
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data, expected_data)
+
+    def test_guide_item_does_not_exist(self):
+        """Test case when guide item does not exist."""
+        post_data = [
+            {
+                'id': self.surgeon.id,
+                'guide_id': self.guide1.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            },
+            {
+                'id': 1000000,
+                'guide_id': self.guide1.id,
+                'code': self.surgeon.code,
+                'value': self.surgeon.value,
+            },
+        ]
+        response = self.client.post(
+            self.url, post_data, pk=self.pk, format='json',
+        )
+        expected_data = [{}, {'id': {'1000000': 'does not exist'}}]
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), expected_data)
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 0})
+    def test_number_of_queries_does_not_depend_on_payload_size(self):
+        """Test that validation uses a fixed number of queries."""
+        guide_items = [
+            self.create_guide_item(code=f'code{number}', value='value')
+            for number in range(50)  # noqa: WPS432
+        ]
+        self.current_version_g1.guide_items.add(*guide_items)
+        for size in (1, len(guide_items)):
+            post_data = [
+                {
+                    'id': guide_item.id,
+                    'guide_id': self.guide1.id,
+                    'code': guide_item.code,
+                    'value': guide_item.value,
+                }
+                for guide_item in guide_items[:size]
+            ]
+            with self.assertNumQueries(2):
+                response = self.client.post(
+                    self.url, post_data, pk=self.pk, format='json',
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class GuideItemListCursorApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideItemList api in the cursor mode."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        current_version = self.create_current_version(self.guide)
+        self.guide_items = [
+            self.create_guide_item(code=str(number), value=f'value{number}')
+            for number in range(5)
+        ]
+        current_version.guide_items.add(*self.guide_items)
+        self.url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+
+    def get_all_pages(self):
+        """Return ids of guide items of all pages."""
+        guide_item_ids = []
+        url = self.url
+        query_string = {'cursor': '', 'page_size': 2}
+        while url:
+            response = self.client.get(url, query_string, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            guide_item_ids.extend(
+                row['id'] for row in response.json()['results']
+            )
+            url = response.data['next']
+            query_string = {}
+        return guide_item_ids
+
+    def test_pages_of_cached_version(self):
+        """Test pages of guide items of the cached guide version."""
+        self.assertEqual(
+            self.get_all_pages(),
+            [guide_item.id for guide_item in self.guide_items],
+        )
+
+    @override_settings(TERMINOLOGY={'VERSION_CACHE_MAX_ITEMS': 0})
+    def test_pages_of_not_cached_version(self):
+        """Test pages of guide items of the not cached guide version."""
+        self.assertEqual(
+            self.get_all_pages(),
+            [guide_item.id for guide_item in self.guide_items],
+        )
+
+
+class ConditionalGetApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test conditional GET of GuideList and GuideItemList api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.current_version = self.create_current_version(self.guide)
+            self.current_version.guide_items.add(self.surgeon)
+        self.url = reverse('guide-item-list', kwargs={'pk': self.guide.id})
+        self.guides_url = reverse('guide-list')
+
+    def assert_not_modified(self, url, **headers):
+        """Assert that the list is not modified since the last response."""
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def assert_modified(self, url, etag):
+        """Assert that the list is modified and return the new ETag."""
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_guide_items_not_modified(self):
+        """Test 304 response to the current ETag and Last-Modified."""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            not_modified = self.assert_not_modified(
+                self.url, HTTP_IF_NONE_MATCH=etag,
+            )
+        self.assertEqual(not_modified['ETag'], etag)
+        self.assert_not_modified(
+            self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+
+    def test_guide_items_modified(self):
+        """Test that changes of guide items change the ETag."""
+        etag = self.client.get(self.url)['ETag']
+        self.current_version.guide_items.add(self.therapist)
+        etag = self.assert_modified(self.url, etag)
+        self.current_version.guide_items.remove(self.therapist)
+        etag = self.assert_modified(self.url, etag)
+        self.surgeon.value = 'general surgeon'
+        self.surgeon.save()
+        self.assert_modified(self.url, etag)
+
+    def test_version_changed_by_other_process(self):
+        """Test the stored fingerprint is used while the index is stale."""
+        url = f'{self.url}?version={self.current_version_name}'
+        etag = self.client.get(url)['ETag']
+        # On-commit callbacks are not run, the index keeps the old state.
+        self.current_version.guide_items.add(self.therapist)
+        self.assert_modified(url, etag)
+
+    def test_pages_have_own_etags(self):
+        """Test that pages and formats of the list have different ETags."""
+        etag = self.client.get(self.url)['ETag']
+        self.assert_modified(f'{self.url}?page=1', etag)
+        self.assert_modified(f'{self.url}?format=json', etag)
+
+    def test_guides_not_modified(self):
+        """Test conditional GET of the guide list."""
+        url = self.guides_url
+        etag = self.client.get(url)['ETag']
+        self.assert_not_modified(url, HTTP_IF_NONE_MATCH=etag)
+        self.guide.name = 'guide2'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.guide.save()
+        etag = self.assert_modified(url, etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.current_version.delete()
+        self.assert_modified(url, etag)
+
+    def test_guides_on_date_changed_by_other_process(self):
+        """Test the list on a date is reloaded by changes of other processes.
+
+        The version is created without signals like by another process, the
+        index keeps the old state, the other process increments the
+        generation of cached lists.
+        """
+        today = timezone.now().date()
+        url = '{0}?{1}'.format(
+            self.guides_url, urlencode({'start_date_lte': today.isoformat()}),
+        )
+        etag = self.client.get(url)['ETag']
+        new_version = GuideVersion.objects.bulk_create([
+            GuideVersion(guide=self.guide, version='new', start_date=today),
+        ])[0]
+        guide_list_cache.invalidate()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [guide['version'] for guide in response.json()['results']],
+            [new_version.version],
+        )
+        self.assert_not_modified(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+
+class GuideItemExportApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideItemExport api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        current_version = self.create_current_version(self.guide)
+        future_version = self.create_future_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        current_version.guide_items.add(self.surgeon, self.therapist)
+        future_version.guide_items.add(self.therapist)
+        self.url = reverse('guide-item-export', kwargs={'pk': self.guide.id})
+
+    def get_export(self, query_string):
+        """Return content of the streaming response."""
+        response = self.client.get(self.url, query_string)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        """Test export of the current version as NDJSON."""
+        guide_id = self.guide.id
+        surgeon_id = self.surgeon.id
+        therapist_id = self.therapist.id
+        self.assertEqual(
+            self.get_export({'format': 'ndjson'}),
+            f'{{"id":{surgeon_id},"guide_id":{guide_id},'
+            f'"code":"1","value":"surgeon"}}\n'
+            f'{{"id":{therapist_id},"guide_id":{guide_id},'
+            f'"code":"2","value":"therapist"}}\n',
+        )
+
+    def test_export_csv_of_specific_version(self):
+        """Test export of the specific version as CSV."""
+        guide_id = self.guide.id
+        therapist_id = self.therapist.id
+        export = self.get_export({
+            'format': 'csv', 'version': self.future_version_name,
+        })
+        self.assertEqual(
+            export,
+            'id,guide_id,code,value\r\n'
+            f'{therapist_id},{guide_id},2,therapist\r\n',
+        )
+
+    def test_export_of_missing_version(self):
+        """Test export of the version that does not exist."""
+        response = self.client.get(self.url, {'version': 'missing'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GuideVersionDiffApiViewTests(  # noqa: WPS215
+    ProcessCacheMixin,
+    GuideMixin,
+    GuideVersionMixin,
+    GuideItemMixin,
+    APITestCase,
+):
+    """Test GuideVersionDiff api."""
+
+    def setUp(self):
+        """Set up."""
+        super().setUp()
+        self.guide = self.create_guide(self.default_guide_name)
+        last_version = self.create_last_version(self.guide)
+        current_version = self.create_current_version(self.guide)
+        self.surgeon = self.create_guide_item(code='1', value='surgeon')
+        self.therapist = self.create_guide_item(code='2', value='therapist')
+        self.dentist = self.create_guide_item(code='3', value='dentist')
+        self.general_therapist = self.create_guide_item(
+            code='2', value='general therapist',
+        )
+        self.nurse = self.create_guide_item(code='4', value='nurse')
+        last_version.guide_items.add(
+            self.surgeon, self.therapist, self.dentist,
+        )
+        current_version.guide_items.add(
+            self.surgeon, self.general_therapist, self.nurse,
+        )
+
+    def get_url(self, old_version, new_version):
+        """Return url of the diff."""
+        return reverse('guide-version-diff', kwargs={
+            'pk': self.guide.id,
+            'old_version': old_version,
+            'new_version': new_version,
+        })
+
+    def get_diff(self, old_version, new_version, query_string=None):
+        """Return content of the streaming response."""
+        response = self.client.get(
+            self.get_url(old_version, new_version), query_string,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode()
+
+    def test_diff(self):
+        """Test added, removed and changed guide items."""
+        diff = self.get_diff(
+            self.last_version_name, self.current_version_name,
+        )
+        guide_id = self.guide.id
+        self.assertEqual(
+            [json.loads(line) for line in diff.splitlines()],
+            [
+                {
+                    'change': 'changed',
+                    'id': self.general_therapist.id,
+                    'guide_id': guide_id,
+                    'code': '2',
+                    'value': 'general therapist',
+                    'previous_id': self.therapist.id,
+                    'previous_value': 'therapist',
+                },
+                {
+                    'change': 'removed',
+                    'id': self.dentist.id,
+                    'guide_id': guide_id,
+                    'code': '3',
+                    'value': 'dentist',
+                    'previous_id': None,
+                    'previous_value': None,
+                },
+                {
+                    'change': 'added',
+                    'id': self.nurse.id,
+                    'guide_id': guide_id,
+                    'code': '4',
+                    'value': 'nurse',
+                    'previous_id': None,
+                    'previous_value': None,
+                },
+            ],
+        )
+
+    def test_diff_csv(self):
+        """Test diff as CSV and diff of the same version."""
+        diff = self.get_diff(
+            self.current_version_name,
+            self.last_version_name,
+            {'format': 'csv'},
+        )
+        guide_id = self.guide.id
+        therapist_id = self.therapist.id
+        general_therapist_id = self.general_therapist.id
+        self.assertEqual(
+            diff.splitlines()[:2],
+            [
+                'change,id,guide_id,code,value,previous_id,previous_value',
+                f'changed,{therapist_id},{guide_id},2,therapist,'
+                f'{general_therapist_id},general therapist',
+            ],
+        )
+        self.assertEqual(
+            self.get_diff(self.last_version_name, self.last_version_name),
+            '',
+        )
+
+    def test_duplicate_codes(self):
+        """Test guide items with the same code are not paired."""
+        pediatric_therapist = self.create_guide_item(
+            code='2', value='pediatric therapist',
+        )
+        version = self.guide.versions.get(version=self.current_version_name)
+        with self.captureOnCommitCallbacks(execute=True):
+            version.guide_items.add(pediatric_therapist)
+        diff = self.get_diff(
+            self.last_version_name, self.current_version_name,
+        )
+        self.assertEqual(
+            [
+                (row['change'], row['id'], row['previous_id'])
+                for row in map(json.loads, diff.splitlines())
+                if row['code'] == '2'
+            ],
+            [
+                ('removed', self.therapist.id, None),
+                ('added', self.general_therapist.id, None),
+                ('added', pediatric_therapist.id, None),
+            ],
+        )
+
+    def test_version_does_not_exist(self):
+        """Test diff with a version that does not exist."""
+        response = self.client.get(
+            self.get_url(self.last_version_name, 'missing'),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,23 +1,79 @@
 from rest_framework.urls import path
 
-from services.terminology.views import (
-    GuideItemList,
-    GuideItemValidate,
-    GuideList,
-    api_root,
+from services.terminology import (
+    async_views,
+    batch_views,
+    list_views,
+    version_views,
+    views,
 )
+from services.terminology.conf import get_setting
+
+if get_setting('ASYNC_VIEWS'):
+    api_root_view = async_views.api_root
+    guide_list_view = async_views.guide_list
+    guide_item_list_view = async_views.guide_item_list
+    guide_item_validate_view = async_views.guide_item_validate
+    guide_item_batch_validate_view = async_views.guide_item_batch_validate
+    guide_item_lookup_view = async_views.guide_item_lookup
+    guide_item_search_view = async_views.guide_item_search
+else:
+    api_root_view = views.api_root
+    guide_list_view = list_views.GuideList.as_view()
+    guide_item_list_view = list_views.GuideItemList.as_view()
+    guide_item_validate_view = views.GuideItemValidate.as_view()
+    guide_item_batch_validate_view = (
+        batch_views.GuideItemBatchValidate.as_view()
+    )
+    guide_item_lookup_view = views.GuideItemLookupByCode.as_view()
+    guide_item_search_view = list_views.GuideItemSearch.as_view()
 
 urlpatterns = [
-    path('', api_root),
-    path('guides/data', GuideList.as_view(), name='guide-list'),
+    path('', api_root_view),
+    path('guides/data', guide_list_view, name='guide-list'),
+    path(
+        'guides/guide-items/validate',
+        guide_item_batch_validate_view,
+        name='guide-item-batch-validate',
+    ),
     path(
         'guides/<int:pk>/guide-items/data',
-        GuideItemList.as_view(),
+        guide_item_list_view,
         name='guide-item-list',
     ),
+    path(
+        'guides/<int:pk>/guide-items/search',
+        guide_item_search_view,
+        name='guide-item-search',
+    ),
     path(
         'guides/<int:pk>/guide-items/validate',
-        GuideItemValidate.as_view(),
+        guide_item_validate_view,
         name='guide-item-validate',
     ),
+    path(
+        'guides/<int:pk>/guide-items/lookup',
+        guide_item_lookup_view,
+        name='guide-item-lookup',
+    ),
+    path(
+        'guides/<int:pk>/guide-items/checksum',
+        version_views.GuideVersionChecksum.as_view(),
+        name='guide-item-checksum',
+    ),
+    path(
+        'guides/<int:pk>/guide-items/export',
+        version_views.GuideItemExport.as_view(),
+        name='guide-item-export',
+    ),
+    path(
+        'guides/<int:pk>/versions/publish',
+        version_views.GuideVersionPublish.as_view(),
+        name='guide-version-publish',
+    ),
+    path(
+        'guides/<int:pk>/versions/<str:old_version>/diff/<str:new_version>',
+        version_views.GuideVersionDiff.as_view(),
+        name='guide-version-diff',
+    ),
 ]
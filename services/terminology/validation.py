@@ -0,0 +1,200 @@
+from django.db import models
+
+from services.terminology.cache import version_items_cache
+from services.terminology.models import GuideItem, GuideVersion
+
+
+class GuideItemLookup(object):
+    """Bulk lookup of guide items and their membership in a guide version.
+
+    All requested guide items are loaded with a single query, so the number
+    of queries does not depend on the number of guide items. Guide items of
+    a cached guide version are taken from the cache, a missing entry is not
+    loaded to check a few guide items.
+    """
+
+    def __init__(self, guide_version=None):
+        """Initialize lookup for the guide version."""
+        self.guide_version = guide_version
+        self._guide_items = {}
+        self._version_item_ids = set()
+
+    def load(self, ids):
+        """Load guide items with the specified ids."""
+        ids = set(ids)
+        self._guide_items = {}
+        self._version_item_ids = set()
+
+        version_items = None
+        if self.guide_version is not None:
+            version_items = version_items_cache.peek(self.guide_version)
+        if version_items is None:
+            self.add(self.get_queryset(ids))
+            return
+
+        missing_ids = self.load_from_cache(version_items, ids)
+        if missing_ids:
+            self.add(self.get_queryset(missing_ids, in_version=False))
+
+    def get(self, pk):
+        """Return (code, value) of the guide item or None if not found."""
+        return self._guide_items.get(pk)
+
+    def get_not_in_version(self):
+        """Return sorted ids of loaded guide items missing in the version."""
+        return sorted(set(self._guide_items) - self._version_item_ids)
+
+    def get_queryset(self, ids, in_version=None):
+        """Return (id, code, value, in_version) of guide items with the ids.
+
+        If in_version is None then membership in the guide version is
+        checked by the database.
+        """
+        if in_version is None and self.guide_version is not None:
+            version_items = GuideVersion.guide_items.through.objects.filter(
+                guideversion_id=self.guide_version.pk,
+                guideitem_id=models.OuterRef('pk'),
+            )
+            in_version_expression = models.Exists(version_items)
+        else:
+            in_version_expression = models.Value(
+                value=bool(in_version), output_field=models.BooleanField(),
+            )
+        return GuideItem.objects.filter(
+            id__in=ids,
+        ).annotate(
+            in_version=in_version_expression,
+        ).values_list('id', 'code', 'value', 'in_version')
+
+    def load_from_cache(self, version_items, ids):
+        """Load guide items of the cached guide version.
+
+        Return ids of guide items that are not in the guide version, they
+        have to be loaded from the database.
+        """
+        self._version_item_ids.update(
+            guide_item_id
+            for guide_item_id in ids
+            if guide_item_id in version_items
+        )
+        for guide_item_id in self._version_item_ids:
+            self._guide_items[guide_item_id] = version_items.get(guide_item_id)
+        return ids - self._version_item_ids
+
+    def add(self, guide_items):
+        """Add (id, code, value, in_version) of loaded guide items."""
+        for guide_item_id, code, item_value, item_in_version in guide_items:
+            self._guide_items[guide_item_id] = (code, item_value)
+            if item_in_version:
+                self._version_item_ids.add(guide_item_id)
+
+
+class GuideItemCodeLookup(object):
+    """Bulk lookup of guide items of a guide version by code.
+
+    All requested codes are resolved with a single query that uses the
+    index on the code. If several guide items of the guide version have
+    the same code, the one with the smallest id is taken.
+    """
+
+    def __init__(self, guide_version=None):
+        """Initialize lookup for the guide version."""
+        self.guide_version = guide_version
+        self._guide_items = {}
+
+    def load(self, codes):
+        """Load guide items with the specified codes."""
+        self._guide_items = {}
+        if self.guide_version is None or not codes:
+            return
+        guide_items = self.guide_version.guide_items.filter(
+            code__in=set(codes),
+        ).order_by('-id').values_list('code', 'id', 'value')
+        self._guide_items = {
+            code: (guide_item_id, item_value)
+            for code, guide_item_id, item_value in guide_items
+        }
+
+    def get(self, code):
+        """Return (id, value) of the guide item or None if not found."""
+        return self._guide_items.get(code)
+
+
+class GuideItemBatchLookup(object):
+    """Bulk lookup of guide items of several guide versions.
+
+    Guide items of cached guide versions are taken from the cache, the
+    rest are loaded with one query and their membership in guide versions
+    is checked with another one, so the number of queries depends neither
+    on the number of guide items nor on the number of guide versions.
+    """
+
+    def __init__(self, guide_versions):
+        """Initialize lookup.
+
+        guide_versions maps keys to guide versions, a guide version can be
+        None.
+        """
+        self.lookups = {
+            key: GuideItemLookup(guide_version)
+            for key, guide_version in guide_versions.items()
+        }
+
+    def load(self, ids_by_key):
+        """Load guide items, ids_by_key maps keys to ids of guide items."""
+        uncached_ids, version_ids = self._load_from_cache(ids_by_key)
+        guide_items = self._get_guide_items(set().union(
+            *uncached_ids.values(),
+        ))
+        memberships = self._get_memberships(version_ids, guide_items)
+        for lookup_key, pending_ids in uncached_ids.items():
+            lookup = self.lookups[lookup_key]
+            guide_version_id = getattr(lookup.guide_version, 'pk', None)
+            lookup.add(
+                (
+                    guide_item_id,
+                    *guide_items[guide_item_id],
+                    (guide_version_id, guide_item_id) in memberships,
+                )
+                for guide_item_id in pending_ids
+                if guide_item_id in guide_items
+            )
+
+    def _load_from_cache(self, ids_by_key):
+        # Return ids of guide items to load from the database by keys and
+        # ids of guide versions to check membership in.
+        uncached_ids = {}
+        version_ids = set()
+        for key, ids in ids_by_key.items():
+            lookup = self.lookups[key]
+            version_items = None
+            if lookup.guide_version is not None:
+                version_items = version_items_cache.peek(lookup.guide_version)
+            if version_items is not None:
+                uncached_ids[key] = lookup.load_from_cache(
+                    version_items, set(ids),
+                )
+                continue
+            uncached_ids[key] = set(ids)
+            if lookup.guide_version is not None:
+                version_ids.add(lookup.guide_version.pk)
+        return uncached_ids, version_ids
+
+    def _get_guide_items(self, ids):
+        if not ids:
+            return {}
+        return {
+            guide_item_id: (code, item_value)
+            for guide_item_id, code, item_value in GuideItem.objects.filter(
+                id__in=ids,
+            ).values_list('id', 'code', 'value')
+        }
+
+    def _get_memberships(self, version_ids, guide_items):
+        if not version_ids or not guide_items:
+            return set()
+        memberships = GuideVersion.guide_items.through.objects.filter(
+            guideversion_id__in=version_ids,
+            guideitem_id__in=guide_items,
+        ).values_list('guideversion_id', 'guideitem_id')
+        return set(memberships)
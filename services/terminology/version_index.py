@@ -0,0 +1,239 @@
+import sys
+import threading
+import time
+from bisect import bisect_right, insort
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from services.terminology.conf import get_setting
+
+VERSION_FIELDS = (
+    'id', 'guide_id', 'version', 'start_date', 'fingerprint', 'modified',
+)
+
+
+class PendingUpdate(object):
+    """Update of the version index waiting for the commit."""
+
+    def __init__(self, function, *args):
+        """Initialize pending call of the function with args."""
+        self.function = function
+        self.args = args
+        self.pending = True
+
+    def __call__(self):
+        """Apply the update."""
+        self.pending = False
+        self.function(*self.args)
+
+
+class VersionIndex(object):  # noqa: WPS214
+    """Per-worker index of guide versions by start date.
+
+    For each guide the index keeps (start_date, id) pairs of its versions
+    in a sorted list, so the version effective on a date is found with a
+    binary search. The index is loaded once and then updated by model
+    signals. It is reloaded when it gets older than VERSION_INDEX_MAX_AGE
+    seconds to pick up changes made by other processes.
+    """
+
+    def __init__(self):
+        """Initialize empty index."""
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._versions = {}
+        self._start_dates = {}
+        self._names = {}
+        self._state_memo = None
+        self._generation = None
+
+    @property
+    def enabled(self):
+        """Return True if the index is enabled and can be used.
+
+        The index is bypassed in a transaction whose changes of guide
+        versions are not applied to it yet, so the transaction sees them.
+        """
+        return get_setting('VERSION_INDEX_ENABLED') and (
+            not self.has_pending_updates()
+        )
+
+    def has_pending_updates(self):
+        """Return True if the current transaction has pending updates."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        if not connection.in_atomic_block:
+            return False
+        return any(
+            getattr(callback, 'pending', False)
+            for _, callback, *_ in connection.run_on_commit
+        )
+
+    def on_commit(self, function, *args):
+        """Call the function with args after the transaction is committed.
+
+        Until then the index is bypassed in the transaction.
+        """
+        transaction.on_commit(PendingUpdate(function, *args))
+
+    def get_version_on_date(self, guide_id, date):
+        """Return guide version effective on the date or None."""
+        with self._lock:
+            self._ensure_loaded()
+            start_dates = self._start_dates.get(guide_id, [])
+            position = bisect_right(start_dates, (date, sys.maxsize))
+            if not position:
+                return None
+            _, guide_version_id = start_dates[position - 1]
+            return self._build(guide_version_id)
+
+    def get_version_ids_on_date(self, date):
+        """Return ids of guide versions effective on the date.
+
+        One guide version is returned for each guide that has a version
+        effective on the date.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            guide_version_ids = []
+            for start_dates in self._start_dates.values():
+                position = bisect_right(start_dates, (date, sys.maxsize))
+                if position:
+                    guide_version_ids.append(start_dates[position - 1][1])
+            return guide_version_ids
+
+    def get_version(self, guide_id, version):
+        """Return guide version with the specified name or None."""
+        with self._lock:
+            self._ensure_loaded()
+            guide_version_id = self._names.get((guide_id, version))
+            if guide_version_id is None:
+                return None
+            return self._build(guide_version_id)
+
+    def reload_on_change(self, generation):
+        """Reload the index when the generation of guide versions changes.
+
+        generation is a value changed after every committed change of
+        guide versions by any process, e.g. the generation of cached lists
+        of guides. Changes made by other processes are seen at once, so
+        data read from the index match the ETag built from the generation.
+        """
+        with self._lock:
+            if generation != self._generation:
+                self.clear()
+                self._generation = generation
+            self._ensure_loaded()
+
+    def get_state(self):
+        """Return the number and the last modified timestamp of versions."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._get_state()
+
+    def load_stored_fingerprints(self, guide_versions):
+        """Set stored fingerprints and modified timestamps of guide versions.
+
+        Guide versions of the index can be changed by other processes until
+        it is reloaded, so paths depending on the fingerprint read it from
+        rows of the guide versions with one query. None items are skipped.
+        """
+        guide_versions = {
+            guide_version.pk: guide_version
+            for guide_version in guide_versions
+            if guide_version is not None
+        }
+        if not guide_versions:
+            return
+        stored_versions = apps.get_model(
+            'terminology', 'GuideVersion',
+        ).objects.filter(pk__in=guide_versions).values_list(
+            'id', 'fingerprint', 'modified',
+        )
+        for guide_version_id, fingerprint, modified in stored_versions:
+            guide_version = guide_versions[guide_version_id]
+            guide_version.fingerprint = fingerprint
+            guide_version.modified = modified
+
+    def update(self, guide_version):
+        """Add or update the guide version."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._remove(guide_version.pk)
+            self._add(tuple(
+                guide_version._meta.get_field(field).to_python(  # noqa: WPS437
+                    getattr(guide_version, field),
+                )
+                for field in VERSION_FIELDS
+            ))
+
+    def remove(self, guide_version_id):
+        """Remove the guide version."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._remove(guide_version_id)
+
+    def clear(self):
+        """Drop the index, it is loaded again on the next lookup."""
+        with self._lock:
+            self._loaded_at = None
+            self._versions = {}
+            self._start_dates = {}
+            self._names = {}
+            self._state_memo = None
+
+    def _ensure_loaded(self):
+        max_age = get_setting('VERSION_INDEX_MAX_AGE')
+        if self._loaded_at is not None:
+            if max_age is None or time.monotonic() - self._loaded_at < max_age:
+                return
+        self.clear()
+        guide_versions = apps.get_model(
+            'terminology', 'GuideVersion',
+        ).objects.values_list(*VERSION_FIELDS)
+        for guide_version in guide_versions:
+            self._add(guide_version)
+        self._loaded_at = time.monotonic()
+
+    def _get_state(self):
+        if self._state_memo is None:
+            modified_position = VERSION_FIELDS.index('modified')
+            self._state_memo = (len(self._versions), max(
+                (
+                    guide_version[modified_position]
+                    for guide_version in self._versions.values()
+                ),
+                default=None,
+            ))
+        return self._state_memo
+
+    def _add(self, guide_version):
+        guide_version_id, guide_id, version, start_date = guide_version[:4]
+        self._state_memo = None
+        self._versions[guide_version_id] = guide_version
+        self._names[(guide_id, version)] = guide_version_id
+        insort(
+            self._start_dates.setdefault(guide_id, []),
+            (start_date, guide_version_id),
+        )
+
+    def _remove(self, guide_version_id):
+        guide_version = self._versions.pop(guide_version_id, None)
+        if guide_version is None:
+            return
+        self._state_memo = None
+        _, guide_id, version, start_date = guide_version[:4]
+        del self._names[(guide_id, version)]  # noqa: WPS420
+        start_dates = self._start_dates[guide_id]
+        start_dates.remove((start_date, guide_version_id))
+        if not start_dates:
+            del self._start_dates[guide_id]  # noqa: WPS420
+
+    def _build(self, guide_version_id):
+        return apps.get_model('terminology', 'GuideVersion').from_db(
+            DEFAULT_DB_ALIAS, VERSION_FIELDS, self._versions[guide_version_id],
+        )
+
+
+version_index = VersionIndex()
@@ -0,0 +1,134 @@
+from rest_framework import serializers
+
+from services.terminology.diff import ADDED, CHANGED, REMOVED
+from services.terminology.fingerprints import FINGERPRINT_LENGTH
+from services.terminology.models import GuideItem, GuideVersion
+from services.terminology.publishing import (
+    VersionExistsError,
+    publish_version,
+)
+
+FINGERPRINT_REGEX = f'^[0-9a-f]{{{FINGERPRINT_LENGTH}}}$'
+
+
+class GuideVersionChangeSerializer(serializers.ModelSerializer):
+    """Serializer of a change of guide items of a guide version.
+
+    Rows of the diff of guide versions are valid changes. The value is not
+    required for removed guide items.
+    """
+
+    change = serializers.ChoiceField(choices=[ADDED, REMOVED, CHANGED])
+
+    class Meta(object):
+        model = GuideItem
+        fields = [
+            'change', 'code', 'value',
+        ]
+        extra_kwargs = {'value': {'required': False}}
+        validators = []
+
+    def validate(self, data):  # noqa: WPS110
+        """Raise ValidationError if the value of an added item is missing."""
+        if data['change'] != REMOVED and 'value' not in data:
+            raise serializers.ValidationError(
+                {'value': ['This field is required.']},
+            )
+        return data
+
+
+class GuideVersionPublishSerializer(serializers.ModelSerializer):
+    """Serializer of a new guide version created from a base version.
+
+    The guide is taken from the context. The base version defaults to the
+    current version of the guide.
+    """
+
+    guide_id = serializers.IntegerField(read_only=True)
+    base_version = serializers.CharField(required=False, write_only=True)
+    changes = GuideVersionChangeSerializer(
+        many=True, required=False, write_only=True,
+    )
+
+    class Meta(object):
+        model = GuideVersion
+        fields = [
+            'id',
+            'guide_id',
+            'version',
+            'start_date',
+            'fingerprint',
+            'base_version',
+            'changes',
+        ]
+
+    def validate_version(self, version):
+        """Raise ValidationError if the version already exists."""
+        if self.context['guide'].versions.filter(version=version).exists():
+            raise serializers.ValidationError('version already exists')
+        return version
+
+    def validate(self, data):  # noqa: WPS110
+        """Replace the name of the base version by the guide version."""
+        base_version = self.context['guide'].get_version(
+            data.get('base_version'),
+        )
+        if base_version is None:
+            raise serializers.ValidationError(
+                {'base_version': ['version does not exist']},
+            )
+        data['base_version'] = base_version
+        return data
+
+    def create(self, validated_data):
+        """Publish the new guide version.
+
+        The version can be published concurrently after it is validated.
+        """
+        try:
+            return publish_version(**validated_data)
+        except VersionExistsError:
+            raise serializers.ValidationError(
+                {'version': ['version already exists']},
+            )
+
+
+class GuideVersionChunkSerializer(serializers.Serializer):
+    """Serializer of the fingerprint of a range of ids of guide items.
+
+    start is inclusive, end is exclusive, a missing end stands for an
+    unbounded range.
+    """
+
+    start = serializers.IntegerField(min_value=0)
+    end = serializers.IntegerField(
+        min_value=1, allow_null=True, default=None,
+    )
+    fingerprint = serializers.RegexField(FINGERPRINT_REGEX)
+
+    def validate(self, data):  # noqa: WPS110
+        """Raise ValidationError if the range is empty."""
+        end = data['end']
+        if end is not None and end <= data['start']:
+            raise serializers.ValidationError(
+                {'end': ['end must be greater than start']},
+            )
+        return data
+
+
+class GuideVersionChecksumSerializer(serializers.Serializer):
+    """Serializer of fingerprints of a copy of guide items of a version."""
+
+    fingerprint = serializers.RegexField(FINGERPRINT_REGEX)
+    chunks = GuideVersionChunkSerializer(many=True, required=False)
+    chunk_size = serializers.IntegerField(
+        min_value=1, max_value=10000, default=1000,  # noqa: WPS432
+    )
+
+    def validate_chunks(self, chunks):
+        """Raise ValidationError if ranges overlap."""
+        chunks = sorted(chunks, key=lambda range_: range_['start'])
+        for previous, following in zip(chunks, chunks[1:]):
+            if previous['end'] is None or previous['end'] > following['start']:
+                raise serializers.ValidationError('ranges must not overlap')
+        return chunks
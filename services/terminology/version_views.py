@@ -0,0 +1,171 @@
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from services.terminology.checksums import VersionChecksum
+from services.terminology.diff import iterate_version_diff
+from services.terminology.models import Guide
+from services.terminology.renderers import CSVRenderer, NDJSONRenderer
+from services.terminology.serializers import GuideItemSerializer
+from services.terminology.version_serializers import (
+    GuideVersionChecksumSerializer,
+    GuideVersionPublishSerializer,
+)
+from services.terminology.views import (
+    GUIDE_DOES_NOT_EXIST,
+    VERSION_PARAM,
+    get_guide_version,
+)
+
+
+class GuideItemExport(APIView):
+    """Export of all guide items of a guide version.
+
+    Guide items are streamed as NDJSON or CSV, the format is selected with
+    the Accept header or the format query parameter. Rows are read with a
+    server-side cursor chunk by chunk, so memory usage does not depend on
+    the number of guide items.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request, pk, format=None):  # noqa: WPS125
+        """Stream guide items."""
+        version = self.request.query_params.get(VERSION_PARAM)
+        guide_version = get_guide_version(pk, version)
+        if guide_version is None:
+            raise serializers.ValidationError(
+                {version: 'version does not exist'},
+            )
+
+        renderer = request.accepted_renderer
+        guide_items = guide_version.guide_items.order_by('id').values_list(
+            'id', 'code', 'value',
+        ).iterator(chunk_size=renderer.chunk_size)
+        fields = GuideItemSerializer.Meta.fields
+        rows = (
+            dict(zip(fields, (guide_item_id, pk, code, item_value)))
+            for guide_item_id, code, item_value in guide_items
+        )
+
+        response = StreamingHttpResponse(
+            renderer.render_rows(rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="guide-{pk}.{renderer.format}"'
+        )
+        return response
+
+
+class GuideVersionDiff(APIView):
+    """Changes of guide items between two versions of a guide.
+
+    Added, removed and changed guide items are computed by the database and
+    streamed as NDJSON or CSV like the export of guide items.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(  # noqa: WPS211
+        self,
+        request,
+        pk,
+        old_version,
+        new_version,
+        format=None,  # noqa: WPS125
+    ):
+        """Stream changes of guide items."""
+        try:
+            guide = Guide.objects.get(pk=pk)
+        except Guide.DoesNotExist:
+            raise serializers.ValidationError({pk: GUIDE_DOES_NOT_EXIST})
+
+        guide_versions = []
+        for version in (old_version, new_version):
+            guide_version = guide.get_version(version)
+            if guide_version is None:
+                raise serializers.ValidationError(
+                    {version: 'version does not exist'},
+                )
+            guide_versions.append(guide_version)
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.render_rows(iterate_version_diff(
+                *guide_versions, chunk_size=renderer.chunk_size,
+            )),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="guide-{guide.id}-diff.{renderer.format}"'
+        )
+        return response
+
+
+class GuideVersionPublish(APIView):
+    """Publish a new version of a guide.
+
+    The new version is created from a base version of the guide and a list
+    of changes of guide items. Guide items of the base version are copied
+    by the database, so only the changes are sent and processed.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, pk, format=None):  # noqa: WPS125
+        """Create the guide version."""
+        try:
+            guide = Guide.objects.get(pk=pk)
+        except Guide.DoesNotExist:
+            raise serializers.ValidationError({pk: GUIDE_DOES_NOT_EXIST})
+
+        serializer = GuideVersionPublishSerializer(
+            data=request.data, context={'guide': guide},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class GuideVersionChecksum(APIView):
+    """Check whether a copy of guide items of a guide version is current.
+
+    The client sends the fingerprint of its copy, it is compared with the
+    fingerprint kept for the version without reading guide items. If they
+    differ, fingerprints of ranges of ids of the version are returned. The
+    client sends fingerprints of its copy for these ranges back and gets
+    guide items of mismatched ranges only.
+    """
+
+    def post(self, request, pk, format=None):  # noqa: WPS125
+        """Compare fingerprints."""
+        version = self.request.query_params.get(VERSION_PARAM)
+        guide_version = get_guide_version(pk, version)
+        if guide_version is None:
+            raise serializers.ValidationError(
+                {version: 'version does not exist'},
+            )
+
+        serializer = GuideVersionChecksumSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        checksum = VersionChecksum(guide_version)
+        fingerprint = serializer.validated_data['fingerprint']
+        response_data = {
+            'fingerprint': guide_version.fingerprint,
+            'current': checksum.is_current(fingerprint),
+        }
+        if response_data['current']:
+            return Response(response_data)
+
+        chunks = serializer.validated_data.get('chunks')
+        if chunks is None:
+            response_data['chunks'] = checksum.get_chunks(
+                serializer.validated_data['chunk_size'],
+            )
+        else:
+            response_data['mismatched'] = checksum.get_mismatched_chunks(
+                chunks,
+            )
+        return Response(response_data)
@@ -0,0 +1,130 @@
+import abc
+import functools
+import hashlib
+
+from django.db import models
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from services.terminology.renderers import FastJSONRenderer
+
+
+class ConditionalListMixin(abc.ABC):
+    """Mixin answering conditional GET requests of a list.
+
+    get_version_tag() returns a string that changes whenever data of the
+    list changes and get_last_modified() returns the time of the last
+    change. The ETag also depends on the URL and the Accept header, so
+    every page and format has its own ETag. If the ETag or Last-Modified
+    sent by the client are current then 304 Not Modified is returned
+    without querying and serializing the list. The ETag of the request is
+    kept in current_etag.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Return the list or 304 Not Modified."""
+        self.current_etag = None
+        version_tag = self.get_version_tag()
+        if version_tag is None:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag(version_tag)
+        self.current_etag = etag
+        last_modified = self.get_last_modified()
+        timestamp = None
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp,
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get_etag(self, version_tag):
+        """Return quoted ETag of the requested representation."""
+        variant = hashlib.blake2b(
+            '{0}\t{1}'.format(
+                self.request.build_absolute_uri(),
+                self.request.META.get('HTTP_ACCEPT', ''),
+            ).encode(),
+            digest_size=8,
+        ).hexdigest()
+        return f'"{version_tag}-{variant}"'
+
+    @abc.abstractmethod
+    def get_version_tag(self):
+        """Return tag of the current data or None to skip conditions."""
+
+    @abc.abstractmethod
+    def get_last_modified(self):
+        """Return time of the last change of the data or None."""
+
+
+class ValuesListMixin(object):
+    """Mixin listing rows of .values_list() instead of model instances.
+
+    The list serializer of serializer_class must be ValuesListSerializer.
+    Rows are rendered by FastJSONRenderer, the output is the same as the
+    one built from model instances.
+    """
+
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def filter_queryset(self, queryset):
+        """Return queryset of rows with sources of serializer fields."""
+        queryset = super().filter_queryset(queryset)
+        if not isinstance(queryset, models.QuerySet):
+            return queryset
+        return self.get_serializer(many=True).get_values_queryset(queryset)
+
+
+class ResponseCacheMixin(object):
+    """Mixin caching rendered responses of a conditional list.
+
+    It must follow ConditionalListMixin. Responses are keyed by the ETag,
+    so they depend on the data, the URL (path, query string and page) and
+    the Accept header. Only responses of cached_formats are cached, e.g.
+    the browsable API is not. Views whose body is also built from
+    in-memory state of the worker add a tag of the state to the key by
+    get_cache_key().
+    """
+
+    response_cache = None
+    cached_formats = frozenset(('json',))
+
+    def get(self, request, *args, **kwargs):
+        """Return the cached response or render and cache it."""
+        if self.current_etag is None or not self.response_cache.enabled:
+            return super().get(request, *args, **kwargs)
+
+        key = self.response_cache.get_key(self.get_cache_key())
+        entry = self.response_cache.get(key)
+        if entry is not None:
+            body, content_type = entry
+            return HttpResponse(body, content_type=content_type)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.add_post_render_callback(
+                functools.partial(self.cache_response, key),
+            )
+        return response
+
+    def get_cache_key(self):
+        """Return key of the response, it is the ETag by default."""
+        return self.current_etag
+
+    def cache_response(self, key, response):
+        """Store the rendered response."""
+        if response.accepted_renderer.format in self.cached_formats:
+            self.response_cache.set(
+                key, response.content, response['Content-Type'],
+            )
@@ -1,17 +1,45 @@
-import datetime
-
-from django.db import models
-from rest_framework import generics, serializers, status
+from django.http import HttpResponse
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
-from services.terminology.models import Guide, GuideItem, GuideVersion
+from services.terminology import metrics
+from services.terminology.models import Guide
 from services.terminology.serializers import (
+    GuideItemCodeSerializer,
     GuideItemSerializer,
-    GuideSerializer,
 )
+from services.terminology.version_index import version_index
+
+GUIDE_DOES_NOT_EXIST = 'guide_id does not exist'
+VERSION_PARAM = 'version'
+
+
+def get_guide_version(pk, version=None):
+    """Return the version of the guide with pk, the current one by default.
+
+    Return None if the guide has no such version. The current version
+    materialized in the guide is read with the guide, the fingerprint of a
+    version found by the version index is read from its row, so requests
+    depending on the fingerprint see changes of other processes at once.
+    """
+    try:
+        guide = Guide.objects.select_related('effective_version').get(pk=pk)
+    except Guide.DoesNotExist:
+        raise serializers.ValidationError({pk: GUIDE_DOES_NOT_EXIST})
+    guide_version = guide.get_version(version)
+    if version_index.enabled and guide_version is not guide.effective_version:
+        version_index.load_stored_fingerprints([guide_version])
+    return guide_version
+
+
+def metrics_view(request):
+    """Return request metrics of the worker in the Prometheus text format."""
+    return HttpResponse(
+        metrics.request_metrics.render(), content_type=metrics.CONTENT_TYPE,
+    )
 
 
 @api_view(['GET'])
@@ -25,92 +53,55 @@ def api_root(request, format=None):  # noqa: WPS125
     })
 
 
-class GuideList(generics.ListAPIView):
-    """List of guide."""
-
-    serializer_class = GuideSerializer
-
-    def get_queryset(self):  # noqa: WPS615
-        """Get queryset.
-
-        If start_date_lte is specified in the get method, only those guides
-        whose start_date is less than or equal to start_date_lte will be
-        selected.
-        """
-        queryset = GuideVersion.objects.all()
-        start_date_lte = self.request.query_params.get('start_date_lte')
-        if start_date_lte:
-            try:
-                date = datetime.date.fromisoformat(start_date_lte)
-            except ValueError:
-                raise serializers.ValidationError(
-                    {'start_date_lte': 'Please enter a valid start_date_lte'},
-                )
-            return queryset.filter(
-                start_date__lte=date,
-            ).order_by('guide_id', '-start_date').distinct('guide_id')
-        return queryset
-
-
-class GuideItemList(generics.ListAPIView):
-    """List of guide item."""
-
-    serializer_class = GuideItemSerializer
-
-    def get_queryset(self):  # noqa: WPS615
-        """Get queryset."""
-        pk = self.kwargs.get('pk')
-        try:
-            guide = Guide.objects.get(id=pk)
-        except Guide.DoesNotExist:
-            raise serializers.ValidationError({pk: 'guide_id does not exist'})
-
-        version = self.request.query_params.get('version')
-        guide_id_field = models.Value(
-            pk, output_field=models.IntegerField(),
-        )
-        try:
-            guide_items = guide.get_guide_items(version).annotate(
-                guide_id=guide_id_field,
-            )
-        except GuideVersion.DoesNotExist:
-            raise serializers.ValidationError(
-                {'version': f'No data for the {version} version'},
-            )
-
-        return guide_items
-
-
 class GuideItemValidate(APIView):
     """Validate guide item."""
 
     def post(self, request, pk, format=None):  # noqa: WPS125
         """Validate data."""
-        try:
-            guide = Guide.objects.get(pk=pk)
-        except Guide.DoesNotExist:
-            raise serializers.ValidationError({pk: 'guide_id does not exist'})
-
-        serializer = GuideItemSerializer(many=True, data=request.data)
+        guide_version = get_guide_version(
+            pk, self.request.query_params.get(VERSION_PARAM),
+        )
+        serializer = GuideItemSerializer(
+            many=True,
+            data=request.data,
+            context={'guide_version': guide_version},
+        )
         serializer.is_valid(raise_exception=True)
 
-        version = self.request.query_params.get('version')
-        guide_items_of_version = guide.get_guide_items(version)
-
-        guide_item_ids = [
-            guide_item['id'] for guide_item in serializer.validated_data
+        guide_item_lookup = serializer.guide_item_lookup
+        errors = [
+            {invalid_guide_item_id: False}
+            for invalid_guide_item_id in guide_item_lookup.get_not_in_version()
         ]
-        expected_guide_items = GuideItem.objects.filter(id__in=guide_item_ids)
-        invalid_guide_items = expected_guide_items.difference(
-            guide_items_of_version,
-        ).order_by('id')
-
-        errors = list(map(
-            lambda invalid_guide_item: {invalid_guide_item.id: False},
-            invalid_guide_items,
-        ))
 
         if errors:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({'all': True}, status=status.HTTP_200_OK)
+
+
+class GuideItemLookupByCode(APIView):
+    """Look up and validate guide items by code.
+
+    Guide items are identified by code in the guide version, the value is
+    optional and is validated if given. The response contains id and the
+    canonical value of every guide item.
+    """
+
+    def post(self, request, pk, format=None):  # noqa: WPS125
+        """Return guide items with the codes."""
+        try:
+            guide = Guide.objects.select_related(
+                'effective_version',
+            ).get(pk=pk)
+        except Guide.DoesNotExist:
+            raise serializers.ValidationError({pk: GUIDE_DOES_NOT_EXIST})
+
+        version = self.request.query_params.get(VERSION_PARAM)
+        serializer = GuideItemCodeSerializer(
+            many=True,
+            data=request.data,
+            context={'guide_version': guide.get_version(version)},
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
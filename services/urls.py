@@ -2,7 +2,10 @@ from django.contrib import admin
 from django.urls import path
 from django.urls.conf import include
 
+from services.terminology.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('terminology/', include('services.terminology.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]